@@ -83,6 +83,51 @@ class test_dataset_synthetic(unittest.TestCase):
 			numpy.testing.assert_array_equal(self.data.intensityData, taNormaliser.normalise(self.data._intensityData))
 
 
+	def test_normalisation_cache(self):
+
+		from nPYc.utilities import normalisation
+
+		self.data.Normalisation = normalisation.TotalAreaNormaliser()
+
+		with self.subTest(msg='Normalised view is reused'):
+			self.assertIs(self.data.intensityData, self.data.intensityData)
+
+		with self.subTest(msg='Reassigning _intensityData invalidates'):
+			cached = self.data.intensityData
+			self.data._intensityData = self.data._intensityData * 2.
+			self.assertIsNot(self.data.intensityData, cached)
+			numpy.testing.assert_array_almost_equal(self.data.intensityData, normalisation.TotalAreaNormaliser().normalise(self.data._intensityData))
+
+		with self.subTest(msg='Changing Normalisation invalidates'):
+			self.data.Normalisation = normalisation.NullNormaliser()
+			numpy.testing.assert_array_equal(self.data.intensityData, self.data._intensityData)
+
+		with self.subTest(msg='Normalised view is lazy'):
+			self.data.Normalisation = normalisation.TotalAreaNormaliser()
+			featureMask = numpy.random.rand(self.noFeat) > 0.5
+			expected = normalisation.TotalAreaNormaliser().normalise(self.data._intensityData)
+
+			self.assertIsInstance(self.data.intensityData, normalisation.LazyNormalisedArray)
+			numpy.testing.assert_array_almost_equal(self.data.intensityData[:, featureMask], expected[:, featureMask])
+
+		with self.subTest(msg='Full matrix materialised once'):
+			self.data.Normalisation = normalisation.TotalAreaNormaliser()
+			lazy = self.data.intensityData
+			numpy.testing.assert_array_almost_equal(numpy.mean(lazy, axis=0), numpy.mean(expected, axis=0))
+			self.assertIs(numpy.asarray(lazy), numpy.asarray(lazy))
+
+			self.assertIsInstance(self.data.intensityData, numpy.ndarray)
+			self.assertIs(self.data.intensityData, numpy.asarray(lazy))
+			self.assertFalse(self.data.intensityData.flags.writeable)
+			numpy.testing.assert_array_almost_equal(self.data.intensityData, expected)
+
+		with self.subTest(msg='Resetting the normaliser invalidates'):
+			self.data.Normalisation = normalisation.TotalAreaNormaliser()
+			cached = self.data.intensityData
+			self.data.Normalisation._reset()
+			self.assertIsNot(self.data.intensityData, cached)
+
+
 	def test_normalisation_raises(self):
 
 		with self.assertRaises(TypeError):
@@ -171,6 +216,399 @@ class test_dataset_synthetic(unittest.TestCase):
 			numpy.testing.assert_array_equal(expectedDataset.featureMask, maskedDataset.featureMask)
 		with self.subTest(msg='Checking sampleMask'):
 			numpy.testing.assert_array_equal(expectedDataset.sampleMask, maskedDataset.sampleMask)
+		with self.subTest(msg='Checking exclusions share a single source matrix'):
+			self.assertIs(maskedDataset.intensityDataExcluded[0].source, maskedDataset.intensityDataExcluded[1].source)
+
+
+	def test_view(self):
+
+		self.data.initialiseMasks()
+		self.data.featureMask[1] = False
+		self.data.sampleMask[[0, 2]] = False
+
+		expectedDataset = copy.deepcopy(self.data)
+		expectedDataset.applyMasks()
+
+		view = self.data.view()
+
+		with self.subTest(msg='Checking view of current masks'):
+			self.assertIsInstance(view, self.data.__class__)
+			numpy.testing.assert_array_equal(view.intensityData, expectedDataset.intensityData)
+			pandas.util.testing.assert_frame_equal(view.sampleMetadata, expectedDataset.sampleMetadata)
+			pandas.util.testing.assert_frame_equal(view.featureMetadata, expectedDataset.featureMetadata)
+			numpy.testing.assert_array_equal(view.sampleMask, expectedDataset.sampleMask)
+			self.assertEqual(view.noSamples, self.noSamp - 2)
+
+		with self.subTest(msg='Checking view is read-only'):
+			with self.assertRaises(AttributeError):
+				view.sampleMask = numpy.ones(view.noSamples, dtype=bool)
+			with self.assertRaises(ValueError):
+				view.intensityData[0, 0] = 1
+			self.assertEqual(self.data.noSamples, self.noSamp)
+
+		with self.subTest(msg='Checking view of a view'):
+			featureMask = numpy.zeros(view.noFeatures, dtype=bool)
+			featureMask[[0, 2]] = True
+			viewOfView = view.view(featureMask=featureMask)
+
+			numpy.testing.assert_array_equal(viewOfView.intensityData, expectedDataset.intensityData[:, [0, 2]])
+
+		with self.subTest(msg='Checking deepcopy of a view'):
+			copied = copy.deepcopy(view)
+
+			self.assertIs(type(copied), self.data.__class__)
+			numpy.testing.assert_array_equal(copied.intensityData, expectedDataset.intensityData)
+			copied.intensityData[0, 0] = 1
+
+		with self.subTest(msg='Checking mask dimensions'):
+			self.assertRaises(ValueError, self.data.view, sampleMask=numpy.ones(self.noSamp + 1, dtype=bool))
+
+
+	def test_clone(self):
+
+		self.data.initialiseMasks()
+		clonedDataset = self.data.clone()
+
+		with self.subTest(msg='Checking matrices are shared'):
+			self.assertIs(type(clonedDataset), type(self.data))
+			self.assertTrue(numpy.shares_memory(clonedDataset._intensityData, self.data._intensityData))
+			numpy.testing.assert_array_equal(clonedDataset.intensityData, self.data.intensityData)
+			with self.assertRaises(ValueError):
+				clonedDataset._intensityData[0, 0] = 1
+
+		with self.subTest(msg='Checking metadata is copied'):
+			pandas.util.testing.assert_frame_equal(clonedDataset.sampleMetadata, self.data.sampleMetadata)
+			self.assertIsNot(clonedDataset.sampleMetadata, self.data.sampleMetadata)
+			self.assertIsNot(clonedDataset.Attributes, self.data.Attributes)
+			self.assertIsNot(clonedDataset.sampleMask, self.data.sampleMask)
+
+		with self.subTest(msg='Checking changes do not propagate'):
+			clonedDataset.sampleMask[[0, 2]] = False
+			clonedDataset.applyMasks()
+			clonedDataset.intensityData = clonedDataset.intensityData * 2
+
+			self.assertEqual(self.data.noSamples, self.noSamp)
+			self.assertTrue(self.data.sampleMask.all())
+			self.assertFalse(hasattr(self.data, 'excludedFlag'))
+			self.assertTrue(self.data._intensityData.flags.writeable)
+
+
+	def test_undoExclusion(self):
+
+		originalDataset = copy.deepcopy(self.data)
+
+		maskedDataset = copy.deepcopy(self.data)
+		maskedDataset.initialiseMasks()
+		maskedDataset.featureMask[1] = False
+		maskedDataset.sampleMask[[0, 2]] = False
+		maskedDataset.applyMasks()
+		maskedDataset.sampleMask[1] = False
+		maskedDataset.applyMasks()
+
+		with self.subTest(msg='Undo last step'):
+			maskedDataset.undoExclusion()
+
+			self.assertListEqual(maskedDataset.excludedFlag, ['Samples', 'Features'])
+			self.assertEqual(maskedDataset.intensityData.shape, (self.noSamp - 2, self.noFeat - 1))
+
+		with self.subTest(msg='Undo all steps'):
+			maskedDataset.undoExclusion()
+			maskedDataset.undoExclusion()
+
+			numpy.testing.assert_array_equal(maskedDataset.intensityData, originalDataset.intensityData)
+			pandas.util.testing.assert_frame_equal(maskedDataset.sampleMetadata, originalDataset.sampleMetadata)
+			pandas.util.testing.assert_frame_equal(maskedDataset.featureMetadata, originalDataset.featureMetadata)
+			self.assertListEqual(maskedDataset.excludedFlag, [])
+			numpy.testing.assert_array_equal(maskedDataset.sampleMask, numpy.ones(self.noSamp, dtype=bool))
+
+		with self.subTest(msg='Nothing to undo'):
+			self.assertRaises(ValueError, maskedDataset.undoExclusion)
+
+		with self.subTest(msg='Data reassigned'):
+			maskedDataset.sampleMask[0] = False
+			maskedDataset.applyMasks()
+			maskedDataset.intensityData = maskedDataset.intensityData * 2
+
+			self.assertRaises(ValueError, maskedDataset.undoExclusion)
+
+		with self.subTest(msg='fit restored'):
+			fitDataset = copy.deepcopy(self.data)
+			fitDataset.initialiseMasks()
+			fitDataset.fit = numpy.random.randn(self.noSamp, self.noFeat)
+			expected = fitDataset.fit.copy()
+			fitDataset.featureMask[[0, 3]] = False
+			fitDataset.sampleMask[1] = False
+			fitDataset.applyMasks()
+
+			numpy.testing.assert_array_equal(fitDataset.fit, numpy.delete(numpy.delete(expected, 1, axis=0), [0, 3], axis=1))
+
+			fitDataset.undoExclusion()
+			fitDataset.undoExclusion()
+
+			numpy.testing.assert_array_equal(fitDataset.fit, expected)
+
+		with self.subTest(msg='Undoing on a clone leaves the original journal'):
+			dataset = copy.deepcopy(self.data)
+			dataset.initialiseMasks()
+			dataset.featureMask[1] = False
+			dataset.sampleMask[0] = False
+			dataset.applyMasks()
+			records = list(dataset.intensityDataExcluded)
+			dataVersions = [record.dataVersion for record in records]
+
+			clonedDataset = dataset.clone()
+			clonedDataset.undoExclusion()
+
+			self.assertEqual([record.dataVersion for record in records], dataVersions)
+			dataset.undoExclusion()
+			dataset.undoExclusion()
+			numpy.testing.assert_array_equal(dataset.intensityData, originalDataset.intensityData)
+
+
+	def test_sampleClassMasks(self):
+
+		from nPYc.enumerations import SampleType, AssayRole
+
+		dataset = copy.deepcopy(self.data)
+		dataset.sampleMetadata['SampleType'] = ([SampleType.StudySample, SampleType.StudyPool, SampleType.StudyPool,
+												SampleType.ExternalReference, SampleType.ProceduralBlank] + [SampleType.StudySample] * (self.noSamp - 5))[:self.noSamp]
+		dataset.sampleMetadata['AssayRole'] = ([AssayRole.Assay, AssayRole.PrecisionReference, AssayRole.LinearityReference,
+											   AssayRole.PrecisionReference, AssayRole.Assay] + [AssayRole.Assay] * (self.noSamp - 5))[:self.noSamp]
+
+		masks = dataset.sampleClassMasks
+
+		with self.subTest(msg='Masks'):
+			for sampleClass, sampleType, assayRole in [('SS', SampleType.StudySample, AssayRole.Assay),
+													   ('SP', SampleType.StudyPool, AssayRole.PrecisionReference),
+													   ('ER', SampleType.ExternalReference, AssayRole.PrecisionReference),
+													   ('LR', SampleType.StudyPool, AssayRole.LinearityReference)]:
+				expected = (dataset.sampleMetadata['SampleType'].values == sampleType) & (dataset.sampleMetadata['AssayRole'].values == assayRole)
+				numpy.testing.assert_array_equal(masks[sampleClass], expected)
+			numpy.testing.assert_array_equal(masks['Blank'], dataset.sampleMetadata['SampleType'].values == SampleType.ProceduralBlank)
+			self.assertFalse(masks['MR'].any())
+			self.assertFalse(masks['SS'].flags.writeable)
+
+		with self.subTest(msg='sampleMetadata not modified'):
+			self.assertEqual(dataset.sampleMetadata['SampleType'].dtype, object)
+			self.assertEqual(dataset.sampleMetadata['AssayRole'].dtype, object)
+			self.assertIsInstance(dataset.sampleMetadata['SampleType'].values, numpy.ndarray)
+
+		with self.subTest(msg='Cached'):
+			self.assertIs(dataset.sampleClassMasks, masks)
+
+		with self.subTest(msg='Invalidated when a column changes'):
+			dataset.sampleMetadata.loc[0, 'SampleType'] = SampleType.MethodReference
+
+			self.assertIsNot(dataset.sampleClassMasks, masks)
+			self.assertTrue(dataset.sampleClassMasks['MR'][0])
+			self.assertFalse(dataset.sampleClassMasks['SS'][0])
+
+
+	def test_useMemmap(self):
+
+		dataset = copy.deepcopy(self.data)
+		expected = numpy.array(dataset.intensityData)
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			dataset.useMemmap(tmpdirname)
+
+			with self.subTest(msg='Data written to a memmap'):
+				self.assertIsInstance(dataset._intensityData, numpy.memmap)
+				self.assertEqual(os.path.dirname(dataset._intensityData.filename), os.path.abspath(tmpdirname))
+				numpy.testing.assert_array_equal(dataset.intensityData, expected)
+
+			with self.subTest(msg='Assigned data written to a memmap'):
+				dataset.intensityData = expected * 2
+
+				self.assertIsInstance(dataset._intensityData, numpy.memmap)
+				numpy.testing.assert_array_equal(dataset.intensityData, expected * 2)
+
+			with self.subTest(msg='applyMasks'):
+				dataset.intensityData = expected
+				dataset.initialiseMasks()
+				dataset.sampleMask[[0, 3]] = False
+				dataset.featureMask[1] = False
+				dataset.applyMasks()
+
+				self.assertIsInstance(dataset._intensityData, numpy.memmap)
+				numpy.testing.assert_array_equal(dataset.intensityData, numpy.delete(numpy.delete(expected, [0, 3], axis=0), 1, axis=1))
+
+				dataset.undoExclusion()
+				dataset.undoExclusion()
+				numpy.testing.assert_array_equal(dataset.intensityData, expected)
+
+			with self.subTest(msg='Copies share the storage'):
+				copiedDataset = copy.deepcopy(dataset)
+				copiedDataset.intensityData = expected + 1
+
+				self.assertIs(copiedDataset._memmapStorage, dataset._memmapStorage)
+				self.assertIsInstance(copiedDataset._intensityData, numpy.memmap)
+
+			del dataset, copiedDataset
+
+		with self.subTest(msg='Temporary storage'):
+			dataset = nPYc.Dataset(memmap=True)
+			dataset.intensityData = expected
+			directory = dataset._memmapStorage.directory
+
+			self.assertIsInstance(dataset._intensityData, numpy.memmap)
+			self.assertTrue(os.path.isdir(directory))
+
+			del dataset
+			self.assertFalse(os.path.isdir(directory))
+
+		with self.subTest(msg='Files no longer used are removed'):
+			dataset = copy.deepcopy(self.data)
+			dataset.useMemmap()
+			directory = dataset._memmapStorage.directory
+			dataset.intensityData = expected
+			dataset.initialiseMasks()
+
+			view = dataset._intensityData[1:]
+			dataset.intensityData = expected * 2
+			self.assertEqual(len(os.listdir(directory)), 2)
+
+			del view
+			dataset.intensityData = expected * 3
+			self.assertEqual(len(os.listdir(directory)), 1)
+
+			dataset.sampleMask[0] = False
+			dataset.applyMasks()
+			self.assertEqual(len(os.listdir(directory)), 2)
+
+			dataset.undoExclusion()
+			self.assertEqual(len(os.listdir(directory)), 1)
+			numpy.testing.assert_array_equal(dataset.intensityData, expected * 3)
+
+
+	def test_save_load(self):
+
+		from nPYc.utilities import normalisation
+
+		self.data.initialiseMasks()
+		self.data.sampleMask[1] = False
+		self.data.Normalisation = normalisation.TotalAreaNormaliser()
+		self.data.name = self.name
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			self.data.save(tmpdirname)
+
+			with self.subTest(msg='Memory-mapped'):
+				rebuiltData = nPYc.Dataset.load(tmpdirname)
+
+				self.assertIsInstance(rebuiltData._intensityData, numpy.memmap)
+				numpy.testing.assert_array_equal(rebuiltData._intensityData, self.data._intensityData)
+				numpy.testing.assert_array_equal(rebuiltData.intensityData, self.data.intensityData)
+				self.assertIsInstance(rebuiltData.Normalisation, normalisation.TotalAreaNormaliser)
+				numpy.testing.assert_array_equal(rebuiltData.Normalisation.normalisation_coefficients, self.data.Normalisation.normalisation_coefficients)
+				numpy.testing.assert_array_equal(rebuiltData.sampleMask, self.data.sampleMask)
+				numpy.testing.assert_array_equal(rebuiltData.featureMask, self.data.featureMask)
+				assert_frame_equal(rebuiltData.sampleMetadata, self.data.sampleMetadata)
+				assert_frame_equal(rebuiltData.featureMetadata, self.data.featureMetadata)
+				self.assertEqual(rebuiltData.name, self.name)
+				self.assertEqual(rebuiltData.VariableType, self.data.VariableType)
+				self.assertEqual(rebuiltData.Attributes['Log'][:-1], self.data.Attributes['Log'])
+
+			with self.subTest(msg='Changes are not written to the snapshot'):
+				rebuiltData._intensityData[0, 0] = -1
+				rebuiltData.applyMasks()
+
+				rebuiltData = nPYc.Dataset.load(tmpdirname, mmap=False)
+
+				self.assertNotIsInstance(rebuiltData._intensityData, numpy.memmap)
+				numpy.testing.assert_array_equal(rebuiltData.intensityData, self.data.intensityData)
+
+			with self.subTest(msg='Wrong class'):
+				self.assertRaises(TypeError, nPYc.MSDataset.load, tmpdirname)
+
+			with self.subTest(msg='Corrupt file'):
+				with open(os.path.join(tmpdirname, 'intensityData.npy'), 'r+b') as file:
+					file.seek(-1, os.SEEK_END)
+					lastByte = file.read(1)
+					file.seek(-1, os.SEEK_END)
+					file.write(b'\x01' if lastByte == b'\x00' else b'\x00')
+
+				self.assertRaises(ValueError, nPYc.Dataset.load, tmpdirname, verify=True)
+				nPYc.Dataset.load(tmpdirname)
+
+			with self.subTest(msg='Truncated file'):
+				with open(os.path.join(tmpdirname, 'intensityData.npy'), 'r+b') as file:
+					file.truncate(os.path.getsize(os.path.join(tmpdirname, 'intensityData.npy')) - 8)
+
+				self.assertRaises(ValueError, nPYc.Dataset.load, tmpdirname)
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			with self.subTest(msg='Not a snapshot'):
+				self.assertRaises(ValueError, nPYc.Dataset.load, tmpdirname)
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			with self.subTest(msg='Log entries'):
+				from nPYc.objects._processingLog import LogEntry
+
+				self.data.applyMasks()
+				self.data.save(tmpdirname)
+				rebuiltData = nPYc.Dataset.load(tmpdirname)
+
+				log = self.data.Attributes['Log']
+				self.assertIn('applyMasks', [entry.operation for entry in log])
+				for (rebuilt, entry) in zip(rebuiltData.Attributes['Log'], log):
+					self.assertEqual(list(rebuilt), list(entry))
+					for field in LogEntry.fields:
+						self.assertEqual(getattr(rebuilt, field), getattr(entry, field))
+
+
+	def test_appendSamples(self):
+
+		self.data.initialiseMasks()
+		self.data.sampleMask[0] = False
+
+		noNew = 4
+		newData = numpy.random.rand(noNew, self.noFeat + 1)
+		newSampleMetadata = pandas.DataFrame({'Sample File Name': ['new%i' % (i) for i in range(noNew)]})
+		# Shuffled, missing the second feature, and with one feature not in the dataset
+		featureNames = list(self.data.featureMetadata['Feature Name'].values) + ['unknown']
+		featureNames[1] = 'missing'
+		order = numpy.random.permutation(self.noFeat + 1)
+
+		intensityData = self.data._intensityData.copy()
+
+		with self.assertWarnsRegex(UserWarning, '2 features of the new samples'):
+			self.data.appendSamples(newData[:, order], newSampleMetadata, featureNames=[featureNames[i] for i in order])
+
+		with self.subTest(msg='Intensities'):
+			expected = numpy.concatenate((intensityData, newData[:, :self.noFeat]), axis=0)
+			expected[self.noSamp:, 1] = numpy.nan
+			numpy.testing.assert_array_equal(self.data._intensityData, expected)
+
+		with self.subTest(msg='Metadata and masks'):
+			self.assertEqual(self.data.noSamples, self.noSamp + noNew)
+			self.assertEqual(list(self.data.sampleMetadata['Sample File Name'].values[self.noSamp:]), list(newSampleMetadata['Sample File Name']))
+			self.assertTrue(self.data.sampleMetadata['Sample Metadata'].iloc[self.noSamp:].isnull().all())
+			numpy.testing.assert_array_equal(self.data.sampleMask, numpy.concatenate(([False], numpy.ones(self.noSamp - 1 + noNew, dtype=bool))))
+
+		with self.subTest(msg='By position'):
+			self.data.appendSamples(newData[:, :self.noFeat], newSampleMetadata)
+
+			numpy.testing.assert_array_equal(self.data._intensityData[-noNew:], newData[:, :self.noFeat])
+
+		with self.subTest(msg='Raises'):
+			self.assertRaises(ValueError, self.data.appendSamples, newData, newSampleMetadata)
+			self.assertRaises(ValueError, self.data.appendSamples, newData[:2], newSampleMetadata, featureNames=featureNames)
+			self.assertRaises(ValueError, self.data.appendSamples, newData, newSampleMetadata, featureNames=['1'] * (self.noFeat + 1))
+
+		with self.subTest(msg='Without sample classes'):
+			from nPYc.enumerations import SampleType, AssayRole
+
+			self.data.sampleMetadata['SampleType'] = SampleType.StudyPool
+			self.data.sampleMetadata['AssayRole'] = AssayRole.PrecisionReference
+			self.data._sampleClassMoments('SP')
+			self.data.sampleMetadata.drop(columns=['SampleType', 'AssayRole'], inplace=True)
+
+			noSamples = self.data.noSamples
+			self.data.appendSamples(newData[:, :self.noFeat], newSampleMetadata)
+
+			self.assertEqual(self.data.noSamples, noSamples + noNew)
+			self.assertEqual(self.data._sampleClassMomentsCache, dict())
 
 
 	def test_updateMasks_raises(self):
@@ -985,6 +1423,48 @@ class test_dataset_synthetic(unittest.TestCase):
 		self.assertEqual(self.data.log, output)
 
 
+	def test_processinglog(self):
+
+		from nPYc.objects._processingLog import ProcessingLog
+		from datetime import datetime
+
+		log = self.data.Attributes['Log']
+		self.assertIsInstance(log, ProcessingLog)
+
+		with self.subTest(msg='Operations timed'):
+			self.data.initialiseMasks()
+			self.data.sampleMask[0] = False
+			self.data.applyMasks()
+
+			entry = [entry for entry in log if entry.operation == 'applyMasks'][0]
+			self.assertEqual(entry[1], '1 samples and 0 features removed from dataset.')
+			self.assertGreaterEqual(entry.duration, 0)
+			self.assertEqual(entry.shapeBefore, (self.noSamp, self.noFeat))
+			self.assertEqual(entry.shapeAfter, (self.noSamp - 1, self.noFeat))
+
+			summary = log.summary()
+			self.assertEqual(summary.shape[0], len(log))
+			self.assertEqual(list(summary.loc[summary['Operation'] == 'applyMasks', 'Message']), [entry[1]])
+
+		with self.subTest(msg='Copies share entries'):
+			dataCopy = copy.deepcopy(self.data)
+
+			self.assertIsInstance(dataCopy.Attributes['Log'], ProcessingLog)
+			self.assertEqual(dataCopy.Attributes['Log'], log)
+			self.assertIs(dataCopy.Attributes['Log'][-1], log[-1])
+
+			dataCopy.Attributes['Log'].append([datetime.now(), 'Only in the copy'])
+			self.assertEqual(len(dataCopy.Attributes['Log']), len(log) + 1)
+
+		with self.subTest(msg='Bounded'):
+			boundedLog = ProcessingLog(log, maxLength=3)
+			for i in range(5):
+				boundedLog.append([datetime.now(), 'Entry %i' % (i)])
+
+			self.assertEqual([entry[1] for entry in boundedLog], ['Entry 2', 'Entry 3', 'Entry 4'])
+			self.assertEqual(boundedLog.noDiscarded, len(log) + 2)
+
+
 	def test_exclude_samples(self):
 
 		exclusionList = numpy.random.randint(1, self.noSamp, size=numpy.random.randint(1, int(self.noSamp / 2) + 1))
@@ -1006,6 +1486,22 @@ class test_dataset_synthetic(unittest.TestCase):
 		self.assertEqual(missingSamples, ['Not a sample in the list'])
 
 
+	def test_exclude_samples_details(self):
+
+		self.data.initialiseMasks()
+		self.data.sampleMetadata['Exclusion Details'] = None
+
+		first = list(self.data.sampleMetadata['Sample File Name'].iloc[:2])
+		second = list(self.data.sampleMetadata['Sample File Name'].iloc[1:3])
+
+		self.assertEqual(self.data.excludeSamples(first + first, message='First'), [])
+		self.assertEqual(self.data.excludeSamples(second + ['Missing', 'Missing'], message='Second'), ['Missing', 'Missing'])
+
+		self.assertEqual(list(self.data.sampleMetadata['Exclusion Details'].iloc[:3]), ['First', 'First AND Second', 'Second'])
+		self.assertTrue(self.data.sampleMetadata['Exclusion Details'].iloc[3:].isnull().all())
+		numpy.testing.assert_array_equal(self.data.sampleMask, numpy.arange(self.noSamp) >= 3)
+
+
 	def test_exclude_samples_raises(self):
 
 		exclusionList = numpy.random.randint(1, self.noSamp, size=numpy.random.randint(1, int(self.noSamp / 2) + 1))
@@ -1190,6 +1686,37 @@ class test_dataset_synthetic(unittest.TestCase):
 		pandas.util.testing.assert_frame_equal(self.data.featureMetadata.iloc[featureList], features)
 
 
+	def test_get_features_index(self):
+
+		self.data.initialiseMasks()
+		self.data.VariableType = nPYc.enumerations.VariableType.Discrete
+
+		features, measurements = self.data.getFeatures('1', by='Feature Name')
+		numpy.testing.assert_array_equal(measurements, self.data.intensityData[:, [0]])
+
+		with self.subTest(msg='Index cached'):
+			index = self.data._featureIndex('Feature Name')
+			self.data.getFeatures('1', by='Feature Name')
+			self.assertIs(self.data._featureIndex('Feature Name'), index)
+
+		with self.subTest(msg='Index rebuilt when featureMetadata is assigned'):
+			featureMetadata = self.data.featureMetadata.copy()
+			featureMetadata.loc[0, 'Feature Name'] = 'Renamed'
+			self.data.featureMetadata = featureMetadata
+
+			features, measurements = self.data.getFeatures('Renamed', by='Feature Name')
+			numpy.testing.assert_array_equal(measurements, self.data.intensityData[:, [0]])
+			self.assertRaises(KeyError, self.data.getFeatures, '1', by='Feature Name')
+
+		with self.subTest(msg='First of duplicated names'):
+			featureMetadata = self.data.featureMetadata.copy()
+			featureMetadata.loc[2, 'Feature Name'] = '2'
+			self.data.featureMetadata = featureMetadata
+
+			features, measurements = self.data.getFeatures('2', by='Feature Name')
+			assert_frame_equal(features, self.data.featureMetadata.iloc[[1]])
+
+
 	def test_get_features_raises(self):
 
 		self.data.VariableType = nPYc.enumerations.VariableType.Discrete
@@ -1294,6 +1821,40 @@ class test_dataset_loadsop(unittest.TestCase):
 			self.assertEqual(self.data.Attributes, testSOPcontents)
 
 
+	def test_loadParameters_cache(self):
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			sopPath = os.path.join(tmpdirname, 'testSOP.json')
+			with open(sopPath, 'w') as outfile:
+				json.dump({'testsopkey': ['a', 'b']}, outfile)
+
+			first = nPYc.Dataset(sop='testSOP', sopPath=tmpdirname)
+			second = nPYc.Dataset(sop='testSOP', sopPath=tmpdirname)
+
+			with self.subTest(msg='Copies are not shared'):
+				first.Attributes['testsopkey'].append('c')
+				first.Attributes['methodName'] = 'changed'
+
+				self.assertEqual(second.Attributes['testsopkey'], ['a', 'b'])
+				self.assertNotEqual(second.Attributes['methodName'], 'changed')
+				self.assertEqual(nPYc.Dataset(sop='testSOP', sopPath=tmpdirname).Attributes['testsopkey'], ['a', 'b'])
+
+			with self.subTest(msg='Modified SOP read again'):
+				with open(sopPath, 'w') as outfile:
+					json.dump({'testsopkey': 'modified'}, outfile)
+				stat = os.stat(sopPath)
+				os.utime(sopPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+				self.assertEqual(nPYc.Dataset(sop='testSOP', sopPath=tmpdirname).Attributes['testsopkey'], 'modified')
+
+			with self.subTest(msg='New SOP found'):
+				os.makedirs(os.path.join(tmpdirname, 'nested'))
+				with open(os.path.join(tmpdirname, 'nested', 'newSOP.json'), 'w') as outfile:
+					json.dump({'testsopkey': 'new'}, outfile)
+
+				self.assertEqual(nPYc.Dataset(sop='newSOP', sopPath=tmpdirname).Attributes['testsopkey'], 'new')
+
+
 class test_dataset_addsampleinfo(unittest.TestCase):
 	"""
 	Test the loading of study designs
@@ -4,6 +4,7 @@ import sys
 import unittest
 import inspect
 import os
+import subprocess
 
 sys.path.append("..")
 import nPYc
@@ -26,5 +27,44 @@ class test_environment(unittest.TestCase):
 		self.assertEqual(os.path.abspath(toolboxPath()), observedToolboxPath)
 
 
+class test_import(unittest.TestCase):
+	"""
+	Regression benchmark for the time taken by ``import nPYc``, which is paid by each worker process of batch jobs.
+	"""
+
+	# Modules only needed to draw figures, fit models or read ISA-Tab, imported on first use
+	heavyModules = ['nPYc.plotting', 'nPYc.reports', 'nPYc.multivariate', 'nPYc.batchAndROCorrection',
+					'matplotlib', 'seaborn', 'plotly', 'statsmodels', 'lmfit', 'networkx', 'isatools', 'pyChemometrics']
+
+	# Maximum time, in seconds, to import nPYc once numpy, pandas and scipy are imported
+	maxImportTime = 1.0
+
+	def runPython(self, code):
+
+		packagePath = os.path.dirname(os.path.dirname(os.path.abspath(inspect.getfile(nPYc))))
+		environment = dict(os.environ, PYTHONPATH=packagePath + os.pathsep + os.environ.get('PYTHONPATH', ''))
+
+		return subprocess.run([sys.executable, '-W', 'ignore', '-c', code], check=True, stdout=subprocess.PIPE,
+							  env=environment, universal_newlines=True).stdout.split()
+
+	def test_import_lazy(self):
+
+		loaded = self.runPython('import sys, nPYc; print(" ".join(module for module in %s if module in sys.modules))' % (self.heavyModules))
+
+		self.assertEqual(loaded, [])
+
+	def test_import_lazy_access(self):
+
+		loaded = self.runPython('import sys, nPYc; nPYc.plotting.histogram; nPYc.reports.generateReport; print("nPYc.plotting" in sys.modules, "nPYc.reports" in sys.modules)')
+
+		self.assertEqual(loaded, ['True', 'True'])
+
+	def test_import_time(self):
+
+		(elapsed,) = self.runPython('import time, numpy, pandas, scipy; start = time.perf_counter(); import nPYc; print(time.perf_counter() - start)')
+
+		self.assertLess(float(elapsed), self.maxImportTime)
+
+
 if __name__ == '__main__':
 	unittest.main()
@@ -15,6 +15,7 @@ from nPYc.enumerations import AssayRole
 from nPYc.enumerations import VariableType
 from generateTestDataset import generateTestDataset
 import tempfile
+import importlib.util
 from isatools import isatab
 
 
@@ -89,6 +90,101 @@ class test_msdataset_synthetic(unittest.TestCase):
 				msData.rsdSP
 
 
+	def test_rsd_cached(self):
+
+		msData = generateTestDataset(30, 20, dtype='MSDataset')
+
+		def expected(sampleType, assayRole):
+			mask = (msData.sampleMetadata['SampleType'].values == sampleType) & (msData.sampleMetadata['AssayRole'].values == assayRole) & msData.sampleMask
+			return nPYc.utilities.rsd(msData.intensityData[mask, :])
+
+		with self.subTest(msg='Calculated once'):
+			rsdSP = msData.rsdSP
+			cache = msData._sampleClassRSDCache
+
+			numpy.testing.assert_array_almost_equal(msData.rsdSP, expected(SampleType.StudyPool, AssayRole.PrecisionReference))
+			self.assertIs(msData._sampleClassRSDCache, cache)
+
+		with self.subTest(msg='Copies returned'):
+			rsdSP[:] = 0
+			self.assertFalse(numpy.all(msData.rsdSP == 0))
+
+		with self.subTest(msg='intensityData changed'):
+			msData.intensityData = msData.intensityData * numpy.linspace(1, 2, msData.noSamples)[:, numpy.newaxis]
+			numpy.testing.assert_array_almost_equal(msData.rsdSP, expected(SampleType.StudyPool, AssayRole.PrecisionReference))
+			numpy.testing.assert_array_almost_equal(msData.rsdSS, expected(SampleType.StudySample, AssayRole.Assay))
+
+		with self.subTest(msg='sampleMask changed'):
+			msData.sampleMask[numpy.where(msData.sampleClassMasks['SP'])[0][0]] = False
+			numpy.testing.assert_array_almost_equal(msData.rsdSP, expected(SampleType.StudyPool, AssayRole.PrecisionReference))
+
+		with self.subTest(msg='sampleMetadata changed'):
+			msData.sampleMetadata = msData.sampleMetadata.copy()
+			msData.sampleMetadata.loc[numpy.where(msData.sampleClassMasks['SS'])[0][:2], ['SampleType', 'AssayRole']] = [SampleType.StudyPool, AssayRole.PrecisionReference]
+			numpy.testing.assert_array_almost_equal(msData.rsdSP, expected(SampleType.StudyPool, AssayRole.PrecisionReference))
+			numpy.testing.assert_array_almost_equal(msData.rsdSS, expected(SampleType.StudySample, AssayRole.Assay))
+
+
+	def test_save_load_normalised(self):
+
+		from nPYc.utilities import normalisation
+
+		msData = generateTestDataset(30, 20, dtype='MSDataset')
+		msData.Normalisation = normalisation.TotalAreaNormaliser()
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			msData.save(tmpdirname)
+			rebuiltData = nPYc.MSDataset.load(tmpdirname)
+
+			self.assertIsInstance(rebuiltData.Normalisation, normalisation.TotalAreaNormaliser)
+			numpy.testing.assert_array_almost_equal(rebuiltData.intensityData, msData.intensityData)
+			numpy.testing.assert_array_equal(rebuiltData.rsdSP, msData.rsdSP)
+
+
+	def test_matchOverlappingPeaks(self):
+
+		from nPYc.objects import _msDataset
+
+		noFeatures = 200
+		mz = numpy.round(numpy.random.uniform(100, 110, noFeatures), 2)
+		mz[[3, 50]] = numpy.nan
+		retentionTime = numpy.random.uniform(0, 2, noFeatures)
+		peakWidth = numpy.random.uniform(0, 0.2, noFeatures)
+		peakWidth[[7, 8]] = 0
+		retentionTime[8] = retentionTime[7]
+
+		def expected(deltaMZ, deltaOverlap):
+			pairs = set()
+			for i in range(noFeatures):
+				for j in range(i + 1, noFeatures):
+					difference = abs(retentionTime[i] - retentionTime[j])
+					halfWidth = (peakWidth[i] + peakWidth[j]) / 2
+					if (difference <= halfWidth) and (abs(mz[i] - mz[j]) <= deltaMZ) and (halfWidth > 0) and (((halfWidth - difference) / halfWidth) * 100 >= deltaOverlap):
+						pairs.add((i, j))
+			return pairs
+
+		def matched(deltaMZ, deltaOverlap):
+			(first, second) = _msDataset._matchOverlappingPeaks(mz, retentionTime, peakWidth, deltaMZ, deltaOverlap)
+			return set(zip(numpy.minimum(first, second).tolist(), numpy.maximum(first, second).tolist()))
+
+		for (deltaMZ, deltaOverlap) in [(0.005, 50), (0.05, 50), (0.5, 0), (0.5, 90), (20, 50)]:
+			with self.subTest(deltaMZ=deltaMZ, deltaOverlap=deltaOverlap):
+				self.assertEqual(matched(deltaMZ, deltaOverlap), expected(deltaMZ, deltaOverlap))
+
+		with self.subTest(msg='Compared in small blocks'):
+			blockSize = _msDataset._peakPairBlockSize
+			_msDataset._peakPairBlockSize = 7
+			try:
+				self.assertEqual(matched(0.5, 50), expected(0.5, 50))
+			finally:
+				_msDataset._peakPairBlockSize = blockSize
+
+		with self.subTest(msg='No features'):
+			(first, second) = _msDataset._matchOverlappingPeaks(numpy.array([]), numpy.array([]), numpy.array([]), 0.05, 50)
+			self.assertEqual(len(first), 0)
+			self.assertEqual(len(second), 0)
+
+
 	def test_getsamplemetadatafromfilename(self):
 		"""
 		Test we are parsing NPC MS filenames correctly (PCSOP.081).
@@ -808,6 +904,84 @@ class test_msdataset_synthetic(unittest.TestCase):
 			dataset.sampleMetadata.drop(['Dilution'], axis=1, inplace=True)
 			self.assertRaises(KeyError, dataset._MSDataset__correlateToDilution)
 
+	def test_appendSamples(self):
+
+		noSamp = numpy.random.randint(30, high=100, size=None)
+		noFeat = numpy.random.randint(20, high=50, size=None)
+
+		dataset = generateTestDataset(noSamp, noFeat, dtype='MSDataset', sop='GenericMS')
+		batch = generateTestDataset(noSamp, noFeat, dtype='MSDataset', sop='GenericMS')
+		dataset.sampleMetadata.loc[1::5, 'SampleType'] = SampleType.StudyPool
+		dataset.sampleMetadata.loc[1::5, 'AssayRole'] = AssayRole.LinearityReference
+
+		expected = copy.deepcopy(dataset)
+		expected.sampleMetadata = pandas.concat([dataset.sampleMetadata, batch.sampleMetadata], ignore_index=True, sort=False)
+		expected._intensityData = numpy.concatenate((dataset._intensityData, batch._intensityData), axis=0)
+		expected.initialiseMasks()
+
+		# Calculate and cache statistics before appending
+		rsdSP = dataset.rsdSP
+		dataset.rsdSS
+		correlations = dataset.correlationToDilution
+
+		dataset.appendSamples(batch._intensityData, batch.sampleMetadata, featureNames=dataset.featureMetadata['Feature Name'])
+
+		with self.subTest(msg='RSDs updated'):
+			self.assertEqual(set(dataset._sampleClassMomentsCache.keys()), {'SP', 'SS'})
+			numpy.testing.assert_allclose(dataset.rsdSP, expected.rsdSP)
+			numpy.testing.assert_allclose(dataset.rsdSS, expected.rsdSS)
+			self.assertFalse(numpy.array_equal(dataset.rsdSP, rsdSP))
+
+		with self.subTest(msg='Correlations kept'):
+			self.assertIs(dataset.correlationToDilution, correlations)
+			numpy.testing.assert_allclose(dataset.correlationToDilution, expected.correlationToDilution)
+
+		with self.subTest(msg='Correlations reset on new dilution series samples'):
+			dataset.appendSamples(dataset._intensityData[:noSamp], dataset.sampleMetadata.iloc[:noSamp])
+
+			self.assertEqual(dataset.corrExclusions.shape, (3 * noSamp,))
+			self.assertIsNot(dataset.correlationToDilution, correlations)
+
+
+	def test_concatenate(self):
+
+		noFeat = numpy.random.randint(20, high=50, size=None)
+		batches = [generateTestDataset(numpy.random.randint(10, high=50, size=None), noFeat, dtype='MSDataset', sop='GenericMS') for i in range(3)]
+		for batch in batches:
+			batch.featureMetadata['Feature Name'] = ['Feature%i' % (i) for i in range(noFeat)]
+			batch.corrExclusions = numpy.random.rand(batch.noSamples) > 0.5
+		batches[1].sampleMask[0] = False
+		batches[2].featureMask[1] = False
+
+		with self.subTest(msg='Same features'):
+			concatenated = nPYc.objects.concatenate(batches)
+
+			self.assertIsInstance(concatenated, nPYc.MSDataset)
+			numpy.testing.assert_array_equal(concatenated._intensityData, numpy.concatenate([batch._intensityData for batch in batches], axis=0))
+			assert_frame_equal(concatenated.sampleMetadata, pandas.concat([batch.sampleMetadata for batch in batches], ignore_index=True, sort=False))
+			assert_frame_equal(concatenated.featureMetadata, batches[0].featureMetadata)
+			numpy.testing.assert_array_equal(concatenated.sampleMask, numpy.concatenate([batch.sampleMask for batch in batches]))
+			numpy.testing.assert_array_equal(concatenated.corrExclusions, numpy.concatenate([batch.corrExclusions for batch in batches]))
+			numpy.testing.assert_array_equal(concatenated.featureMask, batches[2].featureMask)
+
+		with self.subTest(msg='Different features'):
+			# Second batch missing the first feature, in reverse order
+			batches[1].featureMetadata = batches[1].featureMetadata.iloc[:0:-1].reset_index(drop=True)
+			batches[1]._intensityData = batches[1]._intensityData[:, :0:-1]
+			batches[1].featureMask = batches[1].featureMask[:0:-1]
+
+			concatenated = nPYc.objects.concatenate(batches)
+
+			self.assertEqual(concatenated.noFeatures, noFeat)
+			rows = slice(batches[0].noSamples, batches[0].noSamples + batches[1].noSamples)
+			self.assertTrue(numpy.all(numpy.isnan(concatenated._intensityData[rows, 0])))
+			numpy.testing.assert_array_equal(concatenated._intensityData[rows, 1:], batches[1]._intensityData[:, ::-1])
+
+		with self.subTest(msg='Raises'):
+			self.assertRaises(ValueError, nPYc.objects.concatenate, [])
+			self.assertRaises(TypeError, nPYc.objects.concatenate, [batches[0], nPYc.Dataset()])
+
+
 	def test_validateObject(self):
 		with self.subTest(msg='validateObject successful on correct dataset'):
 			goodDataset = copy.deepcopy(self.msData)
@@ -2630,5 +2804,205 @@ class test_msdataset_initialiseFromCSV(unittest.TestCase):
 			self.assertEqual(rebuiltData.name, dataset.name)
 
 
+@unittest.skipUnless(importlib.util.find_spec('h5py'), 'h5py is not installed')
+class test_msdataset_initialiseFromHDF5(unittest.TestCase):
+
+	def setUp(self):
+
+		noSamp = numpy.random.randint(5, high=10, size=None)
+		noFeat = numpy.random.randint(500, high=1000, size=None)
+
+		self.dataset = generateTestDataset(noSamp, noFeat, dtype='MSDataset', sop='GenericMS')
+		self.dataset.name = 'Testing'
+		self.dataset.sampleMask[1] = False
+		self.dataset.featureMetadata.loc[2, 'rsdFilter'] = False
+
+
+	def test_init(self):
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			self.dataset.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+			rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5')
+
+			numpy.testing.assert_array_equal(rebuiltData.intensityData, self.dataset.intensityData)
+			numpy.testing.assert_array_equal(rebuiltData.sampleMask, self.dataset.sampleMask)
+			numpy.testing.assert_array_equal(rebuiltData.featureMask, self.dataset.featureMask)
+			pandas.util.testing.assert_frame_equal(rebuiltData.sampleMetadata, self.dataset.sampleMetadata)
+			pandas.util.testing.assert_frame_equal(rebuiltData.featureMetadata, self.dataset.featureMetadata)
+
+			self.assertEqual(rebuiltData.name, self.dataset.name)
+			self.assertEqual(rebuiltData.VariableType, self.dataset.VariableType)
+			self.assertEqual(rebuiltData.Attributes['Log'][:len(self.dataset.Attributes['Log']) - 1], self.dataset.Attributes['Log'][:-1])
+
+
+	def test_init_log(self):
+
+		from nPYc.objects._processingLog import LogEntry
+
+		self.dataset.applyMasks()
+		log = list(self.dataset.Attributes['Log'])
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			self.dataset.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+			rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5')
+
+		self.assertIn('applyMasks', [entry.operation for entry in log])
+		for (rebuilt, entry) in zip(rebuiltData.Attributes['Log'], log):
+			self.assertEqual(list(rebuilt), list(entry))
+			for field in LogEntry.fields:
+				self.assertEqual(getattr(rebuilt, field), getattr(entry, field))
+
+
+	def test_init_slices(self):
+
+		sampleMask = numpy.zeros(self.dataset.noSamples, dtype=bool)
+		sampleMask[[0, 2, 3]] = True
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			self.dataset.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+			rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5', sampleSlice=sampleMask, featureSlice=slice(10, 60, 5))
+
+			numpy.testing.assert_array_equal(rebuiltData.intensityData, self.dataset.intensityData[sampleMask, 10:60:5])
+			pandas.util.testing.assert_frame_equal(rebuiltData.sampleMetadata, self.dataset.sampleMetadata.loc[sampleMask].reset_index(drop=True))
+			pandas.util.testing.assert_frame_equal(rebuiltData.featureMetadata, self.dataset.featureMetadata.iloc[10:60:5].reset_index(drop=True))
+			numpy.testing.assert_array_equal(rebuiltData.sampleMask, self.dataset.sampleMask[sampleMask])
+
+			with self.subTest(msg='Memmapped'):
+				rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5', featureSlice=[3, 1, 7], memmap=True)
+
+				self.assertIsInstance(rebuiltData._intensityData, numpy.memmap)
+				numpy.testing.assert_array_equal(rebuiltData.intensityData, self.dataset.intensityData[:, [1, 3, 7]])
+
+			with self.subTest(msg='Slices not kept in Attributes'):
+				self.assertNotIn('sampleSlice', rebuiltData.Attributes)
+				self.assertNotIn('featureSlice', rebuiltData.Attributes)
+
+
+	def test_init_slices_read(self):
+
+		from nPYc.objects._hdf5 import _readBlock, _readRows
+
+		class RecordingMatrix():
+			"""Matrix counting the values read from it"""
+			def __init__(self, values):
+				self.values = values
+				self.shape = values.shape
+				self.dtype = values.dtype
+				self.noRead = 0
+
+			def __getitem__(self, key):
+				values = self.values[key]
+				self.noRead += values.size
+				return values
+
+		X = self.dataset._intensityData
+		(noSamples, noFeatures) = X.shape
+		rows = numpy.array([0, 1, noSamples - 1])
+		columns = numpy.array([0, 5, 6, noFeatures - 1])
+
+		with self.subTest(msg='Block'):
+			member = RecordingMatrix(X)
+			numpy.testing.assert_array_equal(_readBlock(member, rows, columns), X[numpy.ix_(rows, columns)])
+			self.assertEqual(member.noRead, len(rows) * len(columns))
+
+		with self.subTest(msg='Block of column slice'):
+			member = RecordingMatrix(X)
+			numpy.testing.assert_array_equal(_readBlock(member, rows, slice(2, 10, 3)), X[rows, 2:10:3])
+			self.assertEqual(member.noRead, len(rows) * 3)
+
+		with self.subTest(msg='Rows'):
+			member = RecordingMatrix(X[:, 0])
+			numpy.testing.assert_array_equal(_readRows(member, rows), X[rows, 0])
+			self.assertEqual(member.noRead, len(rows))
+
+		with self.subTest(msg='Nothing selected'):
+			self.assertEqual(_readBlock(RecordingMatrix(X), numpy.array([], dtype=int), columns).shape, (0, len(columns)))
+			self.assertEqual(_readBlock(RecordingMatrix(X), rows, numpy.array([], dtype=int)).shape, (len(rows), 0))
+
+
+	def test_init_normalised(self):
+
+		from nPYc.utilities import normalisation
+
+		dataset = generateTestDataset(30, 50, dtype='MSDataset', sop='GenericMS')
+		dataset.name = 'Testing'
+		dataset.Normalisation = normalisation.TotalAreaNormaliser()
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			dataset.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+			rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5')
+
+			with self.subTest(msg='Raw data and normaliser restored'):
+				self.assertIsInstance(rebuiltData.Normalisation, normalisation.TotalAreaNormaliser)
+				numpy.testing.assert_array_equal(rebuiltData._intensityData, dataset._intensityData)
+				numpy.testing.assert_array_almost_equal(rebuiltData.intensityData, dataset.intensityData)
+				numpy.testing.assert_array_equal(rebuiltData.rsdSP, dataset.rsdSP)
+
+			with self.subTest(msg='Saved coefficients used for slices'):
+				rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5', sampleSlice=slice(0, 10))
+
+				numpy.testing.assert_array_almost_equal(rebuiltData.intensityData, dataset.intensityData[:10])
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class test_msdataset_initialiseFromParquet(unittest.TestCase):
+
+	def test_init(self):
+
+		noSamp = numpy.random.randint(5, high=10, size=None)
+		noFeat = numpy.random.randint(500, high=1000, size=None)
+
+		dataset = generateTestDataset(noSamp, noFeat, dtype='MSDataset', sop='GenericMS')
+		dataset.name = 'Testing'
+		dataset.sampleMetadata.loc[0, 'AssayRole'] = None
+
+		for saveFormat in ['Parquet', 'ParquetLong']:
+			with self.subTest(msg=saveFormat):
+				with tempfile.TemporaryDirectory() as tmpdirname:
+					dataset.exportDataset(destinationPath=tmpdirname, saveFormat=saveFormat, withExclusions=False, filterMetadata=False)
+
+					rebuiltData = nPYc.MSDataset(os.path.join(tmpdirname, 'Testing_sampleMetadata.parquet'), fileType='parquet export')
+
+					numpy.testing.assert_array_equal(rebuiltData.intensityData, dataset.intensityData)
+					pandas.util.testing.assert_frame_equal(rebuiltData.sampleMetadata, dataset.sampleMetadata)
+					for column in ['Feature Name', 'm/z', 'Retention Time']:
+						pandas.util.testing.assert_series_equal(rebuiltData.featureMetadata[column], dataset.featureMetadata[column])
+
+					self.assertIsInstance(rebuiltData.sampleMetadata.loc[1, 'SampleType'], nPYc.enumerations.SampleType)
+					self.assertIsNone(rebuiltData.sampleMetadata.loc[0, 'AssayRole'])
+					self.assertEqual(rebuiltData.name, dataset.name)
+					self.assertEqual(rebuiltData.VariableType, dataset.VariableType)
+
+
+	def test_init_row_groups(self):
+
+		from unittest.mock import patch
+		import pyarrow.parquet
+		from nPYc.objects._parquet import writeIntensityData, readIntensityData
+
+		intensityData = numpy.random.rand(10, 4)
+
+		for longFormat in [False, True]:
+			with self.subTest(msg='Long' if longFormat else 'Wide'):
+				with tempfile.TemporaryDirectory() as tmpdirname:
+					path = os.path.join(tmpdirname, 'intensityData.parquet')
+					with patch('nPYc.objects._parquet._blockRows', return_value=3):
+						writeIntensityData(intensityData, path, longFormat=longFormat)
+
+					self.assertEqual(pyarrow.parquet.ParquetFile(path).num_row_groups, 4)
+					numpy.testing.assert_array_equal(readIntensityData(path), intensityData)
+
+		with self.subTest(msg='No samples'):
+			with tempfile.TemporaryDirectory() as tmpdirname:
+				path = os.path.join(tmpdirname, 'intensityData.parquet')
+				writeIntensityData(intensityData[:0], path)
+
+				self.assertEqual(readIntensityData(path).shape, (0, 4))
+
+
 if __name__ == '__main__':
 	unittest.main()
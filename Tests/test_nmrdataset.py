@@ -6,6 +6,7 @@ import os
 import copy
 import warnings
 import tempfile
+import importlib.util
 from isatools import isatab
 
 
@@ -538,5 +539,56 @@ class test_nmrdataset_initialiseFromCSV(unittest.TestCase):
 			self.assertEqual(rebuitData.name, dataset.name)
 
 
+@unittest.skipUnless(importlib.util.find_spec('h5py'), 'h5py is not installed')
+class test_nmrdataset_initialiseFromHDF5(unittest.TestCase):
+
+	def test_init(self):
+
+		noSamp = numpy.random.randint(5, high=10, size=None)
+		noFeat = numpy.random.randint(500, high=1000, size=None)
+
+		dataset = generateTestDataset(noSamp, noFeat, dtype='NMRDataset', sop='GenericNMRurine')
+		dataset.name = 'Testing'
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+
+			dataset.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+			rebuiltData = nPYc.NMRDataset(os.path.join(tmpdirname, 'Testing.h5'), fileType='hdf5', featureSlice=slice(100, 200))
+
+			numpy.testing.assert_array_equal(rebuiltData.intensityData, dataset.intensityData[:, 100:200])
+			numpy.testing.assert_array_equal(rebuiltData._scale, dataset.featureMetadata['ppm'].values[100:200])
+			pandas.util.testing.assert_frame_equal(rebuiltData.sampleMetadata, dataset.sampleMetadata)
+			pandas.util.testing.assert_series_equal(rebuiltData.featureMetadata['ppm'], dataset.featureMetadata['ppm'].iloc[100:200].reset_index(drop=True))
+
+			self.assertEqual(rebuiltData.name, dataset.name)
+			self.assertEqual(rebuiltData.VariableType, dataset.VariableType)
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class test_nmrdataset_initialiseFromParquet(unittest.TestCase):
+
+	def test_init(self):
+
+		noSamp = numpy.random.randint(5, high=10, size=None)
+		noFeat = numpy.random.randint(500, high=1000, size=None)
+
+		dataset = generateTestDataset(noSamp, noFeat, dtype='NMRDataset', sop='GenericNMRurine')
+		dataset.name = 'Testing'
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+
+			dataset.exportDataset(destinationPath=tmpdirname, saveFormat='ParquetLong', withExclusions=False)
+
+			rebuiltData = nPYc.NMRDataset(os.path.join(tmpdirname, 'Testing_sampleMetadata.parquet'), fileType='parquet export')
+
+			numpy.testing.assert_array_equal(rebuiltData.intensityData, dataset.intensityData)
+			numpy.testing.assert_array_equal(rebuiltData._scale, dataset.featureMetadata['ppm'].values)
+			for column in ['Sample File Name', 'SampleType', 'AssayRole', 'Run Order']:
+				pandas.util.testing.assert_series_equal(rebuiltData.sampleMetadata[column], dataset.sampleMetadata[column])
+
+			self.assertEqual(rebuiltData.name, dataset.name)
+
+
 if __name__ == '__main__':
 	unittest.main()
@@ -6,6 +6,7 @@ import sys
 import unittest
 import unittest.mock
 import tempfile
+import importlib.util
 from pandas.util.testing import assert_frame_equal
 import os
 import copy
@@ -351,6 +352,52 @@ class test_targeteddataset_synthetic(unittest.TestCase):
 				self.assertEqual(getattr(self.targetedData1,i), getattr(copiedTargetedData,i))
 
 
+	@unittest.skipUnless(importlib.util.find_spec('h5py'), 'h5py is not installed')
+	def test_targeteddataset_hdf5(self):
+		# Use targetedData3 for a basic (not merged) dataset, use targetedData1 for a merged dataset.
+
+		for targetedData in [self.targetedData3, self.targetedData1]:
+			targetedData.name = 'UnitTest'
+
+			with tempfile.TemporaryDirectory() as tmpdirname:
+				targetedData.exportDataset(destinationPath=tmpdirname, saveFormat='HDF5', withExclusions=False)
+
+				with self.subTest(msg='Full dataset'):
+					rebuiltData = nPYc.TargetedDataset(os.path.join(tmpdirname, 'UnitTest.h5'), fileType='hdf5')
+
+					numpy.testing.assert_array_equal(rebuiltData._intensityData, targetedData._intensityData)
+					assert_frame_equal(rebuiltData.sampleMetadata[targetedData.sampleMetadata.columns], targetedData.sampleMetadata)
+					assert_frame_equal(rebuiltData.featureMetadata, targetedData.featureMetadata)
+					assert_frame_equal(rebuiltData.expectedConcentration, targetedData.expectedConcentration)
+					self.assertEqual(type(rebuiltData.calibration), type(targetedData.calibration))
+
+				with self.subTest(msg='Last feature'):
+					rebuiltData = nPYc.TargetedDataset(os.path.join(tmpdirname, 'UnitTest.h5'), fileType='hdf5', featureSlice=[targetedData.noFeatures - 1])
+
+					numpy.testing.assert_array_equal(rebuiltData._intensityData, targetedData._intensityData[:, -1:])
+					assert_frame_equal(rebuiltData.expectedConcentration, targetedData.expectedConcentration.iloc[:, -1:])
+					self.assertEqual(rebuiltData.validateObject(verbose=False, raiseError=False, raiseWarning=False)['BasicTargetedDataset'], True)
+
+
+	def test_targeteddataset_save_load(self):
+		# Use targetedData3 for a basic (not merged) dataset, use targetedData1 for a merged dataset.
+
+		for targetedData in [self.targetedData3, self.targetedData1]:
+			with self.subTest(msg=targetedData.name):
+				with tempfile.TemporaryDirectory() as tmpdirname:
+					targetedData.save(tmpdirname)
+
+					rebuiltData = nPYc.objects.Dataset.load(tmpdirname)
+
+					self.assertIsInstance(rebuiltData, nPYc.TargetedDataset)
+					numpy.testing.assert_array_equal(rebuiltData._intensityData, targetedData._intensityData)
+					assert_frame_equal(rebuiltData.sampleMetadata, targetedData.sampleMetadata)
+					assert_frame_equal(rebuiltData.featureMetadata, targetedData.featureMetadata)
+					assert_frame_equal(rebuiltData.expectedConcentration, targetedData.expectedConcentration)
+					self.assertEqual(type(rebuiltData.calibration), type(targetedData.calibration))
+					self.assertEqual(rebuiltData.validateObject(verbose=False, raiseError=False, raiseWarning=False)['BasicTargetedDataset'], True)
+
+
 	def test_targeteddataset_validateObject(self):
 		# Use targetedData3 for a basic (not merged) dataset, use targetedData1 for a merged dataset.
 		# Required for calibration checks as code split between dict and list of dict
@@ -85,6 +85,83 @@ class test_utilities_internal(unittest.TestCase):
 			numpy.testing.assert_allclose(pearson, pearson_scipy, err_msg='Pearson Correlation output does not equal scipy.')
 
 
+	def test_applytofeatureblocks(self):
+		"""
+		Statistics calculated in blocks of features match those calculated on the whole matrix.
+		"""
+		from unittest.mock import patch
+		from nPYc.utilities._internal import _applyToFeatureBlocks
+		from nPYc.utilities.ms import _rsd, _sequentialPrecision
+		from nPYc.utilities.normalisation import TotalAreaNormaliser
+
+		X = numpy.abs(numpy.random.normal(size=(40, 97))) + 1
+		Y = numpy.random.normal(size=40)
+		sampleMask = numpy.random.rand(40) > 0.3
+		featureMask = numpy.random.rand(97) > 0.3
+
+		expectedRSD = _rsd(X[sampleMask, :])
+		expectedSP = _sequentialPrecision(X)
+		expectedCorrelation = nPYc.utilities._internal._vcorrcoef(X[sampleMask, :][:, featureMask], Y[sampleMask], method='spearman')
+
+		# Blocks of three features, processed on two threads
+		with patch('nPYc.utilities._internal._featureBlockBytes', 40 * 8 * 3), patch('nPYc.utilities._internal._featureBlockThreads', 2):
+
+			with self.subTest(msg='rsd'):
+				numpy.testing.assert_allclose(nPYc.utilities.ms.rsd(X, sampleMask=sampleMask), expectedRSD)
+
+			with self.subTest(msg='sequentialPrecision'):
+				numpy.testing.assert_allclose(nPYc.utilities.ms.sequentialPrecision(X), expectedSP)
+
+			with self.subTest(msg='_vcorrcoef'):
+				numpy.testing.assert_allclose(nPYc.utilities._internal._vcorrcoef(X, Y, method='spearman', sampleMask=sampleMask, featureMask=featureMask), expectedCorrelation)
+
+			with self.subTest(msg='Memmapped matrix'):
+				with tempfile.TemporaryDirectory() as tmpdirname:
+					memmapped = numpy.memmap(os.path.join(tmpdirname, 'X.dat'), dtype=X.dtype, mode='w+', shape=X.shape)
+					memmapped[:] = X
+
+					numpy.testing.assert_allclose(nPYc.utilities.ms.rsd(memmapped, sampleMask=sampleMask), expectedRSD)
+					del memmapped
+
+			with self.subTest(msg='Lazily normalised matrix'):
+				normaliser = TotalAreaNormaliser(keepMagnitude=False)
+				lazy = normaliser.normalise(X, lazy=True)
+
+				numpy.testing.assert_allclose(nPYc.utilities.ms.rsd(lazy), _rsd(numpy.asarray(lazy)))
+
+			with self.subTest(msg='No features'):
+				self.assertEqual(_applyToFeatureBlocks(_rsd, X[:, :0]).shape, (0,))
+
+
+	def test_writecsvblocks(self):
+		"""
+		CSVs written in blocks of rows read back as the matrix written.
+		"""
+		import io
+		from unittest.mock import patch
+		from nPYc.utilities._internal import _formatCSVRows, _writeCSVBlocks
+
+		X = numpy.random.lognormal(size=(23, 11))
+		X[0, 1] = numpy.nan
+		X[2, 3] = numpy.inf
+		X[4, 5] = -numpy.inf
+
+		with self.subTest(msg='Formatting'):
+			self.assertEqual(_formatCSVRows(numpy.array([[0.1, numpy.nan, numpy.inf, -numpy.inf, 2]])), ['0.1,nan,inf,-inf,2.0\n'])
+			self.assertEqual(_formatCSVRows(numpy.array([[0.1, numpy.nan, numpy.inf, -numpy.inf]]), naRep='', infRep=('>ULOQ', '<LLOQ'), lineTerminator=None), ['0.1,,>ULOQ,<LLOQ'])
+
+		# Blocks of two rows, formatted on three threads
+		with patch('nPYc.utilities._internal._csvBlockBytes', 11 * 8 * 2), patch('nPYc.utilities._internal._csvThreads', 3):
+			file = io.StringIO()
+			_writeCSVBlocks(file, lambda start, stop: ''.join(_formatCSVRows(X[start:stop])), X.shape[0], X.shape[1] * 8)
+
+		with self.subTest(msg='Round trip'):
+			numpy.testing.assert_array_equal(numpy.loadtxt(io.StringIO(file.getvalue()), delimiter=','), X)
+
+		with self.subTest(msg='Matches writing in one block'):
+			self.assertEqual(file.getvalue(), ''.join(_formatCSVRows(X)))
+
+
 	def test_copybackingfiles(self):
 		"""
 		Check files are copied to the location specified (we trust the shutil.copy call to preserve contents).
@@ -239,6 +316,61 @@ class test_utilities_ms(unittest.TestCase):
 		self.assertRaises(KeyError, nPYc.utilities.rsdsBySampleType, nPYc.Dataset(), useColumn='Not There')
 
 
+	def test_qcStatistics(self):
+
+		from generateTestDataset import generateTestDataset
+
+		data = generateTestDataset(50, 120)
+		data.sampleMask[:5] = False
+
+		statistics = data.qcStatistics()
+
+		for (name, mask) in data.sampleClassMasks.items():
+			mask = mask & data.sampleMask
+			if numpy.sum(mask) == 0:
+				continue
+			values = data.intensityData[mask, :]
+
+			with self.subTest(msg=name):
+				self.assertEqual(statistics.counts[name], numpy.sum(mask))
+				numpy.testing.assert_array_equal(statistics[name, 'mean'], numpy.mean(values, axis=0))
+				numpy.testing.assert_array_equal(statistics[name, 'std'], numpy.std(values, axis=0))
+				numpy.testing.assert_array_equal(statistics[name, 'rsd'], nPYc.utilities.rsd(values))
+				numpy.testing.assert_array_equal(statistics[name, 'median'], numpy.median(values, axis=0))
+				numpy.testing.assert_array_equal(statistics[name, 'p95'], numpy.percentile(values, 95, axis=0))
+
+		with self.subTest(msg='Table'):
+			self.assertEqual(statistics.table.shape, (120, 5 * len(data.sampleClassMasks)))
+
+		with self.subTest(msg='Empty class'):
+			empty = nPYc.utilities.QCStatistics(data.intensityData, {'None': numpy.zeros(50, dtype=bool)})
+			self.assertEqual(empty.counts['None'], 0)
+			self.assertTrue(numpy.all(numpy.isnan(empty['None', 'mean'])))
+
+		with self.subTest(msg='Cached'):
+			self.assertIs(data.qcStatistics(), statistics)
+			self.assertIs(data.qcStatistics(statistics=['rsd']), statistics)
+
+		with self.subTest(msg='Subset'):
+			ssMask = data.sampleClassMasks['SS'] & data.sampleMask
+			subset = data.qcStatistics({'SS': ssMask}, statistics=['rsd'])
+			self.assertEqual(subset.statistics, ('rsd',))
+			self.assertEqual(list(subset.table.columns), [('SS', 'rsd')])
+			numpy.testing.assert_array_equal(subset['SS', 'rsd'], statistics['SS', 'rsd'])
+			self.assertIs(data.qcStatistics({'SS': ssMask}, statistics=['rsd']), subset)
+			self.assertIsNot(data.qcStatistics({'SS': ssMask}), subset)
+			self.assertRaises(ValueError, nPYc.utilities.QCStatistics, data.intensityData, {'SS': ssMask}, statistics=['variance'])
+
+		with self.subTest(msg='Samples changed'):
+			data.sampleMask[5] = False
+			self.assertIsNot(data.qcStatistics(), statistics)
+
+		with self.subTest(msg='Data changed'):
+			statistics = data.qcStatistics()
+			data.intensityData = data.intensityData * 2
+			numpy.testing.assert_array_almost_equal(data.qcStatistics()['SS', 'mean'], statistics['SS', 'mean'] * 2)
+
+
 class test_utilities_conditionaljoin(unittest.TestCase):
 
 	def test_utilities_conditionaljoin_assertstring(self):
@@ -1153,5 +1285,131 @@ class test_utilities_fitPeak(unittest.TestCase):
 		self.assertRaises(ValueError, fitPeak, numpy.array([0, 1]), numpy.array([0, 1]), [0,1], 'Too many')
 
 
+class test_utilities_profiling(unittest.TestCase):
+
+	def setUp(self):
+		from generateTestDataset import generateTestDataset
+
+		self.data = generateTestDataset(10, 20)
+		nPYc.profiling.reset()
+
+	def tearDown(self):
+		nPYc.profiling.disable()
+		nPYc.profiling.reset()
+
+	def test_profiling_disabled(self):
+
+		self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+
+		self.assertFalse(nPYc.profiling.isEnabled())
+		self.assertEqual(nPYc.profiling.summary().shape[0], 0)
+
+	def test_profiling_profile(self):
+
+		with nPYc.profiling.profile(allocations=True):
+			self.assertTrue(nPYc.profiling.isEnabled())
+			self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+			self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+			self.data.applyMasks()
+
+		self.assertFalse(nPYc.profiling.isEnabled())
+
+		summary = nPYc.profiling.summary()
+
+		with self.subTest(msg='Calls recorded'):
+			self.assertEqual(summary.loc['Dataset.updateMasks', 'Calls'], 2)
+			self.assertEqual(summary.loc['Dataset.applyMasks', 'Calls'], 1)
+
+		with self.subTest(msg='Times'):
+			self.assertTrue((summary['Wall Time'] >= summary['Max Wall Time']).all())
+			self.assertTrue((summary['CPU Time'] >= 0).all())
+
+		with self.subTest(msg='Allocations'):
+			self.assertTrue((summary['Peak Allocated'] >= 0).all())
+
+		with self.subTest(msg='Log entry peak memory'):
+			self.assertIsNotNone(self.data.Attributes['Log'][-1].peakMemory)
+
+		with self.subTest(msg='Not recorded once disabled'):
+			self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+			self.assertEqual(nPYc.profiling.summary().loc['Dataset.updateMasks', 'Calls'], 2)
+
+	def test_profiling_profile_without_reset_peak(self):
+
+		import tracemalloc
+
+		# tracemalloc.reset_peak is only available from Python 3.9
+		resetPeak = getattr(tracemalloc, 'reset_peak', None)
+		if resetPeak is not None:
+			del tracemalloc.reset_peak
+		try:
+			with nPYc.profiling.profile(allocations=True):
+				self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+				self.data.applyMasks()
+		finally:
+			if resetPeak is not None:
+				tracemalloc.reset_peak = resetPeak
+
+		summary = nPYc.profiling.summary()
+
+		self.assertTrue((summary['Peak Allocated'] >= 0).all())
+		self.assertIsNotNone(self.data.Attributes['Log'][-1].peakMemory)
+
+	def test_profiling_profile_nested(self):
+
+		import tracemalloc
+
+		nPYc.profiling.enable()
+		with nPYc.profiling.profile(allocations=True):
+			self.assertTrue(tracemalloc.is_tracing())
+			self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+
+		with self.subTest(msg='Tracing stopped'):
+			self.assertTrue(nPYc.profiling.isEnabled())
+			self.assertFalse(tracemalloc.is_tracing())
+
+		with self.subTest(msg='Allocations no longer recorded'):
+			self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+			self.assertEqual(nPYc.profiling.summary().loc['Dataset.updateMasks', 'Calls'], 2)
+
+		with self.subTest(msg='Tracing started elsewhere kept'):
+			tracemalloc.start()
+			try:
+				with nPYc.profiling.profile(allocations=True):
+					pass
+				self.assertTrue(tracemalloc.is_tracing())
+			finally:
+				tracemalloc.stop()
+
+	def test_profiling_summary_csv(self):
+
+		nPYc.profiling.enable()
+		self.data.updateMasks(withArtifactualFiltering=False, filterFeatures=False)
+		nPYc.profiling.disable()
+
+		with tempfile.TemporaryDirectory() as tmpdirname:
+			path = os.path.join(tmpdirname, 'profile.csv')
+			summary = nPYc.profiling.summary(path=path)
+
+			saved = pandas.read_csv(path, index_col=0)
+
+		self.assertEqual(saved.index.tolist(), summary.index.tolist())
+		self.assertTrue(numpy.isnan(saved.loc['Dataset.updateMasks', 'Peak Allocated']))
+
+	def test_profiling_profiled(self):
+
+		@nPYc.profiling.profiled(name='square')
+		def square(x):
+			return x ** 2
+
+		self.assertEqual(square(3), 9)
+
+		with nPYc.profiling.profile():
+			self.assertEqual(square(4), 16)
+			self.assertRaises(TypeError, square, 'a')
+
+		self.assertEqual(nPYc.profiling.summary().loc['square', 'Calls'], 2)
+
+
 if __name__ == '__main__':
 	unittest.main()
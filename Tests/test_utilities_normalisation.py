@@ -81,6 +81,77 @@ class test_utilities_totalAreaNormaliser(unittest.TestCase):
 		numpy.testing.assert_array_equal(X.sum(axis=1), tanorm.normalisation_coefficients)
 
 
+	def test_dataVersion(self):
+
+		tanorm = TotalAreaNormaliser()
+		expected = TotalAreaNormaliser().normalise(self.X)
+
+		with self.subTest(msg='Coefficients reused for the same version'):
+			numpy.testing.assert_array_almost_equal(expected, tanorm.normalise(self.X, dataVersion=1))
+			coefficients = tanorm.normalisation_coefficients
+
+			tanorm.normalise(self.X, dataVersion=1)
+			self.assertIs(coefficients, tanorm.normalisation_coefficients)
+
+		with self.subTest(msg='Coefficients recalculated for a new version'):
+			tanorm.normalise(self.X, dataVersion=2)
+			self.assertIsNot(coefficients, tanorm.normalisation_coefficients)
+
+		with self.subTest(msg='Coefficients recalculated without a version'):
+			coefficients = tanorm.normalisation_coefficients
+			tanorm.normalise(self.X)
+			self.assertIsNot(coefficients, tanorm.normalisation_coefficients)
+
+
+	def test_lazy(self):
+
+		from nPYc.utilities.normalisation import LazyNormalisedArray
+
+		tanorm = TotalAreaNormaliser()
+		expected = TotalAreaNormaliser().normalise(self.X)
+		lazyX = tanorm.normalise(self.X, lazy=True)
+
+		self.assertIsInstance(lazyX, LazyNormalisedArray)
+		self.assertEqual(lazyX.shape, self.X.shape)
+
+		featureMask = numpy.random.rand(self.noFeat) > 0.5
+		sampleMask = numpy.random.rand(self.noSamp) > 0.5
+
+		slices = {'Full matrix': numpy.s_[:],
+				  'Feature mask': numpy.s_[:, featureMask],
+				  'Sample mask': numpy.s_[sampleMask, :],
+				  'Both masks': numpy.ix_(sampleMask, featureMask),
+				  'Single column': numpy.s_[:, 3],
+				  'Single row': numpy.s_[2],
+				  'Single element': numpy.s_[1, 2],
+				  'Index list': numpy.s_[[0, 2, 4], 1:5]}
+
+		for msg, key in slices.items():
+			with self.subTest(msg=msg):
+				numpy.testing.assert_array_almost_equal(expected[key], lazyX[key])
+
+		with self.subTest(msg='Materialised view'):
+			numpy.testing.assert_array_almost_equal(expected, numpy.asarray(lazyX))
+
+		with self.subTest(msg='numpy functions'):
+			numpy.testing.assert_array_almost_equal(numpy.mean(expected, axis=0), numpy.mean(lazyX, axis=0))
+			numpy.testing.assert_array_almost_equal(numpy.nanmedian(expected, axis=1), numpy.nanmedian(lazyX, axis=1))
+			numpy.testing.assert_array_equal(numpy.isfinite(expected), numpy.isfinite(lazyX))
+
+		with self.subTest(msg='Operators'):
+			numpy.testing.assert_array_almost_equal(expected * 2 - 1, lazyX * 2 - 1)
+			numpy.testing.assert_array_equal(expected > 0, lazyX > 0)
+
+		with self.subTest(msg='ndarray attributes'):
+			numpy.testing.assert_array_almost_equal(expected.T, lazyX.T)
+			self.assertAlmostEqual(expected.sum(), lazyX.sum())
+			self.assertEqual(len(expected), len(lazyX))
+
+		with self.subTest(msg='Item assignment not allowed'):
+			with self.assertRaises(TypeError):
+				lazyX[0, 0] = 1
+
+
 	def test_eq_(self):
 		"""
 		Check that the TotalAreaNormaliser equality testing works
@@ -162,6 +233,35 @@ class test_utilities_probabilisticQuotientNormaliser(unittest.TestCase):
 		numpy.testing.assert_array_equal(reference, pqn_norm.reference)
 
 
+	def test_dataVersion(self):
+
+		pqn_norm = ProbabilisticQuotientNormaliser()
+		expected = pqn_norm.normalise(self.X)
+
+		with self.subTest(msg='Coefficients reused for the same version'):
+			numpy.testing.assert_array_almost_equal(expected, pqn_norm.normalise(self.X, dataVersion=1))
+			coefficients = pqn_norm.normalisation_coefficients
+
+			pqn_norm.normalise(self.X, dataVersion=1)
+			self.assertIs(coefficients, pqn_norm.normalisation_coefficients)
+
+		with self.subTest(msg='Coefficients recalculated for a new version'):
+			X = numpy.random.randn(self.noSamp, self.noFeat)
+			expectedX = ProbabilisticQuotientNormaliser().normalise(X)
+
+			numpy.testing.assert_array_almost_equal(expectedX, pqn_norm.normalise(X, dataVersion=2))
+			self.assertIsNot(coefficients, pqn_norm.normalisation_coefficients)
+
+		with self.subTest(msg='Lazy view uses the same coefficients'):
+			lazyX = pqn_norm.normalise(X, dataVersion=2, lazy=True)
+			self.assertIs(lazyX.normalisation_coefficients, pqn_norm.normalisation_coefficients)
+			numpy.testing.assert_array_almost_equal(expectedX[:, 5:10], lazyX[:, 5:10])
+
+		with self.subTest(msg='Hash fallback without a version'):
+			numpy.testing.assert_array_almost_equal(expected, pqn_norm.normalise(self.X))
+			numpy.testing.assert_array_almost_equal(coefficients, pqn_norm.normalisation_coefficients)
+
+
 	def test_nans(self):
 		##
 		# Check we dont crash with NaNs
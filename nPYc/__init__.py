@@ -3,12 +3,34 @@ The `nPYc-Toolbox <https://github.com/phenomecentre/nPYc-Toolbox>`_ defines obje
 """
 __version__ = '1.2.3'
 
+import importlib
+import sys
+import types
+
 from . import enumerations
 from .objects import Dataset, MSDataset, NMRDataset, TargetedDataset
 from . import utilities
-from . import plotting
-from . import reports
-from . import batchAndROCorrection
-from . import multivariate
+from . import profiling
+
+# Submodules drawing figures or fitting models pull in matplotlib, seaborn, plotly, statsmodels and pyChemometrics, so are imported on first use
+_lazySubmodules = ('plotting', 'reports', 'batchAndROCorrection', 'multivariate')
+
+
+class _LazyModule(types.ModuleType):
+	"""
+	Module importing :py:data:`_lazySubmodules` when first accessed. Set as the class of the package, as a module level ``__getattr__`` needs Python 3.7.
+	"""
+
+	def __getattr__(self, name):
+		if name in _lazySubmodules:
+			return importlib.import_module('.' + name, self.__name__)
+
+		raise AttributeError('module \'%s\' has no attribute \'%s\'' % (self.__name__, name))
+
+	def __dir__(self):
+		return sorted(set(self.__dict__) | set(_lazySubmodules))
+
+
+sys.modules[__name__].__class__ = _LazyModule
 
-__all__ = ['Dataset', 'MSDataset', 'plotting', 'reports', 'extractParams', 'NMRDataset', 'multivariate', 'TargetedDataset']
+__all__ = ['Dataset', 'MSDataset', 'plotting', 'reports', 'extractParams', 'NMRDataset', 'multivariate', 'TargetedDataset', 'profiling']
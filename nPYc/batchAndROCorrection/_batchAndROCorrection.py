@@ -16,9 +16,10 @@ import sys
 import copy
 from datetime import datetime, timedelta
 from ..objects._msDataset import MSDataset
-from ..enumerations import AssayRole, SampleType
+from ..profiling import profiled
 
 
+@profiled
 def correctMSdataset(data, window=11, method='LOWESS', align='median', parallelise=True, excludeFailures=True):
 	"""
 	Conduct run-order correction and batch alignment on the :py:class:`~nPYc.objects.MSDataset` instance *data*, returning a new instance with corrected intensity values.
@@ -57,7 +58,7 @@ def correctMSdataset(data, window=11, method='LOWESS', align='median', paralleli
 
 		correctedP = _batchCorrectionHead(data.intensityData,
 									 data.sampleMetadata['Run Order'].values,
-									 (data.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (data.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference),
+									 data.sampleClassMasks['SP'],
 									 data.sampleMetadata['Correction Batch'].values,
 									 window=window,
 									 method=method,
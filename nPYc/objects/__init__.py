@@ -2,5 +2,6 @@ from ._dataset import Dataset
 from ._msDataset import MSDataset
 from ._nmrDataset import NMRDataset
 from ._targetedDataset import TargetedDataset
+from ._concatenate import concatenate
 
-__all__ = ['Dataset', 'MSDataset', 'NMRDataset','TargetedDataset']
+__all__ = ['Dataset', 'MSDataset', 'NMRDataset','TargetedDataset', 'concatenate']
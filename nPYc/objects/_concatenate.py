@@ -0,0 +1,178 @@
+"""
+Merging of datasets holding batches of samples into a single dataset, see :py:func:`concatenate`.
+"""
+import copy
+import functools
+import operator
+import warnings
+from datetime import datetime
+import numpy
+import pandas
+
+
+def _concatenateSampleValues(values, noSamples, featureColumns, noFeatures):
+	"""
+	Merge the values of an attribute held for each sample (and optionally each feature) by each dataset, filling those not held with ``True`` or ``NaN``.
+	"""
+	present = [value for value in values if isinstance(value, numpy.ndarray) and (value.ndim > 0)]
+	if not present:
+		return None
+
+	fill = True if present[0].dtype == bool else numpy.nan
+	dtype = bool if present[0].dtype == bool else numpy.result_type(*present, numpy.float64)
+
+	if featureColumns is None:
+		shape = (sum(noSamples),) + present[0].shape[1:]
+	else:
+		shape = (sum(noSamples), noFeatures)
+
+	merged = numpy.full(shape, fill, dtype=dtype)
+
+	start = 0
+	for (value, rows, columns) in zip(values, noSamples, featureColumns or [None] * len(values)):
+		if isinstance(value, numpy.ndarray) and (value.ndim > 0) and (value.shape[0] == rows):
+			if columns is None:
+				merged[start:start + rows] = value
+			else:
+				merged[start:start + rows, columns] = value
+		start += rows
+
+	return merged
+
+
+def concatenate(datasets, on=None):
+	"""
+	Merge datasets, each holding a batch of samples, into a single dataset, in one pass.
+
+	`dataset = nPYc.objects.concatenate([batch1, batch2, batch3])`
+
+	All datasets must be of the same class. :py:attr:`~Dataset.sampleMetadata` tables are concatenated in the order given, and features are matched on the *on* column of :py:attr:`~Dataset.featureMetadata`. Features not measured in every batch are kept, with ``NaN`` intensities in the batches missing them, and their metadata taken from the first batch holding them. The merged :py:attr:`~Dataset.intensityData` is allocated once, memory-mapped if the first dataset uses :py:meth:`~Dataset.useMemmap`, and each batch is copied into it directly, so the time taken grows linearly with the number of batches, rather than quadratically as when datasets are added pairwise.
+
+	:py:attr:`~Dataset.sampleMask` is concatenated, a feature is masked if masked in any batch, and per-sample attributes (such as :py:attr:`~MSDataset.corrExclusions`) are concatenated. :py:attr:`~Dataset.Attributes`, :py:attr:`~Dataset.Normalisation` and :py:attr:`~Dataset.name` are those of the first dataset. Exclusions journaled by :py:meth:`~Dataset.applyMasks` are not carried over.
+
+	:py:class:`TargetedDataset` batches are excluded from the single allocation: they carry per-batch calibration, :py:attr:`~TargetedDataset.expectedConcentration` and limits of quantification, and are renumbered and merged pairwise with :py:meth:`TargetedDataset.__add__`, in the order given. Each addition copies the merged data so far, so for these the time taken still grows quadratically with the number of batches.
+
+	:param datasets: Datasets to merge
+	:type datasets: list of Dataset
+	:param on: Column of :py:attr:`~Dataset.featureMetadata` to match features on, if ``None`` 'ppm' for :py:class:`NMRDataset` and 'Feature Name' otherwise
+	:type on: None or str
+	:return: The merged dataset
+	:rtype: Dataset
+	:raises ValueError: if *datasets* is empty, the datasets hold different types of variable or come from different platforms, or features cannot be matched
+	:raises TypeError: if the datasets are not all of the same class
+	"""
+	from ._dataset import Dataset
+	from ._nmrDataset import NMRDataset
+	from ._targetedDataset import TargetedDataset
+
+	datasets = list(datasets)
+	if not datasets:
+		raise ValueError('At least one dataset is required.')
+
+	cls = datasets[0].__class__
+	for dataset in datasets:
+		if dataset.__class__ is not cls:
+			raise TypeError('Can only concatenate datasets of the same class, not %s and %s.' % (cls.__name__, dataset.__class__.__name__))
+		if dataset.VariableType != datasets[0].VariableType:
+			raise ValueError('Can only concatenate datasets with the same VariableType.')
+		if getattr(dataset, 'AnalyticalPlatform', None) != getattr(datasets[0], 'AnalyticalPlatform', None):
+			raise ValueError('Can only concatenate datasets with the same AnalyticalPlatform.')
+
+	# Batch renumbering, per-batch featureMetadata columns and calibration are defined pairwise by TargetedDataset.__add__
+	if issubclass(cls, TargetedDataset):
+		return functools.reduce(operator.add, datasets)
+
+	if on is None:
+		on = 'ppm' if issubclass(cls, NMRDataset) else 'Feature Name'
+
+	for dataset in datasets:
+		if on not in dataset.featureMetadata.columns:
+			raise ValueError('Column \'%s\' must be in the featureMetadata of each dataset to match features.' % (on))
+		if not dataset.featureMetadata[on].is_unique:
+			raise ValueError('Values of featureMetadata[\'%s\'] must be unique in each dataset to match features.' % (on))
+
+	## Features, in order of first appearance
+	first = datasets[0]
+	if all(numpy.array_equal(dataset.featureMetadata[on].values, first.featureMetadata[on].values) for dataset in datasets):
+		featureMetadata = first.featureMetadata.copy()
+		featureColumns = [numpy.arange(first.noFeatures)] * len(datasets)
+	else:
+		featureMetadata = pandas.concat([dataset.featureMetadata for dataset in datasets], ignore_index=True, sort=False)
+		featureMetadata = featureMetadata.drop_duplicates(subset=on, keep='first').reset_index(drop=True)
+		featureIndex = pandas.Index(featureMetadata[on])
+		featureColumns = [featureIndex.get_indexer(dataset.featureMetadata[on]) for dataset in datasets]
+	noFeatures = featureMetadata.shape[0]
+	allFeatures = all(len(columns) == noFeatures for columns in featureColumns)
+
+	## Samples
+	noSamples = [dataset.noSamples for dataset in datasets]
+	sampleMetadata = pandas.concat([dataset.sampleMetadata for dataset in datasets], ignore_index=True, sort=False)
+
+	if 'Sample File Name' in sampleMetadata.columns:
+		duplicated = sampleMetadata['Sample File Name'].duplicated(keep=False)
+		if duplicated.any():
+			warnings.warn('The following \'Sample File Name\' are present more than once: ' + str(sampleMetadata.loc[duplicated, 'Sample File Name'].unique().tolist()))
+
+	## Preallocate the merged matrix and copy each batch into it
+	dtype = numpy.result_type(*[dataset._intensityData.dtype for dataset in datasets])
+	if not allFeatures:
+		dtype = numpy.result_type(dtype, numpy.float64)
+	shape = (sum(noSamples), noFeatures)
+
+	storage = first.__dict__.get('_memmapStorage')
+	if storage is not None:
+		intensityData = storage.allocate(shape, dtype)
+	else:
+		intensityData = numpy.empty(shape, dtype=dtype)
+	if not allFeatures:
+		intensityData[:] = numpy.nan
+
+	sampleMask = numpy.ones(shape[0], dtype=bool)
+	featureMask = numpy.ones(noFeatures, dtype=bool)
+
+	start = 0
+	for (dataset, rows, columns) in zip(datasets, noSamples, featureColumns):
+		if allFeatures and numpy.array_equal(columns, numpy.arange(noFeatures)):
+			intensityData[start:start + rows] = dataset._intensityData
+		else:
+			intensityData[start:start + rows, columns] = dataset._intensityData
+
+		sampleMask[start:start + rows] = numpy.asarray(dataset.sampleMask, dtype=bool)
+		featureMask[columns] &= numpy.asarray(dataset.featureMask, dtype=bool)
+
+		start += rows
+
+	## Build the merged dataset
+	if cls is Dataset:
+		merged = cls()
+	else:
+		merged = cls('', fileType='empty')
+
+	if storage is not None:
+		merged._memmapStorage = storage
+
+	merged._intensityData = intensityData
+	merged.sampleMetadata = sampleMetadata
+	merged.featureMetadata = featureMetadata
+	merged.sampleMask = sampleMask
+	merged.featureMask = featureMask
+
+	merged.Attributes = copy.deepcopy(first.Attributes)
+	merged.Normalisation = copy.deepcopy(first.Normalisation)
+	merged.VariableType = first.VariableType
+	merged.name = first.name
+	if hasattr(first, 'AnalyticalPlatform'):
+		merged.AnalyticalPlatform = first.AnalyticalPlatform
+	if 'ppm' in featureMetadata.columns and hasattr(first, '_scale'):
+		merged._scale = featureMetadata['ppm'].values
+
+	for (name, axes) in cls._hdf5Attributes.items():
+		if (not axes) or (axes[0] != 'samples'):
+			continue
+		value = _concatenateSampleValues([getattr(dataset, name, None) for dataset in datasets], noSamples, featureColumns if 'features' in axes else None, noFeatures)
+		if value is not None:
+			setattr(merged, name, value)
+
+	merged.Attributes['Log'].append([datetime.now(), 'Concatenated %i datasets (%s), with %i samples and %i features.' % (len(datasets), ', '.join(dataset.name for dataset in datasets), merged.noSamples, merged.noFeatures)])
+
+	return merged
@@ -2,8 +2,8 @@ import scipy
 import numpy
 import pandas
 import os
-import isatools.isatab as isatab
 import json
+import pickle
 import inspect
 import re
 from ..enumerations import VariableType, DatasetLevel, SampleType, AssayRole
@@ -14,7 +14,136 @@ import copy
 from ..utilities import removeDuplicateColumns
 from ..utilities import normalisation
 from ..utilities.normalisation._normaliserABC import Normaliser
+from ._exclusionJournal import ExclusionRecord
+from ._datasetView import datasetView
+from ._memmapStorage import MemmapStorage
+from ._processingLog import ProcessingLog, loggedOperation
+from ..profiling import profiled
+from ..utilities._internal import _formatCSVRows, _writeCSVBlocks, _applyToFeatureBlocks
+from ..utilities.ms import _moments, _mergeMoments, _rsdFromMoments
+from ..utilities._qcStatistics import QCStatistics
 import warnings
+import itertools
+import csv
+import io
+
+
+# Process-wide source of :py:attr:`Dataset._intensityDataVersion` tokens, so no two assignments ever share a version
+_intensityDataVersions = itertools.count(1)
+
+
+# Sample classes indexed by Dataset.sampleClassMasks, as the SampleType and AssayRole (if any) defining each
+_sampleClasses = {'SS': (SampleType.StudySample, AssayRole.Assay),
+				  'SP': (SampleType.StudyPool, AssayRole.PrecisionReference),
+				  'ER': (SampleType.ExternalReference, AssayRole.PrecisionReference),
+				  'LR': (SampleType.StudyPool, AssayRole.LinearityReference),
+				  'MR': (SampleType.MethodReference, None),
+				  'Blank': (SampleType.ProceduralBlank, None)}
+
+
+def _categoryCodes(sampleMetadata, column, enum):
+	"""
+	Return the integer codes of the *enum* members in *sampleMetadata[column]* (-1 where missing), without modifying *sampleMetadata*.
+	"""
+	dtype = pandas.api.types.CategoricalDtype(list(enum))
+	values = sampleMetadata[column]
+
+	if values.dtype == dtype:
+		return values.cat.codes.values
+
+	return pandas.Categorical(values, dtype=dtype).codes
+
+
+def _matchExclusions(table, on, items, message):
+	"""
+	Append *message* to the 'Exclusion Details' of the rows of *table* where *on* matches any of *items*, matching all items in a single hash join rather than scanning *table* for each.
+
+	:return: Tuple of the boolean mask of the rows matched, and the list of *items* matching no row
+	:rtype: (numpy.ndarray, list)
+	"""
+	items = list(items)
+	values = table[on]
+
+	matched = values.isin(items).values
+	notFound = [item for (item, found) in zip(items, pandas.Series(items, dtype=object).isin(values).values) if not found]
+
+	if 'Exclusion Details' not in table:
+		table['Exclusion Details'] = ''
+
+	if numpy.any(matched):
+		details = table.loc[matched, 'Exclusion Details']
+		empty = (details.isnull() | (details == '')).values
+		table.loc[matched, 'Exclusion Details'] = [message if isEmpty else '%s AND %s' % (detail, message) for (detail, isEmpty) in zip(details.values, empty)]
+
+	return (matched, notFound)
+
+
+# Number of sets of classes Dataset.qcStatistics keeps statistics for
+_qcStatisticsCacheSize = 8
+
+# Parsed SOP files, as path: ((mtime, size), pickled attributes), shared by all instances, see _readSOP
+_sopCache = dict()
+
+# Listings of SOP directories, as directory: (((directory, mtime), ...), paths), see _listSOPs
+_sopListingCache = dict()
+
+
+def _readSOP(path):
+	"""
+	Return the attributes in the JSON SOP file *path*, parsing it only if not already parsed since it was last modified.
+
+	Each call returns a new copy, so may be modified by the caller. Attributes are cached pickled, as unpickling is faster than copying them.
+	"""
+	stat = os.stat(path)
+	key = (stat.st_mtime_ns, stat.st_size)
+
+	cached = _sopCache.get(path)
+	if (cached is None) or (cached[0] != key):
+		with open(path) as data_file:
+			cached = (key, pickle.dumps(json.load(data_file), protocol=pickle.HIGHEST_PROTOCOL))
+		_sopCache[path] = cached
+
+	return pickle.loads(cached[1])
+
+
+def _listSOPs(directory):
+	"""
+	Return the paths of the JSON files under *directory*, listing it again only if it, or any directory under it, was modified since last listed.
+	"""
+	cached = _sopListingCache.get(directory)
+	if cached is not None:
+		try:
+			if all(os.stat(path).st_mtime_ns == mtime for (path, mtime) in cached[0]):
+				return cached[1]
+		except OSError:
+			pass
+
+	directories = list()
+	paths = list()
+	for (root, _, fileNames) in os.walk(directory):
+		directories.append((root, os.stat(root).st_mtime_ns))
+		paths.extend(os.path.join(root, fileName) for fileName in sorted(fileNames) if fileName.endswith('.json'))
+
+	cached = (tuple(directories), tuple(paths))
+	_sopListingCache[directory] = cached
+
+	return cached[1]
+
+
+def _cloneValue(value, memo):
+	"""
+	Copy *value* for :py:meth:`Dataset.clone`, sharing matrices as read-only views.
+	"""
+	if isinstance(value, numpy.ndarray) and (value.ndim == 2):
+		value = value.view()
+		value.flags.writeable = False
+		return value
+	elif isinstance(value, ExclusionRecord):
+		return value
+	elif isinstance(value, pandas.DataFrame):
+		return value.copy()
+	else:
+		return copy.deepcopy(value, memo)
 
 
 class Dataset:
@@ -23,6 +152,8 @@ class Dataset:
 
 	:param str sop: Load configuration parameters from specified SOP JSON file
 	:param sopPath: By default SOPs are loaded from the :file:`nPYc/StudyDesigns/SOP/` directory, if not ``None`` the directory specified in *sopPath=* will be searched before the builtin SOP directory.
+	:param memmap: If ``True`` or a directory, hold :py:attr:`intensityData` in memmap files on disk rather than in memory, see :py:meth:`useMemmap`
+	:type memmap: bool or str
 	"""
 
 	"""
@@ -31,26 +162,28 @@ class Dataset:
 
 	_timestampFormat = '%Y-%m-%dT%H:%M:%S'
 
-	def __init__(self, sop='Generic', sopPath=None, **kwargs):
+	# Instance attributes saved to HDF5 files in addition to the data, metadata and masks, mapped to the axes ('samples', 'features' or None) of each of their dimensions
+	_hdf5Attributes = dict()
+
+	def __init__(self, sop='Generic', sopPath=None, memmap=False, **kwargs):
 		"""
 		Bare constructor.
 		"""
 		from .. import __version__
 
+		self._memmapStorage = None
+		if memmap:
+			self._memmapStorage = MemmapStorage(None if memmap is True else memmap)
+
+		self._intensityDataCache = None
 		self._intensityData = numpy.array(None)
+		self._sampleClassMasksCache = None
+		self._sampleClassMomentsCache = dict()
+		self._sampleClassRSDCache = dict()
+		self._qcStatisticsCache = None
+		self._featureIndexCache = None
 
 		self.featureMetadata = pandas.DataFrame(None, columns=['Feature Name'])
-		"""
-		:math:`m` × :math:`q` pandas dataframe of feature identifiers and metadata
-
-		The featureMetadata table can include any datatype that can be placed in a pandas cell, However the toolbox assumes certain prerequisites on the following columns in order to function:
-
-		================ ========================================= ============
-		Column           dtype                                     Usage
-		================ ========================================= ============
-		Feature Name     str or float                              ID of the :term:`feature` measured in this column. Each 'Feature Name' must be unique in the table. If 'Feature Name' is numeric, the columns should be sorted in ascending or descending order.
-		================ ========================================= ============
-		"""
 		self.sampleMetadata = pandas.DataFrame(None,
 											   columns=['Sample ID', 'AssayRole', 'SampleType', 'Sample File Name',
 														'Sample Base Name', 'Dilution', 'Batch', 'Correction Batch',
@@ -96,6 +229,7 @@ class Dataset:
 		'figureFormat'   str                                       Format to save figures in
 		'histBins'       positive int                              Number of bins to use when drawing histograms
 		'Feature Names'  Column in :py:attr:`featureMetadata`      ID of the primary feature name
+		'Log'            ProcessingLog                             Processing steps applied, with the time each took
 		================ ========================================= ============
 		"""
 
@@ -103,7 +237,7 @@ class Dataset:
 		self.AnalyticalPlatform = None
 		""":py:class:`~nPYc.enumerations.VariableType` enum specifying the type of data represented."""
 
-		self.Attributes['Log'] = list()
+		self.Attributes['Log'] = ProcessingLog()
 		self.Attributes['Log'].append([datetime.now(), 'nPYc Toolbox version %s.' % (__version__)])
 		self._loadParameters(sop, sopPath)
 		self._Normalisation = normalisation.NullNormaliser()
@@ -113,18 +247,237 @@ class Dataset:
 
 		self._name = self.__class__.__name__
 
+	@property
+	def featureMetadata(self):
+		"""
+		:math:`m` × :math:`q` pandas dataframe of feature identifiers and metadata
+
+		The featureMetadata table can include any datatype that can be placed in a pandas cell, However the toolbox assumes certain prerequisites on the following columns in order to function:
+
+		================ ========================================= ============
+		Column           dtype                                     Usage
+		================ ========================================= ============
+		Feature Name     str or float                              ID of the :term:`feature` measured in this column. Each 'Feature Name' must be unique in the table. If 'Feature Name' is numeric, the columns should be sorted in ascending or descending order.
+		================ ========================================= ============
+
+		Assigning to :py:attr:`featureMetadata` discards the index of feature IDs used by :py:meth:`getFeatures`. Modifying the values or order of the table in-place is not tracked, re-assign the table after doing so.
+		"""
+		try:
+			return self.__dict__['featureMetadata']
+		except KeyError:
+			raise AttributeError('\'%s\' object has no attribute \'featureMetadata\'' % (self.__class__.__name__))
+
+	@featureMetadata.setter
+	def featureMetadata(self, value):
+		self.__dict__['featureMetadata'] = value
+		self._featureIndexCache = None
+
+	@featureMetadata.deleter
+	def featureMetadata(self):
+		try:
+			del self.__dict__['featureMetadata']
+		except KeyError:
+			raise AttributeError('featureMetadata')
+		self._featureIndexCache = None
+
+	@property
+	def _intensityData(self):
+		"""
+		Raw :math:`n` × :math:`m` numpy matrix of measurements, prior to normalisation.
+
+		Assigning to :py:attr:`_intensityData` increments :py:attr:`_intensityDataVersion`, invalidating any normalised view cached by :py:attr:`intensityData`. Modifying the matrix in-place is not tracked, re-assign the matrix after doing so.
+
+		Once :py:meth:`useMemmap` has been called, matrices assigned are written to memmap files.
+		"""
+		try:
+			return self.__dict__['_intensityData']
+		except KeyError:
+			raise AttributeError('\'%s\' object has no attribute \'_intensityData\'' % (self.__class__.__name__))
+
+	@_intensityData.setter
+	def _intensityData(self, X: numpy.ndarray):
+		storage = self.__dict__.get('_memmapStorage')
+		if storage is not None:
+			X = storage.store(X)
+
+		self.__dict__['_intensityData'] = X
+		self._intensityDataVersion = next(_intensityDataVersions)
+		self._intensityDataCache = None
+
+	@_intensityData.deleter
+	def _intensityData(self):
+		try:
+			del self.__dict__['_intensityData']
+		except KeyError:
+			raise AttributeError('_intensityData')
+		self._intensityDataCache = None
+
 	@property
 	def intensityData(self):
 		"""
 		:math:`n` × :math:`m` numpy matrix of measurements
+
+		Where :py:attr:`Normalisation` scales each sample, a :py:class:`~nPYc.utilities.normalisation.LazyNormalisedArray` is returned, which only normalises the rows and columns sliced from it (i.e. ``intensityData[:, featureMask]``), and otherwise behaves as the full normalised matrix. Once the full matrix has been used, it is cached and returned as a read-only :py:class:`numpy.ndarray` in place of the view.
+
+		The normalised view is cached, and only recalculated when :py:attr:`_intensityData` is re-assigned, or :py:attr:`Normalisation` is changed or reset.
 		"""
-		return self.Normalisation.normalise(self._intensityData)
+		normaliser = self.Normalisation
+
+		if self._intensityDataCache is not None:
+			(version, cachedNormaliser, coefficients, normalisedData) = self._intensityDataCache
+			if (version == self._intensityDataVersion) and (cachedNormaliser is normaliser) and (coefficients is normaliser.normalisation_coefficients):
+				# Swap the view for the full matrix once it has been materialised
+				materialised = getattr(normalisedData, '_materialised', None)
+				if materialised is not None:
+					normalisedData = materialised
+					self._intensityDataCache = (version, cachedNormaliser, coefficients, normalisedData)
+				return normalisedData
+
+		normalisedData = normaliser.normalise(self._intensityData, dataVersion=self._intensityDataVersion, lazy=True)
+		self._intensityDataCache = (self._intensityDataVersion, normaliser, normaliser.normalisation_coefficients, normalisedData)
+
+		return normalisedData
 
 	@intensityData.setter
 	def intensityData(self, X: numpy.ndarray):
 
 		self._intensityData = X
 
+	@property
+	def sampleClassMasks(self):
+		"""
+		Dictionary of read-only boolean masks of the samples in each class, based on the 'SampleType' and 'AssayRole' columns of :py:attr:`sampleMetadata`:
+
+		* **'SS'** Study Samples (:py:attr:`~nPYc.enumerations.SampleType.StudySample`, :py:attr:`~nPYc.enumerations.AssayRole.Assay`)
+		* **'SP'** Study Reference (:py:attr:`~nPYc.enumerations.SampleType.StudyPool`, :py:attr:`~nPYc.enumerations.AssayRole.PrecisionReference`)
+		* **'ER'** Long-Term Reference (:py:attr:`~nPYc.enumerations.SampleType.ExternalReference`, :py:attr:`~nPYc.enumerations.AssayRole.PrecisionReference`)
+		* **'LR'** Serial Dilution (:py:attr:`~nPYc.enumerations.SampleType.StudyPool`, :py:attr:`~nPYc.enumerations.AssayRole.LinearityReference`)
+		* **'MR'** Method Reference (:py:attr:`~nPYc.enumerations.SampleType.MethodReference`)
+		* **'Blank'** Procedural Blanks (:py:attr:`~nPYc.enumerations.SampleType.ProceduralBlank`)
+
+		Masks are built from the integer codes of the enum members in both columns, which are not modified, and are cached until either column changes.
+		"""
+		sampleTypeCodes = _categoryCodes(self.sampleMetadata, 'SampleType', SampleType)
+		assayRoleCodes = _categoryCodes(self.sampleMetadata, 'AssayRole', AssayRole)
+		key = (sampleTypeCodes.tobytes(), assayRoleCodes.tobytes())
+
+		cache = self.__dict__.get('_sampleClassMasksCache')
+		if (cache is not None) and (cache[0] == key):
+			return cache[1]
+
+		sampleTypes = list(SampleType)
+		assayRoles = list(AssayRole)
+
+		masks = dict()
+		for sampleClass, (sampleType, assayRole) in _sampleClasses.items():
+			mask = sampleTypeCodes == sampleTypes.index(sampleType)
+			if assayRole is not None:
+				mask &= assayRoleCodes == assayRoles.index(assayRole)
+			mask.flags.writeable = False
+			masks[sampleClass] = mask
+
+		self._sampleClassMasksCache = (key, masks)
+
+		return masks
+
+	def _hasSampleClasses(self):
+		"""
+		``True`` if :py:attr:`sampleMetadata` has the 'SampleType' and 'AssayRole' columns :py:attr:`sampleClassMasks` is built from.
+		"""
+		return ('SampleType' in self.sampleMetadata.columns) and ('AssayRole' in self.sampleMetadata.columns)
+
+	def _sampleClassMoments(self, sampleClass):
+		"""
+		Number, column means and sums of squared deviations from the mean of the samples in *sampleClass* of :py:attr:`sampleClassMasks` and :py:attr:`sampleMask`, calculated from :py:attr:`_intensityData`.
+
+		Moments are cached until :py:attr:`_intensityData` is re-assigned or the samples selected change, and are updated rather than recalculated by :py:meth:`appendSamples`.
+
+		:param str sampleClass: Key of :py:attr:`sampleClassMasks`
+		:return: Tuple of (count, mean, M2)
+		:rtype: (int, numpy.ndarray, numpy.ndarray)
+		"""
+		mask = self.sampleClassMasks[sampleClass] & self.sampleMask
+		key = (self._intensityDataVersion, mask.tobytes())
+
+		cache = self.__dict__.get('_sampleClassMomentsCache') or dict()
+		if (sampleClass in cache) and (cache[sampleClass][0] == key):
+			return cache[sampleClass][1]
+
+		count = int(numpy.sum(mask))
+		if count == 0:
+			moments = (0, numpy.full(self.noFeatures, numpy.nan), numpy.full(self.noFeatures, numpy.nan))
+		else:
+			(mean, M2) = _applyToFeatureBlocks(_moments, self._intensityData, sampleMask=mask)
+			moments = (count, mean, M2)
+
+		# Replace rather than update the cache, which may be shared with views
+		self._sampleClassMomentsCache = {**cache, sampleClass: (key, moments)}
+
+		return moments
+
+	def _sampleClassRSD(self, sampleClass):
+		"""
+		Percentage :term:`relative standard deviations<RSD>` of each feature in the samples in *sampleClass* of :py:attr:`sampleClassMasks` and :py:attr:`sampleMask`, from :py:meth:`_sampleClassMoments`.
+
+		RSDs are cached with the moments they are calculated from, so are recalculated only when :py:attr:`_intensityData`, :py:attr:`sampleMask` or the classes of the samples change. Each call returns a copy, which may be modified.
+
+		:param str sampleClass: Key of :py:attr:`sampleClassMasks`
+		:return: Vector of feature RSDs
+		:rtype: numpy.ndarray
+		"""
+		moments = self._sampleClassMoments(sampleClass)
+
+		cache = self.__dict__.get('_sampleClassRSDCache') or dict()
+		if (sampleClass in cache) and (cache[sampleClass][0] is moments):
+			return cache[sampleClass][1].copy()
+
+		rsd = _rsdFromMoments(*moments)
+
+		# Replace rather than update the cache, which may be shared with views
+		self._sampleClassRSDCache = {**cache, sampleClass: (moments, rsd)}
+
+		return rsd.copy()
+
+	def qcStatistics(self, classMasks=None, statistics=None):
+		"""
+		Mean, standard deviation, RSD, median and 95th percentile of each feature of :py:attr:`intensityData` in each class of samples, calculated together in a single pass over the data, see :py:class:`~nPYc.utilities.QCStatistics`.
+
+		Statistics are cached, and only recalculated when :py:attr:`intensityData` or the samples in a class change. Cached statistics of the same classes are returned if they include all those requested.
+
+		:param classMasks: Dictionary of class names and boolean masks of the samples in each, if ``None`` the classes of :py:attr:`sampleClassMasks` restricted to :py:attr:`sampleMask`
+		:type classMasks: None or dict
+		:param statistics: Statistics to calculate, if ``None`` all of :py:attr:`~nPYc.utilities.QCStatistics.statistics`
+		:type statistics: None or list of str
+		:return: Statistics of each class
+		:rtype: nPYc.utilities.QCStatistics
+		"""
+		if classMasks is None:
+			classMasks = {name: mask & self.sampleMask for (name, mask) in self.sampleClassMasks.items()}
+
+		data = self.intensityData
+		version = self._intensityDataVersion
+		key = tuple((name, numpy.asarray(mask, dtype=bool).tobytes()) for (name, mask) in classMasks.items())
+		requested = set(QCStatistics.statistics if statistics is None else statistics)
+
+		cache = self.__dict__.get('_qcStatisticsCache')
+		if (cache is None) or (cache[0] != version) or (cache[1] is not data):
+			cache = (version, data, dict())
+		else:
+			for ((cachedKey, cachedStatistics), cached) in cache[2].items():
+				if (cachedKey == key) and requested.issubset(cachedStatistics):
+					return cached
+
+		calculated = QCStatistics(data, classMasks, statistics=statistics)
+		key = (key, calculated.statistics)
+
+		# Replace rather than update the cache, which may be shared with views, keeping the latest sets of classes
+		entries = {**cache[2], key: calculated}
+		for oldKey in list(entries)[:-_qcStatisticsCacheSize]:
+			del entries[oldKey]
+		self._qcStatisticsCache = (version, data, entries)
+
+		return calculated
+
 	@property
 	def noSamples(self) -> int:
 		"""
@@ -192,6 +545,7 @@ class Dataset:
 			raise TypeError('Normalisation must implement the Normaliser ABC!')
 		else:
 			self._Normalisation = normaliser
+			self._intensityDataCache = None
 
 	def __repr__(self):
 		"""
@@ -889,8 +1243,8 @@ class Dataset:
 		# end Exclusion Data
 
 		## List additional attributes (print + log)
-		expectedSet = set({'Attributes', 'VariableType', '_Normalisation', '_name', '_intensityData', 'sampleMetadata',
-						   'featureMetadata', 'sampleMask', 'featureMask', 'sampleMetadataExcluded',
+		expectedSet = set({'Attributes', 'VariableType', '_Normalisation', '_name', '_intensityData', '_intensityDataVersion',
+						   '_intensityDataCache', '_sampleClassMasksCache', '_sampleClassMomentsCache', '_sampleClassRSDCache', '_qcStatisticsCache', '_featureIndexCache', '_memmapStorage', 'sampleMetadata', 'featureMetadata', 'sampleMask', 'featureMask', 'sampleMetadataExcluded',
 						   'intensityDataExcluded', 'featureMetadataExcluded', 'excludedFlag'})
 		objectSet = set(self.__dict__.keys())
 		additionalAttributes = objectSet - expectedSet
@@ -943,51 +1297,38 @@ class Dataset:
 		Load assay parameters from JSON SOP files located in sopPath.
 
 		SOP names should be unique (obviously), but this is not enforced. Duplicate SOP files may cause undefined behaviour.
+
+		Parsed SOP files and directory listings are cached for the life of the process, and read again only once modified on disk.
 		
 		:param sop: the SOP name
 		:type sop: string
 		:param sopPath: the path to sop
 		:type sopPath: string
 		"""
-		import json
-		from collections import ChainMap
-		from ..utilities.extractParams import buildFileList
-		import re
-
 		# Always load some generic values
-		with open(os.path.join(toolboxPath(), 'StudyDesigns', 'SOP', 'Generic.json')) as data_file:
-			attributes = json.load(data_file)
+		attributes = _readSOP(os.path.join(toolboxPath(), 'StudyDesigns', 'SOP', 'Generic.json'))
 		self.Attributes = {**self.Attributes, **attributes}
 
 		# But if SOP is Generic, skip
 		if sop == 'Generic':
 			return
 
-		def splitext(path):
-			return {os.path.splitext(os.path.basename(path))[0]: path}
-
-		pattern = re.compile('.+?\.json$')
-
 		builtinSOPS = os.path.join(toolboxPath(), 'StudyDesigns', 'SOP')
-		sopPaths = buildFileList(builtinSOPS, pattern)
+		sopPathList = list(_listSOPs(builtinSOPS))
 
 		if sopPath is not None:
 			if not os.path.isdir(sopPath):
 				raise ValueError("Path: %s must be a directory." % sopPath)
-			sopPaths.extend(buildFileList(sopPath, pattern))
-
-		# Remove empty entries from list
-		sopPathList = [x for x in sopPaths if x != []]
+			sopPathList.extend(_listSOPs(sopPath))
 
 		sopPaths = dict()
 		for sopPATH in sopPathList:
-			sopPaths.update(splitext(sopPATH))
+			sopPaths[os.path.splitext(os.path.basename(sopPATH))[0]] = sopPATH
 
 		if not sop in sopPaths:
 			raise ValueError("The SOP '%s' is not present in '%s', or '%s'." % (sop, builtinSOPS, sopPath))
 
-		with open(sopPaths[sop]) as data_file:
-			attributes = json.load(data_file)
+		attributes = _readSOP(sopPaths[sop])
 
 		self.Attributes = {**self.Attributes, **attributes}
 
@@ -1005,6 +1346,8 @@ class Dataset:
 
 		self.Attributes['Log'].append([datetime.now(), "Masks Initialised to True.\n"])
 
+	@profiled
+	@loggedOperation
 	def updateMasks(self, filterSamples=True, filterFeatures=True,
 					sampleTypes=list(SampleType),
 					assayRoles=list(AssayRole), **kwargs):
@@ -1055,9 +1398,90 @@ class Dataset:
 										   assayRoles,
 										   ', '.join("{!s}={!r}".format(key, val) for (key, val) in kwargs.items()))])
 
+	def useMemmap(self, path=None):
+		"""
+		Hold :py:attr:`intensityData` in :py:class:`numpy.memmap` files rather than in memory, so datasets larger than the memory available can be processed.
+
+		The current matrix, and any matrix assigned to the dataset from then on, is written to a new file under *path*. :py:meth:`applyMasks` writes the data retained directly to a new file, one block of samples at a time. Copies of the dataset write to the same directory.
+
+		:param path: Directory to write the memmap files to, if ``None`` a temporary directory removed with the dataset is used
+		:type path: None or str
+		"""
+		self._memmapStorage = MemmapStorage(path)
+		self._intensityData = self._intensityData
+
+	def _allocateIntensityData(self, shape):
+		"""
+		Return a zero-filled matrix of *shape* to load :py:attr:`intensityData` into, memory-mapped if :py:meth:`useMemmap` has been called.
+		"""
+		if self._memmapStorage is not None:
+			return self._memmapStorage.allocate(shape)
+
+		return numpy.zeros(shape)
+
+	def _takeIntensityData(self, rows, columns):
+		"""
+		Return the *rows* and *columns* of :py:attr:`_intensityData`, written to a new memmap if :py:meth:`useMemmap` has been called.
+		"""
+		if self._memmapStorage is not None:
+			return self._memmapStorage.take(self._intensityData, rows, columns)
+
+		return self._intensityData[numpy.ix_(rows, columns)]
+
+	def view(self, sampleMask=None, featureMask=None):
+		"""
+		Return a read-only view of the samples and features selected by *sampleMask* and *featureMask*, without copying the dataset.
+
+		The view behaves as a copy of the dataset after :py:meth:`applyMasks`, but shares the dataset's data and only selects the rows and columns viewed when they are first used, see :py:class:`~nPYc.objects._datasetView.DatasetView`.
+
+		:param sampleMask: Boolean mask of samples to view, if ``None`` the current :py:attr:`sampleMask` is used
+		:param featureMask: Boolean mask of features to view, if ``None`` the current :py:attr:`featureMask` is used
+		:return: Read-only view of the dataset
+		:rtype: DatasetView
+		:raises ValueError: if the masks do not match the dimensions of the dataset
+		"""
+		return datasetView(self, sampleMask=sampleMask, featureMask=featureMask)
+
+	def clone(self):
+		"""
+		Return a copy of the dataset that shares its data matrices with the original, for temporary working copies such as those made when generating reports.
+
+		Two-dimensional numpy arrays (such as :py:attr:`intensityData`) are shared as read-only views, and are only copied when a new matrix is assigned in their place, for example by :py:meth:`applyMasks`. Modifying a shared matrix in-place raises :py:exc:`ValueError`, while changes made in-place to the original dataset's matrices are seen by the clone. Exclusion lists are copied, but share the excluded data they hold. Everything else, including the metadata tables, is copied as by :py:func:`copy.deepcopy`.
+
+		:return: Copy of the dataset
+		:rtype: Dataset
+		"""
+		cls = self.__class__
+		result = cls.__new__(cls)
+		memo = {id(self): result}
+
+		for key, value in self.__dict__.items():
+			if isinstance(value, list) and key.endswith('Excluded'):
+				result.__dict__[key] = [_cloneValue(item, memo) for item in value]
+			else:
+				result.__dict__[key] = _cloneValue(value, memo)
+
+		result._intensityDataCache = None
+
+		return result
+
+	def _resetCaches(self):
+		"""
+		Discard any values cached from :py:attr:`intensityData`, :py:attr:`sampleMetadata` or :py:attr:`featureMetadata`.
+		"""
+		self._intensityDataCache = None
+		self._sampleClassMomentsCache = dict()
+		self._sampleClassRSDCache = dict()
+		self._qcStatisticsCache = None
+		self._featureIndexCache = None
+
+	@profiled
+	@loggedOperation
 	def applyMasks(self):
 		"""
 		Permanently delete elements masked (those set to ``False``) in :py:attr:`sampleMask` and :py:attr:`featureMask`, from :py:attr:`featureMetadata`, :py:attr:`sampleMetadata`, and :py:attr:`intensityData`.
+
+		Each exclusion step is journaled in :py:attr:`sampleMetadataExcluded`, :py:attr:`featureMetadataExcluded`, :py:attr:`intensityDataExcluded` and :py:attr:`excludedFlag`. Excluded intensities are recorded as :py:class:`~nPYc.objects._exclusionJournal.ExclusionRecord` indices into the matrix they were removed from rather than as copies, and the last step can be reverted with :py:meth:`undoExclusion`. Where the dataset has a ``fit`` matrix, its excluded rows and columns are removed and journaled with the intensities.
 		"""
 
 		# Only save to excluded if features or samples masked
@@ -1070,6 +1494,16 @@ class Dataset:
 				self.featureMetadataExcluded = []
 				self.excludedFlag = []
 
+			# Carry on indexing into the source matrix of the last record if the data has not been reassigned since
+			if self.intensityDataExcluded and isinstance(self.intensityDataExcluded[-1], ExclusionRecord) and (self.intensityDataExcluded[-1].dataVersion == self._intensityDataVersion):
+				source = self.intensityDataExcluded[-1].source
+				sampleIndex = self.intensityDataExcluded[-1].sampleIndex
+				featureIndex = self.intensityDataExcluded[-1].featureIndex
+			else:
+				source = self._intensityData
+				sampleIndex = numpy.arange(source.shape[0])
+				featureIndex = numpy.arange(source.shape[1])
+
 			# Samples
 			if sum(self.sampleMask) != len(self.sampleMask):
 
@@ -1081,32 +1515,47 @@ class Dataset:
 
 				# Save excluded samples
 				self.sampleMetadataExcluded.append(self.sampleMetadata[:][self.sampleMask == False])
-				self.intensityDataExcluded.append(self._intensityData[self.sampleMask == False, :])
 				self.featureMetadataExcluded.append(self.featureMetadata)
 				self.excludedFlag.append('Samples')
 
 				# Delete excluded samples
 				self.sampleMetadata = self.sampleMetadata.loc[self.sampleMask]
 				self.sampleMetadata.reset_index(drop=True, inplace=True)
-				self._intensityData = self._intensityData[self.sampleMask, :]
+				startVersion = self._intensityDataVersion
+				self._intensityData = self._takeIntensityData(numpy.flatnonzero(self.sampleMask), numpy.arange(self.noFeatures))
 
+				excludedFit = None
 				if hasattr(self, 'fit'):
+					excludedFit = self.fit[self.sampleMask == False, :]
 					self.fit = self.fit[self.sampleMask, :]
 
+				self.intensityDataExcluded.append(ExclusionRecord(source, 'Samples', sampleIndex[self.sampleMask == False], featureIndex,
+																  sampleIndex[self.sampleMask], featureIndex, startVersion, self._intensityDataVersion, fit=excludedFit))
+				sampleIndex = sampleIndex[self.sampleMask]
+
 			# Features
 			if sum(self.featureMask) != len(self.featureMask):
 
-				# Save excluded features
+				featureMask = numpy.asarray(self.featureMask, dtype=bool)
+
 				# Save excluded features
 				self.featureMetadataExcluded.append(self.featureMetadata[:][self.featureMask == False])
-				self.intensityDataExcluded.append(self._intensityData[:, self.featureMask == False])
 				self.sampleMetadataExcluded.append(self.sampleMetadata)
 				self.excludedFlag.append('Features')
 
 				# Delete excluded features
 				self.featureMetadata = self.featureMetadata.loc[self.featureMask]
 				self.featureMetadata.reset_index(drop=True, inplace=True)
-				self._intensityData = self._intensityData[:, self.featureMask]
+				startVersion = self._intensityDataVersion
+				self._intensityData = self._takeIntensityData(numpy.arange(self.noSamples), numpy.flatnonzero(featureMask))
+
+				excludedFit = None
+				if hasattr(self, 'fit'):
+					excludedFit = self.fit[:, ~featureMask]
+					self.fit = self.fit[:, featureMask]
+
+				self.intensityDataExcluded.append(ExclusionRecord(source, 'Features', sampleIndex, featureIndex[~featureMask],
+																  sampleIndex, featureIndex[featureMask], startVersion, self._intensityDataVersion, fit=excludedFit))
 
 			self.Attributes['Log'].append([datetime.now(), '%i samples and %i features removed from dataset.' % (
 			sum(self.sampleMask == False), sum(self.featureMask == False))])
@@ -1114,6 +1563,158 @@ class Dataset:
 			# Build new masks
 			self.initialiseMasks()
 
+	@loggedOperation
+	def undoExclusion(self):
+		"""
+		Revert the last exclusion step journaled by :py:meth:`applyMasks`, restoring the samples or features it removed to :py:attr:`sampleMetadata`, :py:attr:`featureMetadata` and :py:attr:`intensityData` in their original order.
+
+		Samples and features excluded in a single call to :py:meth:`applyMasks` are journaled as two steps, the features last. Restored intensities are those held when the step was applied, restored metadata rows are those saved in :py:attr:`sampleMetadataExcluded` or :py:attr:`featureMetadataExcluded`. Where the dataset has a ``fit`` matrix, the rows or columns journaled with the step are restored to it, and any not journaled (if ``fit`` was added after the step) are restored as ``NaN``.
+
+		:raises ValueError: if there is no exclusion to undo, or if :py:attr:`intensityData` has been reassigned since the last exclusion
+		"""
+
+		if not getattr(self, 'excludedFlag', None):
+			raise ValueError('No exclusions to undo.')
+
+		record = self.intensityDataExcluded[-1]
+		if (not isinstance(record, ExclusionRecord)) or (record.dataVersion != self._intensityDataVersion):
+			raise ValueError('intensityData has changed since the last exclusion, which can no longer be undone.')
+
+		if record.flag == 'Samples':
+			# Position of each row in the source, used to restore the original order
+			order = numpy.argsort(numpy.concatenate((record.sampleIndex, record.rows)), kind='mergesort')
+
+			sampleMetadata = pandas.concat([self.sampleMetadata, self.sampleMetadataExcluded[-1]], ignore_index=True, sort=False)
+			self.sampleMetadata = sampleMetadata.iloc[order].reset_index(drop=True)
+			self._intensityData = numpy.concatenate((self._intensityData, numpy.asarray(record)), axis=0)[order, :]
+
+			if hasattr(self, 'fit'):
+				excludedFit = record.fit if record.fit is not None else numpy.full((len(record.rows), self.fit.shape[1]), numpy.nan)
+				self.fit = numpy.concatenate((self.fit, excludedFit), axis=0)[order, :]
+
+			message = '%i samples restored to dataset.' % (len(record.rows))
+
+		else:
+			order = numpy.argsort(numpy.concatenate((record.featureIndex, record.columns)), kind='mergesort')
+
+			featureMetadata = pandas.concat([self.featureMetadata, self.featureMetadataExcluded[-1]], ignore_index=True, sort=False)
+			self.featureMetadata = featureMetadata.iloc[order].reset_index(drop=True)
+			self._intensityData = numpy.concatenate((self._intensityData, numpy.asarray(record)), axis=1)[:, order]
+
+			if hasattr(self, 'fit'):
+				excludedFit = record.fit if record.fit is not None else numpy.full((self.fit.shape[0], len(record.columns)), numpy.nan)
+				self.fit = numpy.concatenate((self.fit, excludedFit), axis=1)[:, order]
+
+			message = '%i features restored to dataset.' % (len(record.columns))
+
+		del self.sampleMetadataExcluded[-1]
+		del self.featureMetadataExcluded[-1]
+		del self.intensityDataExcluded[-1]
+		del self.excludedFlag[-1]
+
+		# If the step continued from the previous record, that record now describes the restored data and can itself be undone.
+		# Records may be shared with clones, so the entry is replaced rather than modified
+		if self.intensityDataExcluded and isinstance(self.intensityDataExcluded[-1], ExclusionRecord) and (self.intensityDataExcluded[-1].dataVersion == record.startVersion):
+			self.intensityDataExcluded[-1] = self.intensityDataExcluded[-1].replace(dataVersion=self._intensityDataVersion)
+
+		self.Attributes['Log'].append([datetime.now(), message])
+
+		self.initialiseMasks()
+
+	@loggedOperation
+	def appendSamples(self, intensityData, sampleMetadata, featureNames=None, on='Feature Name'):
+		"""
+		Add new samples to the end of the dataset, such as a batch acquired after the dataset was loaded.
+
+		Columns of *intensityData* are matched to features by *featureNames*, compared to the *on* column of :py:attr:`featureMetadata`. Features of the dataset not measured in the new samples are given ``NaN`` intensities, and new features not in the dataset are discarded with a warning. If *featureNames* is ``None``, the columns must already be in the order of :py:attr:`featureMetadata`.
+
+		The new samples are appended to :py:attr:`sampleMask` as ``True``, and to the per-sample attributes listed in ``_hdf5Attributes`` as ``True`` or ``NaN``. The per-class moments cached for RSD calculations are updated with those of the new samples rather than recalculated from the whole matrix. As :py:attr:`_intensityData` is re-assigned, exclusions applied before the samples were added can no longer be undone.
+
+		:param numpy.ndarray intensityData: :math:`k` × :math:`m'` matrix of measurements of the new samples
+		:param pandas.DataFrame sampleMetadata: :math:`k` rows of metadata describing the new samples
+		:param featureNames: Names of the :math:`m'` columns of *intensityData*, or ``None`` to match columns to features by position
+		:type featureNames: None or list of str
+		:param str on: Column of :py:attr:`featureMetadata` *featureNames* are matched to
+		:raises ValueError: if the shapes of *intensityData*, *sampleMetadata* and *featureNames* do not agree, or *featureNames* are not unique
+		"""
+		intensityData = numpy.asarray(intensityData)
+		if (intensityData.ndim != 2) or (intensityData.shape[0] != sampleMetadata.shape[0]):
+			raise ValueError('intensityData must have a row for each row of sampleMetadata.')
+
+		if featureNames is None:
+			if intensityData.shape[1] != self.noFeatures:
+				raise ValueError('intensityData must have a column for each feature if featureNames is not provided.')
+		else:
+			featureNames = pandas.Index(featureNames)
+			if len(featureNames) != intensityData.shape[1]:
+				raise ValueError('featureNames must name each column of intensityData.')
+			if not featureNames.is_unique:
+				raise ValueError('featureNames must be unique.')
+
+			indexer = featureNames.get_indexer(self.featureMetadata[on])
+			found = indexer >= 0
+
+			noUnmatched = numpy.sum(~featureNames.isin(self.featureMetadata[on]))
+			if noUnmatched > 0:
+				warnings.warn('%i features of the new samples are not in the dataset and were discarded.' % (noUnmatched))
+
+			if numpy.all(found):
+				intensityData = intensityData[:, indexer]
+			else:
+				aligned = numpy.full((intensityData.shape[0], self.noFeatures), numpy.nan, dtype=numpy.result_type(intensityData, numpy.float64))
+				aligned[:, found] = intensityData[:, indexer[found]]
+				intensityData = aligned
+
+		noSamples = self.noSamples
+		noNewSamples = intensityData.shape[0]
+
+		# Moments still valid before the samples are added, which can be updated with those of the new samples
+		cache = self.__dict__.get('_sampleClassMomentsCache') or dict()
+		validMoments = dict()
+		if cache and self._hasSampleClasses():
+			sampleClassMasks = self.sampleClassMasks
+			for (sampleClass, (key, moments)) in cache.items():
+				if key == (self._intensityDataVersion, (sampleClassMasks[sampleClass] & self.sampleMask).tobytes()):
+					validMoments[sampleClass] = moments
+
+		storage = self.__dict__.get('_memmapStorage')
+		if storage is not None:
+			self._intensityData = storage.append(self._intensityData, intensityData)
+		else:
+			self._intensityData = numpy.concatenate((self._intensityData, intensityData), axis=0)
+
+		self.sampleMetadata = pandas.concat([self.sampleMetadata, sampleMetadata], ignore_index=True, sort=False)
+		self.sampleMask = numpy.concatenate((numpy.asarray(self.sampleMask, dtype=bool), numpy.ones(noNewSamples, dtype=bool)))
+
+		# Extend attributes holding a value per sample
+		for (name, axes) in self._hdf5Attributes.items():
+			value = getattr(self, name, None)
+			if (not axes) or (axes[0] != 'samples') or (value is None):
+				continue
+			if isinstance(value, pandas.DataFrame):
+				setattr(self, name, value.reindex(pandas.RangeIndex(noSamples + noNewSamples)))
+			elif isinstance(value, numpy.ndarray) and (value.ndim > 0) and (value.shape[0] == noSamples):
+				if value.dtype == bool:
+					padding = numpy.ones((noNewSamples,) + value.shape[1:], dtype=bool)
+				else:
+					padding = numpy.full((noNewSamples,) + value.shape[1:], numpy.nan)
+				setattr(self, name, numpy.concatenate((value, padding), axis=0))
+
+		# Update cached moments with those of the new samples
+		sampleClassMasks = self.sampleClassMasks if validMoments else None
+		updatedCache = dict()
+		for (sampleClass, moments) in validMoments.items():
+			mask = sampleClassMasks[sampleClass][noSamples:]
+			if numpy.any(mask):
+				newMoments = (int(numpy.sum(mask)),) + tuple(_moments(intensityData[mask]))
+				moments = _mergeMoments(moments, newMoments)
+			key = (self._intensityDataVersion, (sampleClassMasks[sampleClass] & self.sampleMask).tobytes())
+			updatedCache[sampleClass] = (key, moments)
+		self._sampleClassMomentsCache = updatedCache
+
+		self.Attributes['Log'].append([datetime.now(), '%i samples appended to dataset.' % (noNewSamples)])
+
+	@loggedOperation
 	def addSampleInfo(self, descriptionFormat=None, filePath=None, **kwargs):
 		"""
 		Load additional metadata and map it in to the :py:attr:`sampleMetadata` table.
@@ -1150,6 +1751,7 @@ class Dataset:
 		else:
 			raise NotImplementedError
 
+	@loggedOperation
 	def addFeatureInfo(self, filePath=None, descriptionFormat=None, featureId=None, **kwargs):
 		"""
 		Load additional metadata and map it in to the :py:attr:`featureMetadata` table.
@@ -1637,6 +2239,8 @@ class Dataset:
 		if not (assay in ['MS','NMR']):
 			raise ValueError('assay should be either \'MS\' or \'NMR\'')
 
+		import isatools.isatab as isatab
+
 		# Load ISATAB file
 		with open(os.path.join(pathToISATABFile,'i_Investigation.txt')) as fp:
 			isa_tab_record = isatab.load(fp)
@@ -1876,14 +2480,17 @@ class Dataset:
 		self.Attributes['Log'].append([datetime.now(), 'Subject information matched from ISATAB %s' % (pathToISATABFile)])
 
 
+	@loggedOperation
 	def excludeSamples(self, sampleList, on='Sample File Name', message='User Excluded'):
 		"""
 		Sets the :py:attr:`sampleMask` for the samples listed in *sampleList* to ``False`` to mask them from the dataset.
 
+		All IDs are matched in a single pass over :py:attr:`sampleMetadata`, so whole plates can be excluded at once.
+
 		:param list sampleList: A list of sample IDs to be excluded
 		:param str on: name of the column in :py:attr:`sampleMetadata` to match *sampleList* against, defaults to 'Sample File Name'
 		:param str message: append this message to the 'Exclusion Details' field for each sample excluded, defaults to 'User Excluded'
-		:return: a list of IDs passed in *sampleList* that could not be matched against the sample IDs present
+		:return: a list of IDs passed in *sampleList* that could not be matched against the sample IDs present, empty if all were matched
 		:rtype: list
 		"""
 		# Validate inputs
@@ -1892,26 +2499,12 @@ class Dataset:
 		if not isinstance(message, str):
 			raise TypeError('`message` must be a string.')
 
-		notFound = []
-
-		if 'Exclusion Details' not in self.sampleMetadata:
-			self.sampleMetadata['Exclusion Details'] = ''
+		(matched, notFound) = _matchExclusions(self.sampleMetadata, on, sampleList, message)
+		self.sampleMask[matched] = False
 
-		for sample in sampleList:
-			if sample in self.sampleMetadata[on].unique():
-				self.sampleMask[self.sampleMetadata[self.sampleMetadata[on] == sample].index] = False
-				if (self.sampleMetadata.loc[self.sampleMetadata[on] == sample, 'Exclusion Details'].values in ['', None]):
-					self.sampleMetadata.loc[self.sampleMetadata[on] == sample, 'Exclusion Details'] = message
-				else:
-					self.sampleMetadata.loc[self.sampleMetadata[on] == sample, 'Exclusion Details'] = \
-					self.sampleMetadata.loc[self.sampleMetadata[on] == sample, 'Exclusion Details'] + ' AND ' + message
-			else:
-				# AMtched must be unique.
-				notFound.append(sample)
-
-		if any(notFound):
-			return notFound
+		return notFound
 
+	@loggedOperation
 	def excludeFeatures(self, featureList, on='Feature Name', message='User Excluded'):
 		"""
 		Masks the features listed in *featureList* from the dataset.
@@ -1935,18 +2528,8 @@ class Dataset:
 			self.featureMetadata['Exclusion Details'] = ''
 
 		if self.VariableType == VariableType.Discrete:
-			for feature in featureList:
-				if feature in self.featureMetadata[on].unique():
-					self.featureMask[self.featureMetadata[self.featureMetadata[on] == feature].index] = False
-					if (self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'].values == ''):
-						self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'] = message
-					else:
-						self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'] = \
-						self.featureMetadata.loc[
-							self.featureMetadata[on] == feature, 'Exclusion Details'] + ' AND ' + message
-				else:
-					# AMtched must be unique.
-					notFound.append(feature)
+			(matched, notFound) = _matchExclusions(self.featureMetadata, on, featureList, message)
+			self.featureMask[matched] = False
 
 		elif self.VariableType == VariableType.Spectral:
 			for chunk in featureList:
@@ -1971,6 +2554,7 @@ class Dataset:
 		return notFound
 
 
+	@loggedOperation
 	def exportDataset(self, destinationPath='.', saveFormat='CSV', isaDetailsDict = {}, withExclusions=True, escapeDelimiters=False, filterMetadata=True):
 		"""
 		Export dataset object in a variety of formats for import in other software, the export is named according to the :py:attr:`name` attribute of the Dataset object.
@@ -1980,6 +2564,9 @@ class Dataset:
 		* **CSV** Basic CSV output, :py:attr:`featureMetadata`, :py:attr:`sampleMetadata` and :py:attr:`intensityData` are written to three separate CSV files in *desitinationPath*
 		* **UnifiedCSV** Exports :py:attr:`featureMetadata`, :py:attr:`sampleMetadata` and :py:attr:`intensityData` concatenated into a single CSV file
 		* **ISATAB** Exports the sampleMetadata in the `ISATAB <http://isa-tools.org>`_ format
+		* **HDF5** Exports the dataset to a single HDF5 file that can be loaded with ``fileType='hdf5'``, see :py:meth:`_exportHDF5`
+		* **Parquet** Exports :py:attr:`featureMetadata`, :py:attr:`sampleMetadata` and :py:attr:`intensityData` to three separate Parquet files, keeping column types, see :py:meth:`_exportParquet`
+		* **ParquetLong** As **Parquet**, with :py:attr:`intensityData` written as a long table of one row per measurement
 
 		:param str destinationPath: Save data into the directory specified here
 		:param str format: File format for saved data, defaults to CSV.
@@ -2031,7 +2618,7 @@ class Dataset:
 			exportDataset.applyMasks()
 
 		# do not filter metadata if safe format is ISATAB
-		if filterMetadata and (saveFormat in ['UnifiedCSV', 'CSV']):
+		if filterMetadata and (saveFormat in ['UnifiedCSV', 'CSV', 'Parquet', 'ParquetLong']):
 			# sampleMetadata not exported
 			sampleMetaColToRemove = list(set(exportDataset.sampleMetadata.columns.tolist()) & set(
 				exportDataset.Attributes['sampleMetadataNotExported']))
@@ -2049,6 +2636,12 @@ class Dataset:
 			exportDataset._exportUnifiedCSV(destinationPath, escapeDelimiters=escapeDelimiters)
 		elif saveFormat == 'ISATAB':
 			exportDataset._exportISATAB(destinationPath, isaDetailsDict)
+		elif saveFormat == 'HDF5':
+			destinationPath = os.path.join(destinationPath, exportDataset.name)
+			exportDataset._exportHDF5(destinationPath)
+		elif saveFormat in ['Parquet', 'ParquetLong']:
+			destinationPath = os.path.join(destinationPath, exportDataset.name)
+			exportDataset._exportParquet(destinationPath, longFormat=(saveFormat == 'ParquetLong'))
 		else:
 			raise ValueError('Save format \'%s\' not understood.' % saveFormat)
 
@@ -2095,9 +2688,11 @@ class Dataset:
 		featureMetadata.to_csv(destinationPath + '_featureMetadata.csv',
 							   encoding='utf-8')
 
-		# Export intensity data
-		numpy.savetxt(destinationPath + '_intensityData.csv',
-					  self.intensityData, delimiter=",")
+		# Export intensity data, formatting blocks of samples in parallel
+		intensityData = self.intensityData
+		with open(destinationPath + '_intensityData.csv', 'w', encoding='utf-8', newline='') as file:
+			_writeCSVBlocks(file, lambda start, stop: ''.join(_formatCSVRows(intensityData[start:stop])),
+							self.noSamples, self.noFeatures * intensityData.dtype.itemsize)
 
 
 	def _exportISATAB(self, destinationPath, isaDetailsDict, assay='MS'):
@@ -2142,21 +2737,78 @@ class Dataset:
 					pass
 
 		# Export combined data in single file
-		tmpXCombined = pandas.concat([featureMetadata.transpose(),
-									  pandas.DataFrame(self.intensityData)], axis=0)
+		self._writeCombinedCSV(os.path.join(destinationPath + '_combinedData.csv'), sampleMetadata, featureMetadata, self.intensityData)
+
+
+	def _writeCombinedCSV(self, path, sampleMetadata, featureMetadata, intensityData, infRep=('inf', '-inf')):
+		"""
+		Write *sampleMetadata*, *featureMetadata* and *intensityData* to *path* as a single CSV file, with a row for each column of *featureMetadata* above the samples, and the columns of *sampleMetadata* before the features.
+
+		The samples are formatted and written in blocks by :py:func:`~nPYc.utilities._internal._writeCSVBlocks`, so the combined table is never built in memory.
+
+		:param str path: Path to the file to write
+		:param pandas.DataFrame sampleMetadata: Sample metadata to write
+		:param pandas.DataFrame featureMetadata: Feature metadata to write
+		:param intensityData: Matrix of intensities to write
+		:param infRep: Strings to write for positive and negative infinite intensities
+		:type infRep: (str, str)
+		"""
+		featureMetadata = featureMetadata.transpose()
+		noFeatureRows = featureMetadata.shape[0]
+
+		# Type the sample metadata as it would be if combined with the empty rows beside the feature metadata
+		sampleMetadata = sampleMetadata.reindex(list(featureMetadata.index) + list(sampleMetadata.index))
 
 		with warnings.catch_warnings():
 			# Seems no way to avoid pandas complaining here (v0.18.1)
 			warnings.simplefilter("ignore")
-			tmpCombined = pandas.concat([sampleMetadata, tmpXCombined], axis=1)
+			header = pandas.concat([sampleMetadata.iloc[:noFeatureRows], featureMetadata], axis=1)
+
+		# Format the sample metadata once, then split it in to one line per sample
+		sampleLines = list()
+		buffer = io.StringIO()
+		writer = csv.writer(buffer, lineterminator=os.linesep)
+		for row in csv.reader(io.StringIO(sampleMetadata.iloc[noFeatureRows:].to_csv(header=False, date_format=self._timestampFormat))):
+			writer.writerow(row)
+			sampleLines.append(buffer.getvalue()[:-len(os.linesep)])
+			buffer.seek(0)
+			buffer.truncate()
 
-		# reorder rows to put metadata first
-		tmpCombined = tmpCombined.reindex(tmpXCombined.index, axis=0)
+		separator = ',' if intensityData.shape[1] else ''
 
-		# Save
-		tmpCombined.to_csv(os.path.join(destinationPath + '_combinedData.csv'),
-						   encoding='utf-8', date_format=self._timestampFormat)
+		def formatBlock(start, stop):
+			lines = _formatCSVRows(intensityData[start:stop], naRep='', infRep=infRep, lineTerminator=None)
+			return ''.join([sampleLines[start + i] + separator + line + os.linesep for (i, line) in enumerate(lines)])
 
+		with open(path, 'w', encoding='utf-8', newline='') as file:
+			file.write(header.to_csv(date_format=self._timestampFormat))
+			_writeCSVBlocks(file, formatBlock, intensityData.shape[0], intensityData.shape[1] * intensityData.dtype.itemsize)
+
+
+	def _featureIndex(self, by, spectral=False):
+		"""
+		Index of the values in :py:attr:`featureMetadata`\ **[by]**, cached until :py:attr:`featureMetadata` is assigned.
+
+		:param str by: Column of :py:attr:`featureMetadata` to index
+		:param bool spectral: If ``False`` return a dictionary of the position of the first feature holding each value, otherwise return the order sorting the column and the sorted values, to look up ranges with :py:func:`numpy.searchsorted`
+		"""
+		key = (by, spectral, self.featureMetadata.shape[0])
+
+		cache = self.__dict__.get('_featureIndexCache')
+		if (cache is not None) and (cache[0] == key):
+			return cache[1]
+
+		values = self.featureMetadata[by].values
+		if spectral:
+			order = numpy.argsort(values, kind='stable')
+			index = (order, values[order])
+		else:
+			# Reversed, so the first feature holding a value is kept
+			index = dict(zip(values[::-1], range(len(values) - 1, -1, -1)))
+
+		self._featureIndexCache = (key, index)
+
+		return index
 
 	def getFeatures(self, featureIDs, by=None, useMasks=True):
 		"""
@@ -2165,12 +2817,15 @@ class Dataset:
 		If :py:attr:`VariableType` is :py:attr:`~nPYc.enumerations.VariableType.Discrete`, :py:meth:`getFeature` expects either a single or list of values, and matching features are returned.
 		If :py:attr:`VariableType` is :py:attr:`~nPYc.enumerations.VariableType.Spectral`, pass either a single, or list of (min, max) tuples, the features returned will be a slice of the combined ranges. If the ranges passed overlap, the union will be returned.
 
+		Features are looked up in an index of :py:attr:`featureMetadata`\ **[by]** (a dictionary for discrete features, the sorted values for spectral ranges), built on first use and rebuilt only once :py:attr:`featureMetadata` is assigned, so re-assign the table after modifying feature IDs in-place. Discrete feature IDs not found raise :py:exc:`KeyError`, rather than the :py:exc:`IndexError` raised before the index was introduced.
+
 		:param featureIDs: A single or list of feature IDs to return
 		:type featureID: Same dtype as the :py:attr:`featureMetadata`\ **[by]** column
 		:param by: Column in :py:attr:`featureMetadata` to search in, ``None`` use the column defined in :py:attr:`Attributes`\ ['Feature Names']
 		:type by: None or str
 		:returns: (featureMetadata, intensityData)
 		:rtype: (pandas.Dataframe, numpy.ndarray)
+		:raises KeyError: if *by* is not a column of :py:attr:`featureMetadata`, or a discrete feature ID is not found
 		"""
 		if not isinstance(featureIDs, list):
 			featureIDs = [featureIDs]
@@ -2181,10 +2836,12 @@ class Dataset:
 		if by not in self.featureMetadata.keys():
 			raise KeyError('"by": %s is not a key in featureMetadata' % (by))
 
-		indexes = list()
 		if self.VariableType == VariableType.Discrete:
-			for feature in featureIDs:
-				indexes.append(self.featureMetadata.loc[self.featureMetadata[by] == feature].index[0])
+			index = self._featureIndex(by)
+			try:
+				indexes = [index[feature] for feature in featureIDs]
+			except KeyError as err:
+				raise KeyError('%s is not a value of featureMetadata[\'%s\']' % (err.args[0], by))
 
 			if useMasks:
 				indexes = [x for x in indexes if self.featureMask[x]]
@@ -2193,13 +2850,16 @@ class Dataset:
 			return self.featureMetadata.iloc[indexes], self.intensityData[:, indexes]
 
 		elif self.VariableType == VariableType.Spectral:
+			(order, sortedValues) = self._featureIndex(by, spectral=True)
+
 			rangeMask = numpy.zeros_like(self.featureMask)
 			for featureRange in featureIDs:
 				if featureRange[0] > featureRange[1]:
 					featureRange = tuple(reversed(featureRange))
 
-				rangeMask[numpy.logical_and(self.featureMetadata[by].values >= featureRange[0],
-											self.featureMetadata[by].values <= featureRange[1])] = True
+				start = numpy.searchsorted(sortedValues, featureRange[0], side='left')
+				stop = numpy.searchsorted(sortedValues, featureRange[1], side='right')
+				rangeMask[order[start:stop]] = True
 
 			if useMasks:
 				rangeMask &= self.featureMask
@@ -2208,9 +2868,103 @@ class Dataset:
 		else:
 			raise TypeError('Dataset.VariableType type not understood!')
 
+	def save(self, path):
+		"""
+		Save a snapshot of the dataset to the directory *path*, to be reloaded with :py:meth:`load`.
+
+		The snapshot holds :py:attr:`intensityData` as a .npy file, :py:attr:`sampleMetadata`, :py:attr:`featureMetadata`, :py:attr:`sampleMask`, :py:attr:`featureMask` and :py:attr:`Attributes`, including the Log, along with the size and SHA-256 checksum of each file. Where :py:attr:`Normalisation` is one of the normalisers of :py:mod:`nPYc.utilities.normalisation`, the raw :py:attr:`_intensityData` is saved with the normaliser and its coefficients, otherwise the normalised :py:attr:`intensityData` is saved. Exclusions are not applied, and excluded data is not saved. No file is pickled.
+
+		:param str path: Directory to save the snapshot to, created if it does not exist
+		"""
+		from ._snapshot import saveDataset
+
+		saveDataset(self, path)
+
+	@classmethod
+	@profiled
+	def load(cls, path, mmap=True, verify=False):
+		"""
+		Load a snapshot written by :py:meth:`save`, as an object of the class that saved it.
+
+		With *mmap* the intensity matrix is memory-mapped copy-on-write rather than read, so loading takes the same time regardless of its size, and the snapshot is never modified. The size of each file is checked against that recorded when saving. Verifying the checksums as well reads every file once, so is only done when *verify* is ``True``.
+
+		:param str path: Directory the snapshot was saved to
+		:param bool mmap: If ``True`` memory-map :py:attr:`intensityData` from the snapshot
+		:param bool verify: If ``True`` check the files against the checksums recorded when saving
+		:return: The dataset saved
+		:rtype: Dataset
+		:raises ValueError: if *path* is not a snapshot, or the size or checksum of a file does not match
+		:raises TypeError: if the snapshot does not hold an instance of the class :py:meth:`load` is called on
+		"""
+		from ._snapshot import loadDataset
+
+		return loadDataset(cls, path, mmap=mmap, verify=verify)
+
 	def _exportHDF5(self, destinationPath):
+		"""
+		Export the dataset to the HDF5 file *destinationPath*.h5, holding :py:attr:`intensityData` (chunked and compressed), :py:attr:`sampleMetadata`, :py:attr:`featureMetadata`, :py:attr:`sampleMask`, :py:attr:`featureMask` and :py:attr:`Attributes`, including the Log.
 
-		raise NotImplementedError
+		Where :py:attr:`Normalisation` is one of the normalisers of :py:mod:`nPYc.utilities.normalisation`, the raw :py:attr:`_intensityData` is saved with the normaliser and its coefficients, and both are restored on loading. Otherwise the normalised :py:attr:`intensityData` is saved. Exclusions are not saved. Requires h5py.
+
+		:param str destinationPath: Path to the file to write, without the .h5 extension
+		:raises ImportError: if h5py is not installed
+		"""
+		from ._hdf5 import writeDataset
+
+		writeDataset(self, destinationPath + '.h5')
+
+	def _initialiseFromHDF5(self, path, sampleSlice=None, featureSlice=None, **kwargs):
+		"""
+		Initialise the object from a file written by :py:meth:`_exportHDF5`.
+
+		Only the samples and features selected by *sampleSlice* and *featureSlice* are read from the file, one run of consecutive samples at a time, so a selection scattered over many runs of samples takes one read of the file for each.
+
+		:param str path: Path to the HDF5 file
+		:param sampleSlice: Samples to load, as a slice, a boolean mask or indices, if ``None`` load all samples
+		:param featureSlice: Features to load, as a slice, a boolean mask or indices, if ``None`` load all features
+		:raises ImportError: if h5py is not installed
+		:raises ValueError: if *path* is not a nPYc HDF5 file
+		"""
+		from ._hdf5 import readDataset
+
+		readDataset(self, path, sampleSlice=sampleSlice, featureSlice=featureSlice)
+
+	def _exportParquet(self, destinationPath, longFormat=False):
+		"""
+		Export the dataset to the directory *destinationPath* as a set of three Parquet files:
+			*destinationPath*_intensityData.parquet
+			*destinationPath*_sampleMetadata.parquet
+			*destinationPath*_featureMetadata.parquet
+
+		Column types are kept, including the :py:class:`~nPYc.enumerations.SampleType` and :py:class:`~nPYc.enumerations.AssayRole` enumerations, which are stored as categories of member names. In the wide layout :py:attr:`intensityData` has a column per feature, named by its row in :py:attr:`featureMetadata`. In the long layout it has the columns *Sample*, *Feature* and *Intensity*, with a row per measurement. Requires pyarrow.
+
+		:param str destinationPath: Path to a directory in which the output will be saved
+		:param bool longFormat: If ``True`` write :py:attr:`intensityData` as a long table
+		:raises ImportError: if pyarrow is not installed
+		"""
+		from ._parquet import writeTable, writeIntensityData
+
+		writeTable(self.sampleMetadata, destinationPath + '_sampleMetadata.parquet')
+		writeTable(self.featureMetadata, destinationPath + '_featureMetadata.parquet')
+		writeIntensityData(self.intensityData, destinationPath + '_intensityData.parquet', longFormat=longFormat)
+
+	def _initialiseFromParquet(self, sampleMetadataPath):
+		"""
+		Initialise the object from the three Parquet outputs of :py:meth:`_exportParquet`, in either layout.
+
+		:param str sampleMetadataPath: Path to the *Name_sampleMetadata.parquet* table, the file names of the featureMetadata and intensityData tables are infered from the provided filename.
+		:raises ImportError: if pyarrow is not installed
+		"""
+		from ._parquet import readTable, readIntensityData
+
+		(folderPath, fileName) = os.path.split(sampleMetadataPath)
+		objectName = re.match('(.*?)_sampleMetadata.parquet', fileName).groups()[0]
+
+		intensityData = readIntensityData(os.path.join(folderPath, objectName + '_intensityData.parquet'))
+		featureMetadata = readTable(os.path.join(folderPath, objectName + '_featureMetadata.parquet'))
+		sampleMetadata = readTable(sampleMetadataPath)
+
+		return (objectName, intensityData, featureMetadata, sampleMetadata)
 
 
 def main():
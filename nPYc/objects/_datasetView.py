@@ -0,0 +1,203 @@
+import copy
+import numpy
+import pandas
+
+
+# Attributes sliced along both axes, or only along the features, when present on the dataset viewed
+_sampleFeatureAttributes = ('fit', 'expectedConcentration')
+_featureAttributes = ('_scale',)
+_viewedAttributes = {'_intensityData', 'sampleMetadata', 'featureMetadata'} | set(_sampleFeatureAttributes) | set(_featureAttributes)
+
+# View classes generated for each dataset class
+_viewClasses = dict()
+
+
+def _sliceAttribute(value, sampleIndex, featureIndex):
+	"""
+	Select *sampleIndex* rows and *featureIndex* columns of a matrix or table, or *featureIndex* elements if *sampleIndex* is ``None``.
+	"""
+	if isinstance(value, pandas.DataFrame):
+		if sampleIndex is None:
+			return value.iloc[featureIndex].reset_index(drop=True)
+		return value.iloc[sampleIndex, featureIndex].reset_index(drop=True)
+	elif isinstance(value, numpy.ndarray):
+		if sampleIndex is None:
+			return value[featureIndex]
+		return value[numpy.ix_(sampleIndex, featureIndex)]
+	else:
+		return value
+
+
+class DatasetView:
+	"""
+	Read-only view of a subset of the samples and features of a :py:class:`~nPYc.objects.Dataset`, created with :py:meth:`~nPYc.objects.Dataset.view`.
+
+	A view is an instance of a subclass of the class of the dataset it was created from, so the properties and methods of the dataset that do not modify it (such as :py:attr:`~nPYc.objects.MSDataset.rsdSP`) act on the samples and features selected. The view holds the indices of the samples and features selected and references to the dataset's raw data matrix and metadata tables as they were when the view was created; nothing is copied until it is used:
+
+	* :py:attr:`~nPYc.objects.Dataset.intensityData` selects the rows and columns of the raw matrix on first access, normalised by a copy of the dataset's :py:attr:`~nPYc.objects.Dataset.Normalisation` as if :py:meth:`~nPYc.objects.Dataset.applyMasks` had been called, and returns a read-only matrix
+	* :py:attr:`~nPYc.objects.Dataset.sampleMetadata` and :py:attr:`~nPYc.objects.Dataset.featureMetadata` are selected on first access
+	* Other attributes are shared with the dataset, except :py:attr:`~nPYc.objects.Dataset.Attributes` which is copied
+
+	Assigning to public attributes of a view raises :py:exc:`AttributeError`. A deep copy of a view is a regular dataset, independent of the dataset viewed.
+	"""
+
+	def __setattr__(self, name, value):
+		# Private attributes hold values cached by the view
+		if not name.startswith('_'):
+			raise AttributeError('%s is read-only, \'%s\' cannot be set.' % (self.__class__.__name__, name))
+
+		object.__setattr__(self, name, value)
+
+
+	def __delattr__(self, name):
+		if not name.startswith('_'):
+			raise AttributeError('%s is read-only, \'%s\' cannot be deleted.' % (self.__class__.__name__, name))
+
+		object.__delattr__(self, name)
+
+
+	def __getattr__(self, name):
+		# Only called for attributes not set on the view, select those that depend on the samples and features viewed
+		sources = self.__dict__.get('_viewSources')
+		if (sources is None) or (name not in sources) or (name == '_intensityData'):
+			raise AttributeError('\'%s\' object has no attribute \'%s\'' % (self.__class__.__name__, name))
+
+		if name == 'sampleMetadata':
+			value = sources[name].iloc[self._sampleIndex].reset_index(drop=True)
+		elif name == 'featureMetadata':
+			value = sources[name].iloc[self._featureIndex].reset_index(drop=True)
+		elif name in _sampleFeatureAttributes:
+			value = _sliceAttribute(sources[name], self._sampleIndex, self._featureIndex)
+		else:
+			value = _sliceAttribute(sources[name], None, self._featureIndex)
+
+		self.__dict__[name] = value
+
+		return value
+
+
+	@property
+	def _intensityData(self):
+		"""
+		Read-only selection of the rows and columns viewed from the dataset's raw data matrix.
+		"""
+		X = self.__dict__.get('_viewIntensityData')
+
+		if X is None:
+			source = self._viewSources['_intensityData']
+			if (len(self._sampleIndex) == source.shape[0]) and (len(self._featureIndex) == source.shape[1]):
+				X = source.view()
+			else:
+				X = source[numpy.ix_(self._sampleIndex, self._featureIndex)]
+			X.flags.writeable = False
+
+			self.__dict__['_viewIntensityData'] = X
+
+		return X
+
+
+	@property
+	def sampleMask(self):
+		return numpy.ones(len(self._sampleIndex), dtype=bool)
+
+
+	@property
+	def featureMask(self):
+		return numpy.ones(len(self._featureIndex), dtype=bool)
+
+
+	def __deepcopy__(self, memo):
+		cls = self._dataset.__class__
+		result = cls.__new__(cls)
+		memo[id(self)] = result
+
+		for name in ('sampleMetadata', 'featureMetadata') + _sampleFeatureAttributes + _featureAttributes:
+			if hasattr(self, name):
+				getattr(self, name)
+
+		for key, value in self.__dict__.items():
+			if key in ('_dataset', '_viewSources', '_sampleIndex', '_featureIndex', '_viewIntensityData', '_intensityDataCache'):
+				continue
+			elif isinstance(value, pandas.DataFrame):
+				result.__dict__[key] = value.copy()
+			else:
+				result.__dict__[key] = copy.deepcopy(value, memo)
+
+		result._intensityData = numpy.array(self._intensityData)
+		result.initialiseMasks()
+
+		return result
+
+
+	def clone(self):
+		"""
+		Return a regular dataset holding the samples and features viewed, independent of the dataset viewed.
+		"""
+		return copy.deepcopy(self)
+
+
+	def __repr__(self):
+		return "<%s of %s, named %s, with %d samples, %d features>" % (
+		self.__class__.__name__, self._dataset.__class__.__name__, self.name, self.noSamples, self.noFeatures)
+
+
+def datasetView(dataset, sampleMask=None, featureMask=None):
+	"""
+	Build a :py:class:`DatasetView` of the samples and features selected by *sampleMask* and *featureMask* in *dataset*.
+
+	:param Dataset dataset: Dataset to view
+	:param sampleMask: Boolean mask of samples to view, if ``None`` use :py:attr:`~nPYc.objects.Dataset.sampleMask`
+	:param featureMask: Boolean mask of features to view, if ``None`` use :py:attr:`~nPYc.objects.Dataset.featureMask`
+	:return: View of *dataset*
+	:rtype: DatasetView
+	:raises ValueError: if the masks do not match the dimensions of *dataset*
+	"""
+	# Imported here as _dataset imports this module
+	from ._dataset import _intensityDataVersions
+
+	if sampleMask is None:
+		sampleMask = dataset.sampleMask
+	if featureMask is None:
+		featureMask = dataset.featureMask
+
+	sampleMask = numpy.asarray(sampleMask, dtype=bool)
+	featureMask = numpy.asarray(featureMask, dtype=bool)
+
+	if sampleMask.shape != (dataset.noSamples,):
+		raise ValueError('sampleMask must be a boolean vector of length %i.' % (dataset.noSamples))
+	if featureMask.shape != (dataset.noFeatures,):
+		raise ValueError('featureMask must be a boolean vector of length %i.' % (dataset.noFeatures))
+
+	# A view of a view selects from the original dataset
+	if isinstance(dataset, DatasetView):
+		sampleIndex = dataset._sampleIndex[sampleMask]
+		featureIndex = dataset._featureIndex[featureMask]
+		sources = dataset._viewSources
+		dataset = dataset._dataset
+	else:
+		sampleIndex = numpy.flatnonzero(sampleMask)
+		featureIndex = numpy.flatnonzero(featureMask)
+		sources = {key: value for (key, value) in dataset.__dict__.items() if key in _viewedAttributes}
+
+	cls = dataset.__class__
+	if cls not in _viewClasses:
+		_viewClasses[cls] = type(cls.__name__ + 'View', (DatasetView, cls), {'__module__': cls.__module__})
+
+	view = object.__new__(_viewClasses[cls])
+
+	# Share everything but what depends on the samples and features selected
+	for key, value in dataset.__dict__.items():
+		if key not in _viewedAttributes | {'_intensityDataCache', 'sampleMask', 'featureMask'}:
+			view.__dict__[key] = value
+
+	view.__dict__['Attributes'] = copy.deepcopy(dataset.Attributes)
+	view._Normalisation = copy.deepcopy(dataset.Normalisation)
+	view._dataset = dataset
+	view._viewSources = sources
+	view._sampleIndex = sampleIndex
+	view._featureIndex = featureIndex
+	view._intensityDataVersion = next(_intensityDataVersions)
+	view._intensityDataCache = None
+	view._resetCaches()
+
+	return view
@@ -0,0 +1,127 @@
+import numpy
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+
+def _materialise(value):
+	"""
+	Replace any :py:class:`ExclusionRecord` in *value* (or in a list or tuple of values) by the block of data it records.
+	"""
+	if isinstance(value, ExclusionRecord):
+		return numpy.asarray(value)
+	elif isinstance(value, (list, tuple)):
+		return type(value)(_materialise(item) for item in value)
+	else:
+		return value
+
+
+class ExclusionRecord(NDArrayOperatorsMixin):
+	"""
+	Entry of the exclusion journal kept by :py:meth:`~nPYc.objects.Dataset.applyMasks` in :py:attr:`~nPYc.objects.Dataset.intensityDataExcluded`.
+
+	Rather than a copy of the intensity data removed by one exclusion step, the record holds a reference to the *source* matrix the data was cut from and the row and column indices of the excluded block in that matrix. Successive exclusion steps share the same source as long as :py:attr:`~nPYc.objects.Dataset.intensityData` is not reassigned in between, so the excluded blocks are only reconstructed when the record is used as an array.
+
+	The record also keeps the rows and columns of the source retained in the dataset after the step, and the block of any ``fit`` matrix excluded alongside the data, which allows the step to be reverted with :py:meth:`~nPYc.objects.Dataset.undoExclusion`.
+
+	Records are shared by clones of a dataset, so are never modified once created, use :py:meth:`replace` to derive an updated record.
+
+	:param numpy.ndarray source: Matrix the block was excluded from
+	:param str flag: ``'Samples'`` or ``'Features'``, the dimension excluded
+	:param numpy.ndarray rows: Rows of *source* in the excluded block
+	:param numpy.ndarray columns: Columns of *source* in the excluded block
+	:param numpy.ndarray sampleIndex: Rows of *source* retained in the dataset after the step
+	:param numpy.ndarray featureIndex: Columns of *source* retained in the dataset after the step
+	:param int startVersion: Version of the intensity data the step was applied to
+	:param int dataVersion: Version of the intensity data produced by the step
+	:param fit: Rows or columns of the ``fit`` matrix excluded by the step, or ``None`` if the dataset had no fit
+	:type fit: None or numpy.ndarray
+	"""
+
+	def __init__(self, source, flag, rows, columns, sampleIndex, featureIndex, startVersion, dataVersion, fit=None):
+
+		self.source = source
+		self.flag = flag
+		self.rows = rows
+		self.columns = columns
+		self.sampleIndex = sampleIndex
+		self.featureIndex = featureIndex
+		self.startVersion = startVersion
+		self.dataVersion = dataVersion
+		self.fit = fit
+
+
+	def replace(self, **changes):
+		"""
+		Return a new record with the attributes named in *changes* replaced, sharing all others with this record.
+		"""
+		attributes = {name: getattr(self, name) for name in ('source', 'flag', 'rows', 'columns', 'sampleIndex', 'featureIndex', 'startVersion', 'dataVersion', 'fit')}
+		attributes.update(changes)
+
+		return self.__class__(**attributes)
+
+
+	@property
+	def shape(self):
+		return (len(self.rows), len(self.columns))
+
+
+	@property
+	def ndim(self):
+		return 2
+
+
+	@property
+	def size(self):
+		return len(self.rows) * len(self.columns)
+
+
+	@property
+	def dtype(self):
+		return self.source.dtype
+
+
+	@property
+	def T(self):
+		return numpy.asarray(self).T
+
+
+	def __len__(self):
+		return len(self.rows)
+
+
+	def __getitem__(self, key):
+		return numpy.asarray(self)[key]
+
+
+	def __array__(self, dtype=None):
+
+		X = self.source[numpy.ix_(self.rows, self.columns)]
+
+		if dtype is not None:
+			X = X.astype(dtype, copy=False)
+
+		return X
+
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+
+		if any(isinstance(item, ExclusionRecord) for item in kwargs.get('out', ())):
+			return NotImplemented
+
+		return getattr(ufunc, method)(*_materialise(inputs), **kwargs)
+
+
+	def __array_function__(self, func, types, args, kwargs):
+
+		return func(*_materialise(args), **{key: _materialise(value) for key, value in kwargs.items()})
+
+
+	def __getattr__(self, name):
+		# Fall back to the ndarray API on the reconstructed block
+		if name.startswith('__') or name in ('source', 'rows', 'columns', 'fit'):
+			raise AttributeError(name)
+
+		return getattr(numpy.asarray(self), name)
+
+
+	def __repr__(self):
+		return '%s(%s, %r)' % (self.__class__.__name__, self.flag, numpy.asarray(self))
@@ -0,0 +1,499 @@
+"""
+Reading and writing of datasets to HDF5 files, used by :py:meth:`~nPYc.objects.Dataset.exportDataset` and the ``fileType='hdf5'`` loaders.
+
+File layout:
+
+* ``intensityData`` chunked and compressed :math:`n` × :math:`m` matrix, prior to normalisation where the :py:attr:`~nPYc.objects.Dataset.Normalisation` can be saved
+* ``normalisation`` group holding the coefficients and any other arrays of the :py:attr:`~nPYc.objects.Dataset.Normalisation`, described by the ``Normalisation`` JSON attribute of the root group
+* ``sampleMask`` and ``featureMask`` boolean vectors
+* ``sampleMetadata`` and ``featureMetadata`` groups, with one member per column
+* Any additional attributes listed in the ``_hdf5Attributes`` of the dataset class, as groups or arrays
+* ``Attributes`` (including the Log, with the operation described by each entry), ``name``, ``VariableType`` and ``AnalyticalPlatform`` as JSON attributes of the root group
+
+h5py is only imported when a file is read or written.
+"""
+import enum
+import json
+from datetime import datetime
+import numpy
+import pandas
+from .. import enumerations
+from ._processingLog import encodeLog, decodeLog
+
+
+# Format version written to files, checked on read
+_formatVersion = 1
+
+# Shape of the chunks the intensity matrix is stored in, clipped to the size of the matrix
+_chunkShape = (64, 4096)
+
+# Axes ('samples' or 'features') of the arrays held by normalisers, so they can be sliced with the dataset
+_normaliserAxes = {'_normalisationcoefficients': ('samples',), '_reference': ('features',)}
+
+# Normaliser state that only identifies the data the coefficients were last calculated for, and is not saved
+_normaliserSessionState = ('_data_version', '_data_hash')
+
+
+def _importH5py():
+	try:
+		import h5py
+	except ImportError:
+		raise ImportError('h5py is required to read and write HDF5 files, install it with \'pip install h5py\'.')
+
+	return h5py
+
+
+def _encodeAttributes(attributes):
+	"""
+	Return *attributes* with the Log encoded by :py:func:`~nPYc.objects._processingLog.encodeLog`, so the fields of its entries are saved.
+	"""
+	if 'Log' not in attributes:
+		return attributes
+
+	return {**attributes, 'Log': encodeLog(attributes['Log'])}
+
+
+def _jsonDefault(value):
+	"""
+	Encode values the json module does not handle.
+	"""
+	if isinstance(value, datetime):
+		return value.isoformat()
+	elif isinstance(value, enum.Enum):
+		return str(value)
+	elif isinstance(value, numpy.ndarray):
+		return value.tolist()
+	elif isinstance(value, numpy.generic):
+		return value.item()
+	elif isinstance(value, (set, frozenset)):
+		return list(value)
+	else:
+		return str(value)
+
+
+def _enumClass(values):
+	"""
+	Return the enumeration in :py:mod:`nPYc.enumerations` all non-null *values* are members of, or ``None``.
+	"""
+	enumClass = None
+	for value in values:
+		if value is None or (isinstance(value, float) and numpy.isnan(value)):
+			continue
+		if not isinstance(value, enum.Enum) or (getattr(enumerations, value.__class__.__name__, None) is not value.__class__):
+			return None
+		if enumClass is None:
+			enumClass = value.__class__
+		elif enumClass is not value.__class__:
+			return None
+
+	return enumClass
+
+
+def encodeColumn(column):
+	"""
+	Encode a :py:class:`pandas.Series` as a numpy vector that can be stored without pickling, and a dictionary describing how to decode it.
+
+	* Numeric and boolean columns are stored as they are
+	* Datetime columns, or object columns of datetimes, are stored as nanoseconds since the epoch, with ``-1`` where missing
+	* Columns of members of an :py:mod:`nPYc.enumerations` enumeration are stored as member names, with ``''`` where missing
+	* Other columns are stored as the JSON representation of each value
+
+	:param pandas.Series column: Column to encode
+	:return: Tuple of (values, description)
+	:rtype: (numpy.ndarray, dict)
+	"""
+	if isinstance(column.dtype, pandas.CategoricalDtype):
+		column = column.astype(object)
+
+	if pandas.api.types.is_bool_dtype(column.dtype) or (pandas.api.types.is_numeric_dtype(column.dtype) and not pandas.api.types.is_extension_array_dtype(column.dtype)):
+		return (column.values, {'kind': 'values'})
+
+	if pandas.api.types.is_datetime64_any_dtype(column.dtype):
+		values = column.values.astype('datetime64[ns]').astype(numpy.int64)
+		values[column.isnull().values] = -1
+		return (values, {'kind': 'datetime'})
+
+	values = column.values
+	notNull = [value for value in values if not (value is None or (isinstance(value, float) and numpy.isnan(value)) or value is pandas.NaT)]
+
+	if notNull and all(isinstance(value, datetime) for value in notNull):
+		converted = pandas.to_datetime(pandas.Series(values, dtype=object))
+		return (encodeColumn(converted)[0], {'kind': 'datetime', 'pydatetime': True})
+
+	enumClass = _enumClass(values)
+	if notNull and (enumClass is not None):
+		names = numpy.array(['' if value is None or not isinstance(value, enum.Enum) else value.name for value in values], dtype=object)
+		return (names, {'kind': 'enum', 'enum': enumClass.__name__})
+
+	encoded = numpy.array([json.dumps(value, default=_jsonDefault) for value in values], dtype=object)
+
+	return (encoded, {'kind': 'json'})
+
+
+def decodeColumn(values, description):
+	"""
+	Reverse :py:func:`encodeColumn`.
+
+	:param numpy.ndarray values: Encoded values
+	:param dict description: Description returned by :py:func:`encodeColumn`
+	:return: Decoded values
+	:rtype: numpy.ndarray
+	"""
+	kind = description['kind']
+
+	if kind == 'values':
+		return values
+
+	elif kind == 'datetime':
+		values = numpy.asarray(values, dtype=numpy.int64)
+		decoded = values.astype('datetime64[ns]')
+		decoded[values == -1] = numpy.datetime64('NaT')
+		if description.get('pydatetime', False):
+			return numpy.array([None if pandas.isnull(value) else value for value in pandas.Series(decoded).dt.to_pydatetime()], dtype=object)
+		return decoded
+
+	elif kind == 'enum':
+		enumClass = getattr(enumerations, description['enum'])
+		return numpy.array([enumClass[_asStr(value)] if _asStr(value) else None for value in values], dtype=object)
+
+	elif kind == 'json':
+		return numpy.array([json.loads(_asStr(value)) for value in values], dtype=object)
+
+	else:
+		raise ValueError('Unknown column encoding \'%s\'.' % (kind))
+
+
+def _asStr(value):
+	return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _writeTable(h5py, group, table):
+	"""
+	Write the columns of *table* as members of *group*.
+	"""
+	group.attrs['kind'] = 'table'
+	group.attrs['columns'] = json.dumps(list(table.columns), default=_jsonDefault)
+	group.attrs['length'] = table.shape[0]
+
+	for (i, column) in enumerate(table.columns):
+		(values, description) = encodeColumn(table.iloc[:, i])
+		if values.dtype == object:
+			values = values.astype(h5py.string_dtype())
+		member = group.create_dataset(str(i), data=values)
+		member.attrs['description'] = json.dumps(description)
+
+
+def _readTable(group, rows=slice(None)):
+	"""
+	Read the *rows* of a table written by :py:func:`_writeTable`.
+	"""
+	columns = json.loads(group.attrs['columns'])
+	table = dict()
+	for (i, column) in enumerate(columns):
+		member = group[str(i)]
+		table[i] = pandas.Series(decodeColumn(_readRows(member, rows), json.loads(member.attrs['description'])))
+
+	table = pandas.DataFrame(table, index=pandas.RangeIndex(_selectionLength(rows, group.attrs['length'])))
+	table.columns = columns
+
+	return table
+
+
+def _runs(indices):
+	"""
+	Split sorted unique *indices* into runs of consecutive values.
+
+	:return: List of the (position in *indices*, first index, last index + 1) of each run
+	:rtype: list
+	"""
+	if len(indices) == 0:
+		return []
+
+	breaks = numpy.flatnonzero(numpy.diff(indices) != 1) + 1
+	starts = numpy.concatenate(([0], breaks))
+	stops = numpy.concatenate((breaks, [len(indices)]))
+
+	return [(start, indices[start], indices[stop - 1] + 1) for (start, stop) in zip(starts, stops)]
+
+
+def _readRows(member, rows):
+	"""
+	Read the *rows* (a slice or sorted indices) of a dataset, one run of consecutive rows at a time, so only the rows selected are read.
+	"""
+	if isinstance(rows, slice):
+		return member[rows]
+
+	values = numpy.empty((len(rows),) + member.shape[1:], dtype=member.dtype)
+	for (position, start, stop) in _runs(rows):
+		values[position:position + stop - start] = member[start:stop]
+
+	return values
+
+
+def _readBlock(member, rows, columns):
+	"""
+	Read the *rows* (sorted indices) and *columns* (a slice or sorted indices) of a matrix, so only the values selected are read.
+
+	Each run of consecutive rows is read in one call, selecting the *columns* with h5py fancy indexing where they are not consecutive.
+	"""
+	if isinstance(columns, slice):
+		noColumns = _selectionLength(columns, member.shape[1])
+	else:
+		noColumns = len(columns)
+		columnRuns = _runs(columns)
+		if len(columnRuns) == 1:
+			columns = slice(columnRuns[0][1], columnRuns[0][2])
+
+	block = numpy.empty((len(rows), noColumns), dtype=member.dtype)
+	if noColumns == 0:
+		return block
+
+	for (position, start, stop) in _runs(rows):
+		block[position:position + stop - start] = member[start:stop, columns]
+
+	return block
+
+
+def _selectionLength(selection, length):
+	if isinstance(selection, slice):
+		return len(range(*selection.indices(length)))
+	return len(selection)
+
+
+def writeValue(h5py, group, name, value):
+	"""
+	Write *value* to member *name* of *group*: DataFrames as tables, numeric arrays as datasets, dicts and lists as groups, and anything else as JSON.
+	"""
+	if isinstance(value, pandas.DataFrame):
+		_writeTable(h5py, group.create_group(name), value)
+	elif isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+		member = group.create_dataset(name, data=value)
+		member.attrs['kind'] = 'array'
+	elif isinstance(value, dict):
+		member = group.create_group(name)
+		member.attrs['kind'] = 'dict'
+		member.attrs['keys'] = json.dumps(list(value.keys()), default=_jsonDefault)
+		for (i, item) in enumerate(value.values()):
+			writeValue(h5py, member, str(i), item)
+	elif isinstance(value, (list, tuple)) and any(isinstance(item, (pandas.DataFrame, numpy.ndarray, dict)) for item in value):
+		member = group.create_group(name)
+		member.attrs['kind'] = 'list'
+		member.attrs['length'] = len(value)
+		for (i, item) in enumerate(value):
+			writeValue(h5py, member, str(i), item)
+	else:
+		group.attrs[name] = json.dumps(value, default=_jsonDefault)
+
+
+def readValue(group, name):
+	"""
+	Read member or attribute *name* of *group* as written by :py:func:`writeValue`.
+	"""
+	if name not in group:
+		return json.loads(group.attrs[name])
+
+	member = group[name]
+	kind = member.attrs.get('kind')
+
+	if kind == 'table':
+		return _readTable(member)
+	elif kind == 'array':
+		return member[()]
+	elif kind == 'dict':
+		keys = json.loads(member.attrs['keys'])
+		return {key: readValue(member, str(i)) for (i, key) in enumerate(keys)}
+	elif kind == 'list':
+		return [readValue(member, str(i)) for i in range(member.attrs['length'])]
+	else:
+		raise ValueError('Unknown member kind \'%s\'.' % (kind))
+
+
+def encodeNormaliser(dataset):
+	"""
+	Describe the :py:attr:`~nPYc.objects.Dataset.Normalisation` of *dataset*, so it can be saved with the raw :py:attr:`~nPYc.objects.Dataset._intensityData` and restored by :py:func:`decodeNormaliser`.
+
+	Only the normalisers of :py:mod:`nPYc.utilities.normalisation` can be saved.
+
+	:return: Tuple of a JSON serialisable description and a dictionary of the arrays held by the normaliser, or ``(None, None)`` if the normaliser cannot be saved
+	:rtype: (dict, dict)
+	"""
+	from ..utilities import normalisation
+
+	normaliser = dataset.Normalisation
+	className = normaliser.__class__.__name__
+	if getattr(normalisation, className, None) is not normaliser.__class__:
+		return (None, None)
+
+	# Calculate coefficients for the current data, if they are not already
+	dataset.intensityData
+
+	state = dict()
+	arrays = dict()
+	for (name, value) in normaliser.__dict__.items():
+		if name in _normaliserSessionState:
+			continue
+		elif isinstance(value, numpy.ndarray):
+			arrays[name] = value
+		else:
+			state[name] = value
+
+	return ({'class': className, 'state': state, 'arrays': sorted(arrays.keys())}, arrays)
+
+
+def decodeNormaliser(dataset, description, arrays, rows=slice(None), columns=slice(None)):
+	"""
+	Set the :py:attr:`~nPYc.objects.Dataset.Normalisation` of *dataset* to the normaliser saved by :py:func:`encodeNormaliser`, with its arrays sliced to the *rows* and *columns* loaded.
+
+	Saved coefficients are reused for the data loaded, rather than recalculated from it, so normalised values match those saved even where only some samples or features are loaded.
+	"""
+	from ..utilities import normalisation
+
+	normaliserClass = getattr(normalisation, description['class'])
+	normaliser = normaliserClass()
+	normaliser.__dict__.update(description['state'])
+	for (name, value) in arrays.items():
+		normaliser.__dict__[name] = _sliceValue(value, _normaliserAxes.get(name, ()), rows, columns)
+
+	if normaliser.normalisation_coefficients is not None:
+		normaliser._data_version = dataset._intensityDataVersion
+
+	dataset.Normalisation = normaliser
+
+
+def _parseSelection(selection, length, name):
+	"""
+	Return *selection* (``None``, a slice, a boolean mask or indices) as a slice or sorted unique indices.
+	"""
+	if selection is None:
+		return slice(None)
+	elif isinstance(selection, slice):
+		return slice(*selection.indices(length))
+
+	selection = numpy.asarray(selection)
+	if selection.dtype == bool:
+		if selection.shape != (length,):
+			raise ValueError('%s must be a boolean vector of length %i.' % (name, length))
+		return numpy.flatnonzero(selection)
+	elif numpy.issubdtype(selection.dtype, numpy.integer):
+		selection = numpy.unique(numpy.where(selection < 0, selection + length, selection))
+		if len(selection) and ((selection[0] < 0) or (selection[-1] >= length)):
+			raise IndexError('%s out of range for %i elements.' % (name, length))
+		return selection
+	else:
+		raise TypeError('%s must be None, a slice, a boolean mask or integer indices.' % (name))
+
+
+def writeDataset(dataset, path):
+	"""
+	Write *dataset* to the HDF5 file *path*, see :py:meth:`~nPYc.objects.Dataset._exportHDF5`.
+	"""
+	h5py = _importH5py()
+
+	(normalisation, normalisationArrays) = encodeNormaliser(dataset)
+	X = dataset._intensityData if normalisation is not None else dataset.intensityData
+	(noSamples, noFeatures) = dataset._intensityData.shape
+
+	with h5py.File(path, 'w') as h5File:
+		h5File.attrs['nPYc HDF5 format'] = _formatVersion
+		h5File.attrs['class'] = dataset.__class__.__name__
+		h5File.attrs['name'] = json.dumps(dataset.name)
+		h5File.attrs['Attributes'] = json.dumps(_encodeAttributes(dataset.Attributes), default=_jsonDefault)
+		if normalisation is not None:
+			h5File.attrs['Normalisation'] = json.dumps(normalisation, default=_jsonDefault)
+			member = h5File.create_group('normalisation')
+			for (name, value) in normalisationArrays.items():
+				member.create_dataset(name, data=value)
+		for name in ('VariableType', 'AnalyticalPlatform'):
+			value = getattr(dataset, name, None)
+			h5File.attrs[name] = value.name if isinstance(value, enum.Enum) else ''
+
+		if noSamples and noFeatures:
+			chunks = (min(_chunkShape[0], noSamples), min(_chunkShape[1], noFeatures))
+			member = h5File.create_dataset('intensityData', shape=(noSamples, noFeatures), dtype=X.dtype,
+										   chunks=chunks, compression='gzip', shuffle=True)
+			# Write one row of chunks at a time, so memmapped or lazily normalised data is never loaded whole
+			for start in range(0, noSamples, chunks[0]):
+				member[start:start + chunks[0]] = numpy.asarray(X[start:start + chunks[0]])
+		else:
+			h5File.create_dataset('intensityData', data=numpy.zeros((noSamples, noFeatures)))
+
+		h5File.create_dataset('sampleMask', data=numpy.asarray(dataset.sampleMask, dtype=bool))
+		h5File.create_dataset('featureMask', data=numpy.asarray(dataset.featureMask, dtype=bool))
+
+		_writeTable(h5py, h5File.create_group('sampleMetadata'), dataset.sampleMetadata)
+		_writeTable(h5py, h5File.create_group('featureMetadata'), dataset.featureMetadata)
+
+		extra = h5File.create_group('attributes')
+		for name in dataset._hdf5Attributes:
+			if hasattr(dataset, name):
+				writeValue(h5py, extra, name, getattr(dataset, name))
+
+
+def readDataset(dataset, path, sampleSlice=None, featureSlice=None):
+	"""
+	Initialise *dataset* from the HDF5 file *path*, see :py:meth:`~nPYc.objects.Dataset._initialiseFromHDF5`.
+	"""
+	h5py = _importH5py()
+
+	with h5py.File(path, 'r') as h5File:
+		if h5File.attrs.get('nPYc HDF5 format', None) != _formatVersion:
+			raise ValueError('\'%s\' is not a nPYc HDF5 file.' % (path))
+
+		member = h5File['intensityData']
+		(noSamples, noFeatures) = member.shape
+		rows = _parseSelection(sampleSlice, noSamples, 'sampleSlice')
+		columns = _parseSelection(featureSlice, noFeatures, 'featureSlice')
+
+		X = dataset._allocateIntensityData((_selectionLength(rows, noSamples), _selectionLength(columns, noFeatures)))
+		step = member.chunks[0] if member.chunks else max(1, X.shape[0])
+		rowIndices = numpy.arange(noSamples)[rows]
+		for start in range(0, len(rowIndices), step):
+			X[start:start + step] = _readBlock(member, rowIndices[start:start + step], columns)
+
+		dataset._intensityData = X
+		if 'Normalisation' in h5File.attrs:
+			arrays = {name: member[()] for (name, member) in h5File['normalisation'].items()}
+			decodeNormaliser(dataset, json.loads(h5File.attrs['Normalisation']), arrays, rows, columns)
+		dataset.sampleMask = _readRows(h5File['sampleMask'], rows)
+		dataset.featureMask = _readRows(h5File['featureMask'], columns)
+		dataset.sampleMetadata = _readTable(h5File['sampleMetadata'], rows)
+		dataset.featureMetadata = _readTable(h5File['featureMetadata'], columns)
+
+		for name in dataset._hdf5Attributes:
+			if (name in h5File['attributes']) or (name in h5File['attributes'].attrs):
+				value = readValue(h5File['attributes'], name)
+				setattr(dataset, name, _sliceValue(value, dataset._hdf5Attributes[name], rows, columns))
+
+		attributes = json.loads(h5File.attrs['Attributes'])
+		if 'Log' in attributes:
+			attributes['Log'] = decodeLog(attributes['Log'])
+
+		name = json.loads(h5File.attrs['name'])
+		variableType = _asStr(h5File.attrs['VariableType'])
+		analyticalPlatform = _asStr(h5File.attrs['AnalyticalPlatform'])
+
+	dataset.Attributes = {**dataset.Attributes, **attributes}
+	dataset.name = name
+	if variableType:
+		dataset.VariableType = enumerations.VariableType[variableType]
+	if analyticalPlatform:
+		dataset.AnalyticalPlatform = enumerations.AnalyticalPlatform[analyticalPlatform]
+
+	dataset.Attributes['Log'].append([datetime.now(), 'Loaded from HDF5 file %s, with %i samples and %i features.' % (path, dataset.noSamples, dataset.noFeatures)])
+
+
+def _sliceValue(value, axes, rows, columns):
+	"""
+	Select the samples and features loaded along the *axes* (``'samples'``, ``'features'`` or ``None`` per dimension) of *value*.
+	"""
+	for (dimension, axis) in enumerate(axes):
+		if axis is None:
+			continue
+		selection = rows if axis == 'samples' else columns
+		if isinstance(value, pandas.DataFrame):
+			value = value.iloc[selection] if dimension == 0 else value.iloc[:, selection]
+			value = value.reset_index(drop=True) if dimension == 0 else value
+		elif isinstance(value, numpy.ndarray):
+			value = value[(slice(None),) * dimension + (selection,)]
+
+	return value
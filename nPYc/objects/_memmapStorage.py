@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import weakref
+import numpy
+
+
+# Size of the blocks of rows copied at once when writing to a memmap
+_blockBytes = 2 ** 26
+
+
+def _blockRows(shape, dtype):
+	"""
+	Number of rows of a matrix of *shape* and *dtype* that fit in one block.
+	"""
+	rowBytes = max(1, int(numpy.prod(shape[1:])) * numpy.dtype(dtype).itemsize)
+
+	return max(1, _blockBytes // rowBytes)
+
+
+def _removeFile(path):
+	"""
+	Remove the memmap file *path*, if it still exists.
+	"""
+	try:
+		os.remove(path)
+	except OSError:
+		pass
+
+
+class MemmapStorage:
+	"""
+	Directory of :py:class:`numpy.memmap` files backing the :py:attr:`~nPYc.objects.Dataset._intensityData` of a dataset, enabled with :py:meth:`~nPYc.objects.Dataset.useMemmap`.
+
+	Each matrix assigned to the dataset is written to a new file in the directory, in blocks of rows, so the data held in memory is bounded by the pages of the files in use. Each file is removed once no array (including views of it, and the exclusion records of :py:meth:`~nPYc.objects.Dataset.applyMasks`) refers to it. Where *directory* is ``None`` a temporary directory is created, and removed with the storage. Copies of a dataset share its storage.
+
+	:param directory: Directory to write the memmap files to, if ``None`` use a temporary directory
+	:type directory: None or str
+	"""
+
+	def __init__(self, directory=None):
+
+		if directory is None:
+			self.directory = tempfile.mkdtemp(prefix='nPYc-')
+			self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+		else:
+			os.makedirs(directory, exist_ok=True)
+			self.directory = os.path.abspath(directory)
+			self._finalizer = None
+
+
+	@property
+	def isTemporary(self):
+		return self._finalizer is not None
+
+
+	def __deepcopy__(self, memo):
+		return self
+
+
+	def __reduce__(self):
+		return (self.__class__, (None if self.isTemporary else self.directory,))
+
+
+	def owns(self, X):
+		"""
+		``True`` if *X* is a memmap (or a view of one) written to this storage.
+		"""
+		return isinstance(X, numpy.memmap) and (X.filename is not None) and (os.path.dirname(X.filename) == self.directory)
+
+
+	def allocate(self, shape, dtype=float):
+		"""
+		Return a new zero-filled memmap of *shape* and *dtype*, backed by a file that is removed when the memmap and all views of it are released.
+
+		Empty matrices cannot be memory-mapped and are returned as regular arrays.
+		"""
+		if 0 in shape:
+			return numpy.zeros(shape, dtype=dtype)
+
+		(fd, path) = tempfile.mkstemp(suffix='.dat', prefix='intensityData-', dir=self.directory)
+		os.close(fd)
+
+		X = numpy.memmap(path, dtype=dtype, mode='w+', shape=tuple(shape))
+		# Views of X hold a reference to it, so the file outlives every array reading from it
+		weakref.finalize(X, _removeFile, path)
+
+		return X
+
+
+	def store(self, X):
+		"""
+		Write *X* to a new memmap, unless it is already held in this storage.
+
+		Values that are not numeric matrices (such as the placeholder of an empty dataset) are returned as they are.
+		"""
+		if (not isinstance(X, numpy.ndarray)) or (X.ndim != 2) or X.dtype.hasobject or self.owns(X):
+			return X
+
+		out = self.allocate(X.shape, X.dtype)
+		step = _blockRows(X.shape, X.dtype)
+		for start in range(0, X.shape[0], step):
+			out[start:start + step] = X[start:start + step]
+
+		return out
+
+
+	def take(self, X, rows, columns):
+		"""
+		Write the *rows* and *columns* of *X* to a new memmap, one block of rows at a time.
+
+		:param numpy.ndarray X: Matrix to select from
+		:param numpy.ndarray rows: Indices of the rows to select
+		:param numpy.ndarray columns: Indices of the columns to select
+		:return: Selection from *X*
+		:rtype: numpy.memmap
+		"""
+		if X.dtype.hasobject:
+			return X[numpy.ix_(rows, columns)]
+
+		out = self.allocate((len(rows), len(columns)), X.dtype)
+		step = _blockRows(out.shape, X.dtype)
+		for start in range(0, len(rows), step):
+			out[start:start + step] = X[numpy.ix_(rows[start:start + step], columns)]
+
+		return out
+
+
+	def append(self, X, rows):
+		"""
+		Write *X* followed by *rows* to a new memmap, one block of rows at a time.
+
+		:param numpy.ndarray X: Matrix to extend
+		:param numpy.ndarray rows: Rows to add, with as many columns as *X*
+		:return: The combined matrix
+		:rtype: numpy.memmap
+		"""
+		if X.dtype.hasobject:
+			return numpy.concatenate((X, rows), axis=0)
+
+		out = self.allocate((X.shape[0] + rows.shape[0], X.shape[1]), numpy.result_type(X, rows))
+		step = _blockRows(X.shape, X.dtype)
+		for start in range(0, X.shape[0], step):
+			out[start:start + step] = X[start:start + step]
+		out[X.shape[0]:] = rows
+
+		return out
+
+
+	def __repr__(self):
+		return '%s(%r)' % (self.__class__.__name__, self.directory)
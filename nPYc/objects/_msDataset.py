@@ -12,10 +12,10 @@ import numbers
 from datetime import datetime
 import logging
 import copy
-import networkx
 from .._toolboxPath import toolboxPath
-from ._dataset import Dataset
-from ..utilities import rsd
+from ._dataset import Dataset, _matchExclusions
+from ._processingLog import loggedOperation
+from ..profiling import profiled
 from ..utilities._internal import _vcorrcoef
 from ..utilities._getMetadataFromWatersRaw import getSampleMetadataFromWatersRawFiles
 from ..enumerations import VariableType, DatasetLevel, AssayRole, SampleType
@@ -25,6 +25,71 @@ from ..utilities.normalisation._normaliserABC import Normaliser
 from ..utilities.normalisation._nullNormaliser import NullNormaliser
 
 
+# Maximum number of candidate feature pairs compared at once by _matchOverlappingPeaks
+_peakPairBlockSize = 2 ** 22
+
+
+def _matchOverlappingPeaks(mz, retentionTime, peakWidth, deltaMZ, deltaOverlap):
+	"""
+	Find the pairs of features within *deltaMZ* of each other, whose peaks overlap (half the sum of their peak widths is at least the difference in their retention times) by at least *deltaOverlap* percent.
+
+	Features are sorted by m/z, and each is only compared to those following it within *deltaMZ*, so the time taken grows with the number of features and of pairs within *deltaMZ*, rather than quadratically. Candidate pairs are compared in vectorised blocks of at most :py:data:`_peakPairBlockSize`, with the same arithmetic as comparing each feature to all others.
+
+	:param numpy.ndarray mz: m/z of each feature
+	:param numpy.ndarray retentionTime: Retention time of each feature
+	:param numpy.ndarray peakWidth: Peak width of each feature
+	:param float deltaMZ: Maximum m/z distance between features [ <= ]
+	:param float deltaOverlap: Minimum peak overlap between features (0-100%)
+	:return: Positions of the two features of each pair matched, each pair listed once, in no particular order
+	:rtype: (numpy.ndarray, numpy.ndarray)
+	"""
+	(mz, retentionTime, peakWidth) = [values if numpy.issubdtype(values.dtype, numpy.number) else values.astype(float)
+									  for values in (numpy.asarray(mz), numpy.asarray(retentionTime), numpy.asarray(peakWidth))]
+
+	# Features without an m/z never match
+	order = numpy.flatnonzero(~numpy.isnan(mz))
+	order = order[numpy.argsort(mz[order], kind='stable')]
+	sortedMz = mz[order]
+	noFeatures = len(order)
+
+	# Widen the window by a few ulp, so no pair within deltaMZ is missed to rounding, extra candidates are rejected below
+	bound = sortedMz + deltaMZ
+	bound = bound + numpy.abs(bound) * 4 * numpy.finfo(float).eps
+	counts = numpy.maximum(numpy.searchsorted(sortedMz, bound, side='right') - numpy.arange(noFeatures) - 1, 0)
+	cumulative = numpy.cumsum(counts)
+
+	first = list()
+	second = list()
+	start = 0
+	while start < noFeatures:
+		before = cumulative[start] - counts[start]
+		stop = max(start + 1, int(numpy.searchsorted(cumulative, before + _peakPairBlockSize, side='right')))
+
+		# Every feature in [start, stop) paired with those following it in its window
+		blockCounts = counts[start:stop]
+		positions = numpy.repeat(numpy.arange(start, stop), blockCounts)
+		offsets = numpy.arange(len(positions)) - numpy.repeat(cumulative[start:stop] - blockCounts - before, blockCounts)
+		left = order[positions]
+		right = order[positions + 1 + offsets]
+
+		with numpy.errstate(invalid='ignore', divide='ignore'):
+			difference = numpy.abs(retentionTime[left] - retentionTime[right])
+			halfWidth = (peakWidth[left] + peakWidth[right]) / 2
+			match = (difference <= halfWidth) & (numpy.abs(mz[left] - mz[right]) <= deltaMZ)
+			overlap = ((halfWidth - difference) / halfWidth) * 100
+			match &= overlap >= deltaOverlap
+
+		first.append(left[match])
+		second.append(right[match])
+
+		start = stop
+
+	if not first:
+		return (numpy.array([], dtype=numpy.intp), numpy.array([], dtype=numpy.intp))
+
+	return (numpy.concatenate(first), numpy.concatenate(second))
+
+
 class MSDataset(Dataset):
 	"""
 	MSDataset(datapath, fileType='QI', sop='GenericMS', **kwargs)
@@ -41,9 +106,18 @@ class MSDataset(Dataset):
 
 	* Biocrates
 		Operates on spreadsheets exported from Biocrates MetIDQ. By default loads data from the sheet named 'Data Export', this may be overridden with the ``sheetName=`` argument, If the number of sample metadata columns differes from the default, this can be overridden with the ``noSampleParams=`` argument.
+
+	* HDF5
+		Loads a dataset saved with ``exportDataset(saveFormat='HDF5')``. Only a subset of the samples or features may be read with the ``sampleSlice=`` and ``featureSlice=`` arguments, see :py:meth:`~Dataset._initialiseFromHDF5`.
+
+	* Parquet
+		Loads a dataset saved with ``exportDataset(saveFormat='Parquet')`` or ``exportDataset(saveFormat='ParquetLong')`` with ``fileType='parquet export'``, *datapath* should be the path to the *Name_sampleMetadata.parquet* file.
 	"""
 
-	def __init__(self, datapath, fileType='xcms', sop='GenericMS', **kwargs):
+	_hdf5Attributes = {'corrExclusions': ('samples',), 'fit': ('samples', 'features')}
+
+	@profiled
+	def __init__(self, datapath, fileType='xcms', sop='GenericMS', sampleSlice=None, featureSlice=None, **kwargs):
 		"""
 		Basic initialisation.
 		"""
@@ -105,22 +179,29 @@ class MSDataset(Dataset):
 			if 'Retention Time' in self.featureMetadata.columns:
 				self.featureMetadata['Retention Time'] = self.featureMetadata['Retention Time'].apply(pandas.to_numeric, errors='ignore')
 			self.VariableType = VariableType.Discrete
+		elif fileType == 'parquet export':
+			(self.name, self.intensityData, self.featureMetadata, self.sampleMetadata) = self._initialiseFromParquet(datapath)
+			self.VariableType = VariableType.Discrete
+		elif fileType == 'hdf5':
+			# Filter columns and masks are loaded with the rest of the dataset
+			self._initialiseFromHDF5(datapath, sampleSlice=sampleSlice, featureSlice=featureSlice)
 		elif fileType == 'empty':
 			# Lets us build an empty object for testing &c
 			pass
 		else:
 			raise NotImplementedError
 
-		self.featureMetadata['Exclusion Details'] = None
-		self.featureMetadata['User Excluded'] = False
-		self.featureMetadata[['rsdFilter', 'varianceRatioFilter', 'correlationToDilutionFilter', 'blankFilter',
-							  'artifactualFilter']] = pandas.DataFrame([[True, True, True, True, True]],
-																	   index=self.featureMetadata.index)
+		if fileType != 'hdf5':
+			self.featureMetadata['Exclusion Details'] = None
+			self.featureMetadata['User Excluded'] = False
+			self.featureMetadata[['rsdFilter', 'varianceRatioFilter', 'correlationToDilutionFilter', 'blankFilter',
+								  'artifactualFilter']] = pandas.DataFrame([[True, True, True, True, True]],
+																		   index=self.featureMetadata.index)
 
-		self.featureMetadata[['rsdSP', 'rsdSS/rsdSP', 'correlationToDilution', 'blankValue']] \
-			= pandas.DataFrame([[numpy.nan, numpy.nan, numpy.nan, numpy.nan]], index=self.featureMetadata.index)
+			self.featureMetadata[['rsdSP', 'rsdSS/rsdSP', 'correlationToDilution', 'blankValue']] \
+				= pandas.DataFrame([[numpy.nan, numpy.nan, numpy.nan, numpy.nan]], index=self.featureMetadata.index)
 
-		self.initialiseMasks()
+			self.initialiseMasks()
 
 		self.Attributes['Log'].append([datetime.now(), '%s instance inited, with %d samples, %d features, from \%s\'' % (self.__class__.__name__, self.noSamples, self.noFeatures, datapath)])
 
@@ -155,8 +236,7 @@ class MSDataset(Dataset):
 			self.corrExclusions = copy.deepcopy(self.sampleMask)
 			self.__corrExclusions = copy.deepcopy(self.corrExclusions)
 
-		lrMask = numpy.logical_and(self.sampleMetadata['SampleType'] == SampleType.StudyPool,
-								   self.sampleMetadata['AssayRole'] == AssayRole.LinearityReference)
+		lrMask = self.sampleClassMasks['LR']
 
 		if sum(lrMask) == 0:
 			self._correlationToDilution = numpy.ones(shape=self.featureMask.shape)
@@ -200,24 +280,34 @@ class MSDataset(Dataset):
 		self._tempArtifactualLinkageMatrix = pandas.DataFrame(None)
 
 
+	def _resetCaches(self):
+		"""
+		Discard any values cached from :py:attr:`~Dataset.intensityData`, :py:attr:`~Dataset.sampleMetadata` or :py:attr:`~Dataset.featureMetadata`, including feature correlations and linkage.
+		"""
+		super()._resetCaches()
+
+		self._correlationToDilution = numpy.array(None)
+		self._artifactualLinkageMatrix = pandas.DataFrame(None)
+		self._tempArtifactualLinkageMatrix = pandas.DataFrame(None)
+
+
 	@property
 	def rsdSP(self):
 		"""
 		Returns percentage :term:`relative standard deviations<RSD>` for each feature in the dataset, calculated on samples with the Assay Role :py:attr:`~nPYc.enumerations.AssayRole.PrecisionReference` and Sample Type :py:attr:`~nPYc.enumerations.SampleType.StudyPool` in :py:attr:`~Dataset.sampleMetadata`.
 
+		RSDs are cached until :py:attr:`~Dataset.intensityData`, :py:attr:`~Dataset.sampleMask` or the sample types change.
+
 		:return: Vector of feature RSDs
 		:rtype: numpy.ndarray
 		"""
 		# Check we have Study Reference samples defined
 		if not ('AssayRole' in self.sampleMetadata.keys() or 'SampleType' in self.sampleMetadata.keys()):
 			raise ValueError('Assay Roles and Sample Types must be defined to calculate RSDs.')
-		if not sum(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) > 1:
+		if not numpy.sum(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) > 1:
 			raise ValueError('More than one precision reference is required to calculate RSDs.')
 
-		mask = numpy.logical_and(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference,
-								 self.sampleMetadata['SampleType'].values == SampleType.StudyPool)
-
-		return rsd(self._intensityData[mask & self.sampleMask])
+		return self._sampleClassRSD('SP')
 
 
 	@property
@@ -225,21 +315,22 @@ class MSDataset(Dataset):
 		"""
 		Returns percentage :term:`relative standard deviations<RSD>` for each feature in the dataset, calculated on samples with the Assay Role :py:attr:`~nPYc.enumerations.AssayRole.Assay` and Sample Type :py:attr:`~nPYc.enumerations.SampleType.StudySample` in :py:attr:`~Dataset.sampleMetadata`.
 
+		RSDs are cached until :py:attr:`~Dataset.intensityData`, :py:attr:`~Dataset.sampleMask` or the sample types change.
+
 		:return: Vector of feature RSDs
 		:rtype: numpy.ndarray
 		"""
 		# Check we have Study Reference samples defined
 		if not ('AssayRole' in self.sampleMetadata.keys() or 'SampleType' in self.sampleMetadata.keys()):
 			raise ValueError('Assay Roles and Sample Types must be defined to calculate RSDs.')
-		if not sum(self.sampleMetadata['AssayRole'].values == AssayRole.Assay) > 1:
+		if not numpy.sum(self.sampleMetadata['AssayRole'].values == AssayRole.Assay) > 1:
 			raise ValueError('More than one assay sample is required to calculate RSDs.')
 
-		mask = numpy.logical_and(self.sampleMetadata['AssayRole'].values == AssayRole.Assay,
-								 self.sampleMetadata['SampleType'].values == SampleType.StudySample)
-
-		return rsd(self._intensityData[mask & self.sampleMask])
+		return self._sampleClassRSD('SS')
     
 
+	@profiled
+	@loggedOperation
 	def applyMasks(self):
 		"""
 		Permanently delete elements masked (those set to ``False``) in :py:attr:`~Dataset.sampleMask` and :py:attr:`~Dataset.featureMask`, from :py:attr:`~Dataset.featureMetadata`, :py:attr:`~Dataset.sampleMetadata`, and :py:attr:`~Dataset.intensityData`.
@@ -248,10 +339,6 @@ class MSDataset(Dataset):
 		"""
 		changeFeature = sum(self.featureMask==False) != 0					# True if featuresMask has a feature set to False
 
-		if changeFeature:
-			if hasattr(self, 'fit'):
-				self.fit = self.fit[:, self.featureMask]
-
 		# if a change is made to the features, the whole artifactualLinkageMatrix must be updated (feature IDs change), else only correlation calculation
 		super().applyMasks()																			# applyMasks
 		if self.Attributes['featureFilters']['artifactualFilter'] == True:
@@ -264,6 +351,77 @@ class MSDataset(Dataset):
 		del self.correlationToDilution
 
 
+	@loggedOperation
+	def undoExclusion(self):
+		"""
+		Revert the last exclusion step journaled by :py:meth:`applyMasks`, see :py:meth:`~Dataset.undoExclusion`.
+
+		Resets feature linkage matrix and feature correlations.
+		"""
+		changeFeature = bool(getattr(self, 'excludedFlag', None)) and (self.excludedFlag[-1] == 'Features')
+
+		super().undoExclusion()
+
+		if self.Attributes['featureFilters']['artifactualFilter'] == True:
+			if not self._artifactualLinkageMatrix.empty:
+				if changeFeature:
+					self._artifactualLinkageMatrix = self.__generateArtifactualLinkageMatrix()
+				else:
+					self._artifactualLinkageMatrix = self.__generateArtifactualLinkageMatrix(corrOnly=True)
+		# Reset correlations
+		del self.correlationToDilution
+
+
+	@loggedOperation
+	def appendSamples(self, intensityData, sampleMetadata, featureNames=None, on='Feature Name'):
+		"""
+		Add new samples to the end of the dataset, see :py:meth:`~Dataset.appendSamples`.
+
+		Feature correlations to dilution are kept if none of the new samples are serial dilutions, and otherwise reset. Where linkage between features has been calculated, only the correlations between linked features are recalculated.
+		"""
+		noSamples = self.noSamples
+		corrExclusions = self.__dict__.get('_MSDataset__corrExclusions')
+
+		super().appendSamples(intensityData, sampleMetadata, featureNames=featureNames, on=on)
+
+		# Without sample classes the new samples may be serial dilutions
+		if (not self._hasSampleClasses()) or numpy.any(self.sampleClassMasks['LR'][noSamples:]):
+			del self.correlationToDilution
+		elif isinstance(corrExclusions, numpy.ndarray) and (corrExclusions.shape == (noSamples,)):
+			# New samples are never in the dilution series, so the correlations cached still apply
+			self.__corrExclusions = numpy.concatenate((corrExclusions, numpy.ones(self.noSamples - noSamples, dtype=bool)))
+
+		if self.Attributes['featureFilters']['artifactualFilter'] == True:
+			if not self._artifactualLinkageMatrix.empty:
+				self._artifactualLinkageMatrix = self.__generateArtifactualLinkageMatrix(corrOnly=True)
+
+
+	def appendBatch(self, datapath, fileType=None, **kwargs):
+		"""
+		Load the samples in *datapath* and add them to the end of the dataset with :py:meth:`appendSamples`, matching features on 'Feature Name'.
+
+		Intended for datasets extended as acquisition proceeds, so each batch is parsed once, rather than re-loading the whole dataset after every batch.
+
+		:param str datapath: Path to the feature extraction output of the new samples
+		:param fileType: Type of the file, as for :py:class:`MSDataset`, if ``None`` the type the dataset was loaded from
+		:type fileType: None or str
+		:param \**kwargs: Passed to :py:class:`MSDataset` when loading *datapath*
+		:raises ValueError: if *fileType* is ``None`` and the type the dataset was loaded from is not known
+		"""
+		if fileType is None:
+			fileTypes = {'Progenesis QI': 'QI', 'XCMS': 'XCMS', 'Biocrates': 'Biocrates', 'Metaboscape': 'Metaboscape'}
+			software = self.Attributes.get('FeatureExtractionSoftware', None)
+			if software not in fileTypes:
+				raise ValueError('The type of file the dataset was loaded from is not known, fileType must be provided.')
+			fileType = fileTypes[software]
+
+		batch = MSDataset(datapath, fileType=fileType, **kwargs)
+
+		self.appendSamples(batch._intensityData, batch.sampleMetadata, featureNames=batch.featureMetadata['Feature Name'])
+
+
+	@profiled
+	@loggedOperation
 	def updateMasks(self, filterSamples=True, filterFeatures=True, 
 					sampleTypes=list(SampleType), assayRoles=list(AssayRole),
 					featureFilters={'rsdFilter':True, 'correlationToDilutionFilter':True, 'varianceRatioFilter':True, 'artifactualFilter': False,
@@ -398,12 +556,7 @@ class MSDataset(Dataset):
 
 			if featureFilters['varianceRatioFilter'] is True:
 
-				mask = numpy.logical_and(self.sampleMetadata['AssayRole'].values == AssayRole.Assay,
-										 self.sampleMetadata['SampleType'].values == SampleType.StudySample)
-
-				mask = numpy.logical_and(mask, self.sampleMask)
-
-				rsdSS = rsd(self._intensityData[mask, :])
+				rsdSS = self._sampleClassRSD('SS')
 
 				self.featureMetadata['varianceRatioFilter'] = ((self.rsdSP * varianceRatio) <= rsdSS)
 				self.featureMetadata['rsdSS/rsdSP'] = rsdSS/self.rsdSP
@@ -484,6 +637,7 @@ class MSDataset(Dataset):
 		self.initialiseMasks()
         
         
+	@loggedOperation
 	def addSampleInfo(self, descriptionFormat=None, filePath=None, filenameSpec=None, **kwargs):
 		"""
 		Load additional metadata and map it in to the :py:attr:`~Dataset.sampleMetadata` table.
@@ -1168,24 +1322,19 @@ class MSDataset(Dataset):
 				output:
 					pandas.DataFrame listing matched features based on deltaMZ and deltaOverlap
 			"""
-			def get_match(i,ds,deltaMZ):
-				"""Find identical features for a given variable
-					output:
-						pandas.DataFrames listing the matching features based overlap of peakwidth
-				"""
-				match = (abs(ds.loc[i,'Retention Time']-ds.loc[:,'Retention Time']) <= (ds.loc[i,'Peak Width']+ds.loc[:,'Peak Width'])/2) & (abs(ds.loc[i,'m/z']-ds.loc[:,'m/z']) <= deltaMZ)	 # find match
-				return( pandas.DataFrame(data = {'node1': ds.index[i], 'node2': ds.index[match], 'Peak Overlap': ((((ds.loc[i,'Peak Width']+ds.loc[match,'Peak Width'])/2)-abs(ds.loc[i,'Retention Time']-ds.loc[match,'Retention Time']))/((ds.loc[i,'Peak Width']+ds.loc[match,'Peak Width'])/2))*100 } ) )  # return the matching rows
-
-			# get feature overlap
+			# get feature overlap, comparing each feature only to those within deltaMZ
 			ds	  = featureMetadata[['Feature Name','Retention Time','m/z','Peak Width']]
-			# By concatenating all the matches once, save ~22% compared to do it at each loop round
-			matches = [ get_match(i,ds,deltaMZ) for i in range(ds.shape[0]) ] # get a list of matches
-			res	 = pandas.concat(matches)
-			res	 = res.loc[ res.node1 < res.node2 ]	  # keeps feat1-feat2, removes feat1-feat1 and feat2-feat1
+			(first, second) = _matchOverlappingPeaks(ds['m/z'].values, ds['Retention Time'].values, ds['Peak Width'].values, deltaMZ, deltaOverlap)
+
+			# keeps feat1-feat2, removes feat1-feat1 and feat2-feat1, in order of feat1 then feat2 in the table
+			labels = ds.index.values
+			swap   = labels[second] < labels[first]
+			(first, second) = (numpy.where(swap, second, first), numpy.where(swap, first, second))
+			keep   = labels[first] < labels[second]
+			(first, second) = (first[keep], second[keep])
+			order  = numpy.lexsort((second, first))
 
-			#filter interactions by overlap
-			res	 = res.loc[ res.loc[:,'Peak Overlap']>=deltaOverlap, ['node1','node2'] ]
-			res.reset_index( drop=True, inplace=True )
+			res	 = pandas.DataFrame({'node1': labels[first[order]], 'node2': labels[second[order]]})
 
 			return( res )
 		# end find_similar_peakwidth
@@ -1200,8 +1349,10 @@ class MSDataset(Dataset):
 					overlapping features filtered
 			"""
 			link_corr = numpy.zeros([overlappingFeatures.shape[0]])
+			node1 = overlappingFeatures['node1'].values
+			node2 = overlappingFeatures['node2'].values
 			for jrow in range(0,len(link_corr)):
-				link_corr[jrow] = numpy.corrcoef( intensityData[:,overlappingFeatures.loc[jrow,'node1']], intensityData[:,overlappingFeatures.loc[jrow,'node2']])[0,1]
+				link_corr[jrow] = numpy.corrcoef( intensityData[:,node1[jrow]], intensityData[:,node2[jrow]])[0,1]
 
 			return( overlappingFeatures.loc[ link_corr>=corrCutoff, ] )
 		# end remove_min_corr_overlap
@@ -1259,6 +1410,7 @@ class MSDataset(Dataset):
 		meanIntensity = self._intensityData.mean(axis=0)
 
 		# make graphs
+		import networkx
 		g = networkx.from_pandas_edgelist(df=tmpLinkage, source='node1', target='node2') #, edge_attr=True)
 		graphs = list((g.subgraph(c).copy() for c in networkx.connected_components(g)))  # a list of clusters
 
@@ -1277,6 +1429,7 @@ class MSDataset(Dataset):
 	def getFuctionNo(self, spectrum):
 		pass
 
+	@loggedOperation
 	def excludeFeatures(self, featureList, on='Feature Name', message='User Excluded'):
 		"""
 		Masks the features listed in *featureList* from the dataset.
@@ -1300,19 +1453,10 @@ class MSDataset(Dataset):
 			self.featureMetadata['Exclusion Details'] = ''
 
 		if self.VariableType == VariableType.Discrete:
-			for feature in featureList:
-				if feature in self.featureMetadata[on].unique():
-					self.featureMask[self.featureMetadata[self.featureMetadata[on] == feature].index] = False
-					self.featureMetadata.loc[self.featureMetadata[on] == feature, 'User Excluded'] = True
-					if (self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'].values == ''):
-						self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'] = message
-					else:
-						self.featureMetadata.loc[self.featureMetadata[on] == feature, 'Exclusion Details'] = \
-						self.featureMetadata.loc[
-							self.featureMetadata[on] == feature, 'Exclusion Details'] + ' AND ' + message
-				else:
-					# AMtched must be unique.
-					notFound.append(feature)
+			(matched, notFound) = _matchExclusions(self.featureMetadata, on, featureList, message)
+			self.featureMask[matched] = False
+			if numpy.any(matched):
+				self.featureMetadata.loc[matched, 'User Excluded'] = True
 
 		elif self.VariableType == VariableType.Spectral:
 			for chunk in featureList:
@@ -2133,7 +2277,7 @@ class MSDataset(Dataset):
 
 			## List additional attributes (print + log)
 			expectedSet = set({'Attributes', 'VariableType', '_Normalisation', '_name', 'fileName', 'filePath',
-							   '_intensityData', 'sampleMetadata', 'featureMetadata', 'sampleMask',  'featureMask',
+							   '_intensityData', '_intensityDataVersion', '_intensityDataCache', '_sampleClassMasksCache', '_sampleClassMomentsCache', '_sampleClassRSDCache', '_qcStatisticsCache', '_featureIndexCache', '_memmapStorage', 'sampleMetadata', 'featureMetadata', 'sampleMask',  'featureMask',
 							   'sampleMetadataExcluded', 'intensityDataExcluded', 'featureMetadataExcluded', 'excludedFlag',
 							   'corrExclusions', '_correlationToDilution', '_artifactualLinkageMatrix', '_tempArtifactualLinkageMatrix'})
 			objectSet = set(self.__dict__.keys())
@@ -7,9 +7,10 @@ import re
 import warnings
 
 from ._dataset import Dataset
+from ._processingLog import loggedOperation
+from ..profiling import profiled
 from ..enumerations import VariableType, AssayRole, SampleType
 from ..utilities._nmr import qcCheckBaseline, qcCheckSolventPeak
-from plotly.offline import iplot
 
 
 class NMRDataset(Dataset):
@@ -26,14 +27,23 @@ class NMRDataset(Dataset):
 	* BI-LISA
 		BI-LISA data can be read from Excel workbooks, the name of the sheet containing the data to be loaded should be passed in the *pulseProgram* argument. Feature descriptors will be loaded from the 'Analytes' sheet, and file names converted back to the `ExperimentName/expno` format from `ExperimentName_EXPNO_expno`.
 
+	* HDF5
+		Loads a dataset saved with ``exportDataset(saveFormat='HDF5')``. Only a subset of the samples or features may be read with the ``sampleSlice=`` and ``featureSlice=`` arguments, see :py:meth:`~Dataset._initialiseFromHDF5`.
+
+	* Parquet
+		Loads a dataset saved with ``exportDataset(saveFormat='Parquet')`` or ``exportDataset(saveFormat='ParquetLong')`` with ``fileType='parquet export'``, *datapath* should be the path to the *Name_sampleMetadata.parquet* file.
+
 	:param str fileType: Type of data to be loaded
 	:param str sheetname: Load data from the specifed sheet of the Excel workbook
 	:param str pulseprogram: When loading raw data, only import spectra aquired with *pulseprogram*
+	:param sampleSlice: When loading HDF5 files, the samples to read, see :py:meth:`~Dataset._initialiseFromHDF5`
+	:param featureSlice: When loading HDF5 files, the features to read, see :py:meth:`~Dataset._initialiseFromHDF5`
 	"""
 
 	__importTypes = ['Bruker'] # Raw data types we understand
 
-	def __init__(self, datapath, fileType='Bruker', pulseProgram='noesygppr1d', sop='GenericNMRurine', pdata=1, **kwargs):
+	@profiled
+	def __init__(self, datapath, fileType='Bruker', pulseProgram='noesygppr1d', sop='GenericNMRurine', pdata=1, sampleSlice=None, featureSlice=None, **kwargs):
 		"""
 		NMRDataset(datapath, fileType='Bruker', sop='GenericNMRurine', pulseprogram='noesygpp1d', **kwargs)
 
@@ -78,7 +88,8 @@ class NMRDataset(Dataset):
 			(self._intensityData, ppm, self.sampleMetadata) = importBrukerSpectra(datapath,
 																				  pulseProgram,
 																				  pdata,
-																				  self.Attributes)
+																				  self.Attributes,
+																				  allocate=self._allocateIntensityData)
 			self.featureMetadata = pandas.DataFrame(ppm, columns=['ppm'])
 
 			##
@@ -114,6 +125,16 @@ class NMRDataset(Dataset):
 			(self.name, self.intensityData, self.featureMetadata, self.sampleMetadata) = self._initialiseFromCSV(datapath)
 			self.VariableType = VariableType.Spectral
 			self.initialiseMasks()
+		elif fileType.lower() == 'parquet export':
+			(self.name, self.intensityData, self.featureMetadata, self.sampleMetadata) = self._initialiseFromParquet(datapath)
+			self.VariableType = VariableType.Spectral
+			self.initialiseMasks()
+			if 'ppm' in self.featureMetadata.columns:
+				self._scale = self.featureMetadata['ppm'].values
+		elif fileType.lower() == 'hdf5':
+			self._initialiseFromHDF5(datapath, sampleSlice=sampleSlice, featureSlice=featureSlice)
+			if 'ppm' in self.featureMetadata.columns:
+				self._scale = self.featureMetadata['ppm'].values
 		elif fileType == 'empty':
 			# Lets us build an empty object for testing &c
 			pass
@@ -124,6 +145,7 @@ class NMRDataset(Dataset):
 		self.Attributes['Log'].append([datetime.now(), '%s instance initiated, with %d samples, %d features, from %s' % (self.__class__.__name__, self.noSamples, self.noFeatures, datapath)])
 
 
+	@loggedOperation
 	def addSampleInfo(self, descriptionFormat=None, filePath=None, filenameSpec=None, **kwargs):
 		"""
 		Load additional metadata and map it in to the :py:attr:`~Dataset.sampleMetadata` table.
@@ -219,6 +241,8 @@ class NMRDataset(Dataset):
 
 		self.Attributes['Log'].append([datetime.now(), 'Sample metadata parsed from filenames.'])
 
+	@profiled
+	@loggedOperation
 	def updateMasks(self, filterSamples=True, filterFeatures=True,
 					sampleTypes=list(SampleType),#[SampleType.StudySample, SampleType.StudyPool],
 					assayRoles=list(AssayRole),#[AssayRole.Assay, AssayRole.PrecisionReference],
@@ -311,6 +335,7 @@ class NMRDataset(Dataset):
 		import matplotlib.pyplot as plt
 		if interactive:
 			from ..plotting import plotSpectraInteractive
+			from plotly.offline import iplot
 			nmr_plot = plotSpectraInteractive(self, spectra, sampleLabels=labels)
 			iplot(nmr_plot)
 			return nmr_plot
@@ -0,0 +1,234 @@
+"""
+Reading and writing of dataset tables to Apache Parquet files, used by :py:meth:`~nPYc.objects.Dataset.exportDataset` and the ``fileType='parquet export'`` loaders.
+
+Each of :py:attr:`~nPYc.objects.Dataset.sampleMetadata`, :py:attr:`~nPYc.objects.Dataset.featureMetadata` and :py:attr:`~nPYc.objects.Dataset.intensityData` is written to its own file, with column types kept where Parquet has an equivalent:
+
+* Numeric, boolean and datetime columns are stored as they are
+* Columns of members of an :py:mod:`nPYc.enumerations` enumeration are stored as dictionary encoded member names
+* Columns of strings are stored as strings
+* Other columns are stored as the JSON representation of each value
+
+How to decode each column is recorded in the file metadata, so tables read back by :py:func:`readTable` match those written. The files remain plain Parquet tables to other readers.
+
+pyarrow is only imported when a file is read or written.
+"""
+import json
+from datetime import datetime
+import numpy
+import pandas
+from .. import enumerations
+from ._hdf5 import _enumClass, _jsonDefault
+from ._memmapStorage import _blockRows
+
+
+# Keys of the Parquet file metadata used by nPYc
+_columnsKey = b'nPYc.columns'
+_intensityDataKey = b'nPYc.intensityData'
+
+
+def _importPyarrow():
+	try:
+		import pyarrow
+		import pyarrow.parquet
+	except ImportError:
+		raise ImportError('pyarrow is required to read and write Parquet files, install it with \'pip install pyarrow\'.')
+
+	return pyarrow
+
+
+def _isNull(value):
+	return value is None or value is pandas.NaT or (isinstance(value, float) and numpy.isnan(value))
+
+
+def encodeColumn(column):
+	"""
+	Encode a :py:class:`pandas.Series` as a column Parquet can store, and a dictionary describing how to decode it.
+
+	:param pandas.Series column: Column to encode
+	:return: Tuple of (values, description)
+	:rtype: (pandas.Series, dict)
+	"""
+	if isinstance(column.dtype, pandas.CategoricalDtype):
+		column = column.astype(object)
+
+	if pandas.api.types.is_bool_dtype(column.dtype) or pandas.api.types.is_numeric_dtype(column.dtype) or pandas.api.types.is_datetime64_any_dtype(column.dtype):
+		return (column, {'kind': 'values'})
+
+	notNull = [value for value in column.values if not _isNull(value)]
+
+	if notNull and all(isinstance(value, datetime) for value in notNull):
+		return (pandas.to_datetime(pandas.Series(column.values, dtype=object)), {'kind': 'datetime'})
+
+	enumClass = _enumClass(column.values)
+	if notNull and (enumClass is not None):
+		names = [None if _isNull(value) else value.name for value in column.values]
+		return (pandas.Series(pandas.Categorical(names, categories=[member.name for member in enumClass])), {'kind': 'enum', 'enum': enumClass.__name__})
+
+	if all(isinstance(value, str) for value in notNull):
+		return (pandas.Series([None if _isNull(value) else value for value in column.values], dtype=object), {'kind': 'values'})
+
+	return (pandas.Series([json.dumps(value, default=_jsonDefault) for value in column.values], dtype=object), {'kind': 'json'})
+
+
+def decodeColumn(values, description):
+	"""
+	Reverse :py:func:`encodeColumn`.
+
+	:param pandas.Series values: Column as read from the file
+	:param dict description: Description returned by :py:func:`encodeColumn`
+	:return: Decoded values
+	:rtype: pandas.Series
+	"""
+	kind = description['kind']
+
+	if kind == 'values':
+		return values
+
+	elif kind == 'datetime':
+		return pandas.Series([None if pandas.isnull(value) else value for value in values.dt.to_pydatetime()], dtype=object)
+
+	elif kind == 'enum':
+		enumClass = getattr(enumerations, description['enum'])
+		return pandas.Series([None if _isNull(value) else enumClass[value] for value in values.astype(object)], dtype=object)
+
+	elif kind == 'json':
+		return pandas.Series([json.loads(value) for value in values], dtype=object)
+
+	else:
+		raise ValueError('Unknown column encoding \'%s\'.' % (kind))
+
+
+def writeTable(table, path):
+	"""
+	Write the metadata *table* to the Parquet file *path*.
+
+	:param pandas.DataFrame table: Table to write
+	:param str path: Path to the file to write
+	:raises ImportError: if pyarrow is not installed
+	"""
+	pyarrow = _importPyarrow()
+
+	columns = dict()
+	descriptions = list()
+	for (i, name) in enumerate(table.columns):
+		(values, description) = encodeColumn(table.iloc[:, i])
+		columns[str(name)] = values.reset_index(drop=True)
+		description['name'] = name
+		descriptions.append(description)
+
+	if len(columns) != len(descriptions):
+		raise ValueError('Column names must be unique to be written to Parquet.')
+
+	arrowTable = pyarrow.Table.from_pandas(pandas.DataFrame(columns, index=pandas.RangeIndex(table.shape[0])), preserve_index=False)
+	arrowTable = arrowTable.replace_schema_metadata({**(arrowTable.schema.metadata or {}), _columnsKey: json.dumps(descriptions, default=_jsonDefault).encode('utf-8')})
+
+	pyarrow.parquet.write_table(arrowTable, path)
+
+
+def readTable(path):
+	"""
+	Read a metadata table written by :py:func:`writeTable`.
+
+	Files written by other software are read as they are.
+
+	:param str path: Path to the file to read
+	:return: The table
+	:rtype: pandas.DataFrame
+	:raises ImportError: if pyarrow is not installed
+	"""
+	pyarrow = _importPyarrow()
+
+	arrowTable = pyarrow.parquet.read_table(path)
+	table = arrowTable.to_pandas()
+
+	metadata = arrowTable.schema.metadata or {}
+	if _columnsKey not in metadata:
+		return table
+
+	descriptions = json.loads(metadata[_columnsKey].decode('utf-8'))
+	decoded = dict()
+	for (i, description) in enumerate(descriptions):
+		decoded[i] = decodeColumn(table.iloc[:, i], description).values
+
+	decoded = pandas.DataFrame(decoded, index=pandas.RangeIndex(table.shape[0]))
+	decoded.columns = [description['name'] for description in descriptions]
+
+	return decoded
+
+
+def writeIntensityData(intensityData, path, longFormat=False):
+	"""
+	Write *intensityData* to the Parquet file *path*.
+
+	In the wide layout the file has a column per feature, named by the feature's position in :py:attr:`~nPYc.objects.Dataset.featureMetadata`, and a row per sample. In the long layout the file has a row per measurement, with the *Sample* and *Feature* positions and the *Intensity*.
+
+	The matrix is written one block of samples at a time, each as a row group, so only one block is copied to arrow at once.
+
+	:param intensityData: :math:`n` × :math:`m` matrix to write
+	:type intensityData: numpy.ndarray or nPYc.utilities.normalisation.LazyNormalisedArray
+	:param str path: Path to the file to write
+	:param bool longFormat: If ``True`` write the long layout, otherwise the wide layout
+	:raises ImportError: if pyarrow is not installed
+	"""
+	pyarrow = _importPyarrow()
+
+	(noSamples, noFeatures) = intensityData.shape
+	dtype = numpy.dtype(getattr(intensityData, 'dtype', numpy.float64))
+
+	layout = {'layout': 'long' if longFormat else 'wide', 'shape': [noSamples, noFeatures]}
+	if longFormat:
+		fields = [('Sample', pyarrow.int64()), ('Feature', pyarrow.int64()), ('Intensity', pyarrow.from_numpy_dtype(dtype))]
+	else:
+		fields = [(str(i), pyarrow.from_numpy_dtype(dtype)) for i in range(noFeatures)]
+	schema = pyarrow.schema(fields, metadata={_intensityDataKey: json.dumps(layout).encode('utf-8')})
+
+	step = _blockRows((noSamples, noFeatures), dtype)
+	with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+		# At least one, possibly empty, block, so the file holds the schema
+		for start in range(0, max(noSamples, 1), step):
+			block = numpy.asarray(intensityData[start:start + step], dtype=dtype)
+			noRows = block.shape[0]
+
+			if longFormat:
+				arrays = [pyarrow.array(numpy.repeat(numpy.arange(start, start + noRows, dtype=numpy.int64), noFeatures)),
+						  pyarrow.array(numpy.tile(numpy.arange(noFeatures, dtype=numpy.int64), noRows)),
+						  pyarrow.array(block.ravel())]
+			else:
+				# Column major, so each feature is contiguous when handed to arrow
+				block = numpy.asfortranarray(block)
+				arrays = [pyarrow.array(block[:, i]) for i in range(noFeatures)]
+
+			writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+
+
+def readIntensityData(path):
+	"""
+	Read a matrix written by :py:func:`writeIntensityData`, in either layout.
+
+	Measurements missing from a long table are read as ``NaN``.
+
+	:param str path: Path to the file to read
+	:return: :math:`n` × :math:`m` matrix
+	:rtype: numpy.ndarray
+	:raises ImportError: if pyarrow is not installed
+	:raises ValueError: if *path* was not written by :py:func:`writeIntensityData`
+	"""
+	pyarrow = _importPyarrow()
+
+	arrowTable = pyarrow.parquet.read_table(path)
+
+	metadata = arrowTable.schema.metadata or {}
+	if _intensityDataKey not in metadata:
+		raise ValueError('%s is not a nPYc intensityData Parquet file.' % (path))
+	layout = json.loads(metadata[_intensityDataKey].decode('utf-8'))
+
+	if layout['layout'] == 'long':
+		intensityData = numpy.full(layout['shape'], numpy.nan)
+		intensityData[arrowTable.column('Sample').to_numpy(), arrowTable.column('Feature').to_numpy()] = arrowTable.column('Intensity').to_numpy()
+	else:
+		intensityData = numpy.empty(layout['shape'], order='F')
+		for i in range(layout['shape'][1]):
+			intensityData[:, i] = arrowTable.column(i).to_numpy()
+		intensityData = numpy.ascontiguousarray(intensityData)
+
+	return intensityData
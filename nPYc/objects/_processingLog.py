@@ -0,0 +1,246 @@
+"""
+Structured processing log held in :py:attr:`~nPYc.objects.Dataset.Attributes`\ ['Log'], see :py:class:`ProcessingLog`.
+"""
+import functools
+import inspect
+import numbers
+import time
+import tracemalloc
+from datetime import datetime
+import numpy
+import pandas
+from ..profiling import _enterFrame, _exitFrame
+
+
+# Maximum number of entries held by new logs, if None logs are not bounded
+defaultMaxLength = None
+
+
+class LogEntry(list):
+	"""
+	A ``[timestamp, message]`` entry of a :py:class:`ProcessingLog`.
+
+	Entries timed by :py:func:`loggedOperation` also describe the operation that wrote them:
+
+	* **operation** Name of the method called
+	* **parameters** Dictionary of the arguments passed, with arrays and tables summarised by their type and size
+	* **duration** Time taken by the call, in seconds
+	* **shapeBefore**, **shapeAfter** (:py:attr:`~Dataset.noSamples`, :py:attr:`~Dataset.noFeatures`) before and after the call
+	* **peakMemory** Peak memory in bytes traced during the call, ``None`` unless :py:mod:`tracemalloc` is tracing
+
+	Entries are shared by copies of the log, and should not be modified.
+	"""
+
+	operation = None
+	parameters = None
+	duration = None
+	shapeBefore = None
+	shapeAfter = None
+	peakMemory = None
+
+	#: Attributes describing the operation, saved with the entry by :py:func:`encodeLog`
+	fields = ('operation', 'parameters', 'duration', 'shapeBefore', 'shapeAfter', 'peakMemory')
+
+
+class ProcessingLog(list):
+	"""
+	List of the :py:class:`LogEntry` steps applied to a dataset, in order.
+
+	The log behaves as the list of ``[timestamp, message]`` pairs it replaces, but:
+
+	* Where *maxLength* is set, only the latest *maxLength* entries are kept, and :py:attr:`noDiscarded` counts those dropped
+	* Copies (including deep copies made when a dataset is copied) share the entries rather than copying them
+	* :py:meth:`summary` tabulates the operation, duration, shape and memory of each entry, to find the steps of a pipeline that are slow
+
+	:param entries: Initial entries
+	:param maxLength: Maximum number of entries kept, if ``None`` entries are never dropped
+	:type maxLength: None or int
+	"""
+
+	maxLength = None
+	noDiscarded = 0
+	_noAppended = 0
+
+	def __init__(self, entries=(), maxLength=None):
+
+		super().__init__()
+		self.maxLength = maxLength if maxLength is not None else defaultMaxLength
+		self.extend(entries)
+
+
+	def append(self, entry):
+		"""
+		Add *entry* to the end of the log, discarding the oldest entries if the log is full.
+		"""
+		if not isinstance(entry, LogEntry):
+			entry = LogEntry(entry)
+
+		super().append(entry)
+		self._noAppended += 1
+
+		if (self.maxLength is not None) and (len(self) > self.maxLength):
+			noDiscarded = len(self) - self.maxLength
+			del self[:noDiscarded]
+			self.noDiscarded += noDiscarded
+
+
+	def extend(self, entries):
+		for entry in entries:
+			self.append(entry)
+
+
+	def __iadd__(self, entries):
+		self.extend(entries)
+		return self
+
+
+	def __add__(self, entries):
+		log = self.copy()
+		log.extend(entries)
+		return log
+
+
+	def copy(self):
+		"""
+		Return a copy of the log, sharing its entries.
+		"""
+		log = self.__class__(maxLength=self.maxLength)
+		list.extend(log, self)
+		log.noDiscarded = self.noDiscarded
+		log._noAppended = self._noAppended
+
+		return log
+
+
+	def __copy__(self):
+		return self.copy()
+
+
+	def __deepcopy__(self, memo):
+		return self.copy()
+
+
+	def summary(self):
+		"""
+		Tabulate the entries of the log.
+
+		:return: Table with a row per entry, and the timestamp, operation, message, parameters, duration in seconds, shape before and after and peak memory of each
+		:rtype: pandas.DataFrame
+		"""
+		return pandas.DataFrame([[entry[0], entry.operation, entry[1], entry.parameters, entry.duration,
+								  entry.shapeBefore, entry.shapeAfter, entry.peakMemory] for entry in self],
+								columns=['Timestamp', 'Operation', 'Message', 'Parameters', 'Duration', 'Shape Before', 'Shape After', 'Peak Memory'])
+
+
+def _summariseParameter(value):
+	"""
+	Return *value* if a scalar, otherwise a short description, so entries do not hold references to data.
+	"""
+	if (value is None) or isinstance(value, (str, bool, numbers.Number, datetime)):
+		return value
+	elif isinstance(value, (numpy.ndarray, pandas.DataFrame, pandas.Series)):
+		return '%s of shape %s' % (type(value).__name__, value.shape)
+	elif isinstance(value, (list, tuple, set, dict)):
+		return '%s of length %i' % (type(value).__name__, len(value))
+	else:
+		return type(value).__name__
+
+
+def _shape(dataset):
+	try:
+		return (dataset.noSamples, dataset.noFeatures)
+	except Exception:
+		return None
+
+
+def encodeLog(log):
+	"""
+	Encode the entries of *log* for JSON, as ``[timestamp, message]`` lists with the timestamp in ISO format, followed by a dictionary of the :py:attr:`~LogEntry.fields` of entries describing an operation.
+
+	:param log: Log to encode
+	:type log: list of LogEntry
+	:return: List of entries
+	:rtype: list
+	"""
+	entries = list()
+	for entry in log:
+		encoded = [entry[0].isoformat() if isinstance(entry[0], datetime) else entry[0]] + list(entry[1:])
+		if isinstance(entry, LogEntry) and (entry.operation is not None):
+			encoded.append({field: getattr(entry, field) for field in LogEntry.fields})
+		entries.append(encoded)
+
+	return entries
+
+
+def decodeLog(entries):
+	"""
+	Rebuild a :py:class:`ProcessingLog` from the entries returned by :py:func:`encodeLog`.
+
+	Timestamps are parsed with :py:class:`pandas.Timestamp`, as :py:meth:`datetime.fromisoformat` needs Python 3.7.
+
+	:param list entries: Encoded entries
+	:return: Log of the entries
+	:rtype: ProcessingLog
+	"""
+	log = ProcessingLog()
+	for encoded in entries:
+		fields = encoded[-1] if (len(encoded) > 2) and isinstance(encoded[-1], dict) else None
+		entry = LogEntry([pandas.Timestamp(encoded[0]).to_pydatetime()] + list(encoded[1:-1 if fields is not None else None]))
+		for (field, value) in (fields or dict()).items():
+			if field in LogEntry.fields:
+				setattr(entry, field, tuple(value) if (field in ('shapeBefore', 'shapeAfter')) and (value is not None) else value)
+		log.append(entry)
+
+	return log
+
+
+def loggedOperation(method):
+	"""
+	Decorate a :py:class:`~nPYc.objects.Dataset` method, so the first entry it adds to :py:attr:`~Dataset.Attributes`\ ['Log'] records the operation, its parameters, duration, and the shape of the dataset and peak memory use.
+
+	Calls adding no entry are not recorded. Where an overriding method calls the method it overrides, the entry records the outer call.
+	"""
+	signature = inspect.signature(method)
+
+	@functools.wraps(method)
+	def wrapper(self, *args, **kwargs):
+		attributes = getattr(self, 'Attributes', None)
+		log = attributes.get('Log') if isinstance(attributes, dict) else None
+		if not isinstance(log, ProcessingLog):
+			return method(self, *args, **kwargs)
+
+		noAppended = log._noAppended
+		shapeBefore = _shape(self)
+		frame = _enterFrame() if tracemalloc.is_tracing() else None
+		traced = None
+		start = time.perf_counter()
+
+		try:
+			result = method(self, *args, **kwargs)
+		finally:
+			duration = time.perf_counter() - start
+			if frame is not None:
+				traced = frame[0] + _exitFrame(frame)
+
+		if (log._noAppended == noAppended) or (not log):
+			return result
+
+		# The first entry added by the call describes it, later entries come from the methods it calls
+		entry = log[max(0, len(log) - (log._noAppended - noAppended))]
+		if entry.operation not in (None, method.__name__):
+			return result
+
+		try:
+			arguments = signature.bind(self, *args, **kwargs).arguments
+		except TypeError:
+			arguments = kwargs
+		entry.operation = method.__name__
+		entry.parameters = {name: _summariseParameter(value) for (name, value) in arguments.items() if name != 'self'}
+		entry.duration = duration
+		entry.shapeBefore = shapeBefore
+		entry.shapeAfter = _shape(self)
+		entry.peakMemory = traced
+
+		return result
+
+	return wrapper
@@ -0,0 +1,273 @@
+"""
+Snapshots of datasets to a directory of numpy files, used by :py:meth:`~nPYc.objects.Dataset.save` and :py:meth:`~nPYc.objects.Dataset.load`.
+
+Directory layout:
+
+* ``intensityData.npy`` the :math:`n` × :math:`m` matrix, which can be memory-mapped on load, prior to normalisation where the :py:attr:`~nPYc.objects.Dataset.Normalisation` can be saved
+* ``normalisation-*.npy`` files holding the coefficients and any other arrays of the normaliser
+* ``sampleMask.npy`` and ``featureMask.npy`` boolean vectors
+* ``sampleMetadata.npz`` and ``featureMetadata.npz`` with one member per column, encoded as in :py:func:`~nPYc.objects._hdf5.encodeColumn`
+* One ``.npz`` or ``.npy`` file for each table or matrix held by the additional attributes listed in the ``_hdf5Attributes`` of the dataset class
+* ``manifest.json`` describing the files, with the size and SHA-256 checksum of each, the normaliser, ``name``, ``VariableType``, ``AnalyticalPlatform`` and ``Attributes`` (including the Log)
+
+No file is pickled, so snapshots do not depend on the versions of the classes that wrote them. The manifest is written last, so an interrupted save cannot be loaded. The sizes of the files are always checked on load, while checksums, which require every file to be read, are only checked on request.
+"""
+import enum
+import hashlib
+import json
+import os
+from datetime import datetime
+import numpy
+import pandas
+from .. import enumerations
+from ._hdf5 import encodeColumn, decodeColumn, encodeNormaliser, decodeNormaliser, _encodeAttributes, _jsonDefault
+from ._processingLog import decodeLog
+from ._memmapStorage import _blockRows
+
+
+# Format version written to the manifest, checked on load
+_formatVersion = 1
+
+_manifestName = 'manifest.json'
+
+# Size of the blocks files are read in when checksummed
+_checksumBlockBytes = 2 ** 24
+
+
+def _checksum(path):
+	"""
+	SHA-256 hex digest of the file *path*.
+	"""
+	digest = hashlib.sha256()
+	with open(path, 'rb') as file:
+		for block in iter(lambda: file.read(_checksumBlockBytes), b''):
+			digest.update(block)
+
+	return digest.hexdigest()
+
+
+class _Writer:
+	"""
+	Writes the files of a snapshot to *directory*, recording the checksum of each.
+	"""
+
+	def __init__(self, directory):
+
+		self.directory = directory
+		self.checksums = dict()
+		self.sizes = dict()
+
+
+	def _record(self, fileName):
+		path = os.path.join(self.directory, fileName)
+		self.checksums[fileName] = _checksum(path)
+		self.sizes[fileName] = os.path.getsize(path)
+		return fileName
+
+
+	def writeMatrix(self, fileName, X):
+		"""
+		Write *X* to the .npy file *fileName*, one block of rows at a time so lazily normalised or memory-mapped data is never loaded whole.
+		"""
+		path = os.path.join(self.directory, fileName)
+		shape = X.shape
+
+		if (len(shape) != 2) or (0 in shape):
+			numpy.save(path, numpy.asarray(X), allow_pickle=False)
+		else:
+			dtype = X.dtype
+			out = numpy.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+			step = _blockRows(shape, dtype)
+			for start in range(0, shape[0], step):
+				out[start:start + step] = numpy.asarray(X[start:start + step])
+			out.flush()
+			del out
+
+		return self._record(fileName)
+
+
+	def writeTable(self, fileName, table):
+		"""
+		Write the columns of *table* to the .npz file *fileName*, returning the manifest entry describing it.
+		"""
+		columns = dict()
+		descriptions = list()
+		for i in range(table.shape[1]):
+			(values, description) = encodeColumn(table.iloc[:, i])
+			if values.dtype == object:
+				values = numpy.array(values.tolist(), dtype=str)
+			columns[str(i)] = values
+			descriptions.append(description)
+
+		numpy.savez(os.path.join(self.directory, fileName), **columns)
+
+		return {'kind': 'table', 'file': self._record(fileName), 'columns': list(table.columns), 'length': table.shape[0], 'descriptions': descriptions}
+
+
+	def writeValue(self, name, value):
+		"""
+		Return the manifest entry for *value*: DataFrames as tables, numeric arrays as .npy files, dicts and lists recursively, and anything else as JSON.
+		"""
+		if isinstance(value, pandas.DataFrame):
+			return self.writeTable(name + '.npz', value)
+		elif isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+			return {'kind': 'array', 'file': self.writeMatrix(name + '.npy', value)}
+		elif isinstance(value, dict):
+			return {'kind': 'dict', 'keys': list(value.keys()), 'values': [self.writeValue('%s-%i' % (name, i), item) for (i, item) in enumerate(value.values())]}
+		elif isinstance(value, (list, tuple)) and any(isinstance(item, (pandas.DataFrame, numpy.ndarray, dict)) for item in value):
+			return {'kind': 'list', 'values': [self.writeValue('%s-%i' % (name, i), item) for (i, item) in enumerate(value)]}
+		else:
+			return {'kind': 'json', 'value': value}
+
+
+class _Reader:
+	"""
+	Reads the files of a snapshot in *directory*.
+	"""
+
+	def __init__(self, directory):
+
+		self.directory = directory
+
+
+	def readMatrix(self, fileName, mmap=False):
+		"""
+		Read the .npy file *fileName*, as a copy-on-write memmap if *mmap*, so changes are never written back to the snapshot.
+		"""
+		return numpy.load(os.path.join(self.directory, fileName), mmap_mode='c' if mmap else None, allow_pickle=False)
+
+
+	def readTable(self, entry):
+		with numpy.load(os.path.join(self.directory, entry['file']), allow_pickle=False) as members:
+			table = {i: decodeColumn(members[str(i)], description) for (i, description) in enumerate(entry['descriptions'])}
+
+		table = pandas.DataFrame(table, index=pandas.RangeIndex(entry['length']))
+		table.columns = entry['columns']
+
+		return table
+
+
+	def readValue(self, entry):
+		kind = entry['kind']
+
+		if kind == 'table':
+			return self.readTable(entry)
+		elif kind == 'array':
+			return self.readMatrix(entry['file'])
+		elif kind == 'dict':
+			return {key: self.readValue(item) for (key, item) in zip(entry['keys'], entry['values'])}
+		elif kind == 'list':
+			return [self.readValue(item) for item in entry['values']]
+		elif kind == 'json':
+			return entry['value']
+		else:
+			raise ValueError('Unknown snapshot entry kind \'%s\'.' % (kind))
+
+
+def saveDataset(dataset, path):
+	"""
+	Write *dataset* to the directory *path*, see :py:meth:`~nPYc.objects.Dataset.save`.
+	"""
+	os.makedirs(path, exist_ok=True)
+
+	# Remove any previous manifest first, so a failed save cannot be loaded
+	if os.path.exists(os.path.join(path, _manifestName)):
+		os.remove(os.path.join(path, _manifestName))
+
+	writer = _Writer(path)
+
+	manifest = dict()
+	manifest['nPYc snapshot format'] = _formatVersion
+	manifest['class'] = dataset.__class__.__name__
+	manifest['name'] = dataset.name
+	for name in ('VariableType', 'AnalyticalPlatform'):
+		value = getattr(dataset, name, None)
+		manifest[name] = value.name if isinstance(value, enum.Enum) else None
+
+	(normalisation, normalisationArrays) = encodeNormaliser(dataset)
+	if normalisation is not None:
+		manifest['intensityData'] = writer.writeMatrix('intensityData.npy', dataset._intensityData)
+		manifest['Normalisation'] = {'description': normalisation, 'arrays': writer.writeValue('normalisation', normalisationArrays)}
+	else:
+		manifest['intensityData'] = writer.writeMatrix('intensityData.npy', dataset.intensityData)
+
+	manifest['sampleMask'] = writer.writeMatrix('sampleMask.npy', numpy.asarray(dataset.sampleMask, dtype=bool))
+	manifest['featureMask'] = writer.writeMatrix('featureMask.npy', numpy.asarray(dataset.featureMask, dtype=bool))
+	manifest['sampleMetadata'] = writer.writeTable('sampleMetadata.npz', dataset.sampleMetadata)
+	manifest['featureMetadata'] = writer.writeTable('featureMetadata.npz', dataset.featureMetadata)
+
+	manifest['attributes'] = dict()
+	for name in dataset._hdf5Attributes:
+		if hasattr(dataset, name):
+			manifest['attributes'][name] = writer.writeValue('attribute-' + name, getattr(dataset, name))
+
+	manifest['Attributes'] = _encodeAttributes(dataset.Attributes)
+	manifest['checksums'] = writer.checksums
+	manifest['sizes'] = writer.sizes
+
+	with open(os.path.join(path, _manifestName), 'w') as file:
+		json.dump(manifest, file, default=_jsonDefault)
+
+
+def loadDataset(cls, path, mmap=True, verify=False):
+	"""
+	Read the snapshot in directory *path*, see :py:meth:`~nPYc.objects.Dataset.load`.
+	"""
+	from . import _dataset
+	from .. import objects
+
+	manifestPath = os.path.join(path, _manifestName)
+	if not os.path.isfile(manifestPath):
+		raise ValueError('\'%s\' is not a nPYc snapshot.' % (path))
+
+	with open(manifestPath, 'r') as file:
+		manifest = json.load(file)
+
+	if manifest.get('nPYc snapshot format', None) != _formatVersion:
+		raise ValueError('\'%s\' is not a nPYc snapshot.' % (path))
+
+	for (fileName, size) in manifest.get('sizes', dict()).items():
+		if (not os.path.isfile(os.path.join(path, fileName))) or (os.path.getsize(os.path.join(path, fileName)) != size):
+			raise ValueError('Size of \'%s\' does not match the snapshot manifest, the file is missing, truncated or was modified.' % (os.path.join(path, fileName)))
+
+	if verify:
+		for (fileName, checksum) in manifest['checksums'].items():
+			if _checksum(os.path.join(path, fileName)) != checksum:
+				raise ValueError('Checksum of \'%s\' does not match the snapshot manifest, the file is corrupt or was modified.' % (os.path.join(path, fileName)))
+
+	datasetClass = getattr(objects, manifest['class'], None)
+	if (datasetClass is None) or not issubclass(datasetClass, cls):
+		raise TypeError('Snapshot holds a %s, which is not a %s.' % (manifest['class'], cls.__name__))
+
+	if datasetClass is _dataset.Dataset:
+		dataset = datasetClass()
+	else:
+		dataset = datasetClass('', fileType='empty')
+
+	reader = _Reader(path)
+
+	dataset._intensityData = reader.readMatrix(manifest['intensityData'], mmap=mmap)
+	if 'Normalisation' in manifest:
+		decodeNormaliser(dataset, manifest['Normalisation']['description'], reader.readValue(manifest['Normalisation']['arrays']))
+	dataset.sampleMask = reader.readMatrix(manifest['sampleMask'])
+	dataset.featureMask = reader.readMatrix(manifest['featureMask'])
+	dataset.sampleMetadata = reader.readTable(manifest['sampleMetadata'])
+	dataset.featureMetadata = reader.readTable(manifest['featureMetadata'])
+
+	for (name, entry) in manifest['attributes'].items():
+		setattr(dataset, name, reader.readValue(entry))
+
+	attributes = manifest['Attributes']
+	if 'Log' in attributes:
+		attributes['Log'] = decodeLog(attributes['Log'])
+
+	dataset.Attributes = {**dataset.Attributes, **attributes}
+	dataset.name = manifest['name']
+	if manifest['VariableType']:
+		dataset.VariableType = enumerations.VariableType[manifest['VariableType']]
+	if manifest['AnalyticalPlatform']:
+		dataset.AnalyticalPlatform = enumerations.AnalyticalPlatform[manifest['AnalyticalPlatform']]
+
+	dataset.Attributes['Log'].append([datetime.now(), 'Loaded from snapshot %s, with %i samples and %i features.' % (path, dataset.noSamples, dataset.noFeatures)])
+
+	return dataset
@@ -12,7 +12,10 @@ import collections
 import warnings
 from .._toolboxPath import toolboxPath
 from ._dataset import Dataset
+from ._processingLog import loggedOperation
+from ..profiling import profiled
 from ..utilities import normalisation, rsd
+from ..utilities._internal import _formatCSVRows, _writeCSVBlocks
 from ..enumerations import VariableType, AssayRole, SampleType, QuantificationType, CalibrationMethod, AnalyticalPlatform
 
 
@@ -180,9 +183,14 @@ class TargetedDataset(Dataset):
         * ``sop = ''BrukerBI-LISA'``
             Example: ``TargetedDataset(nmrRawDataPath, fileType='Bruker Quantification', sop='BrukerBI-LISA', fileNamePattern='.*?results\.xml$')``
 
+    * ``fileType = 'hdf5'`` to load a dataset saved with ``exportDataset(saveFormat='HDF5')``, including its calibration. Only a subset of the samples or features may be read with the ``sampleSlice=`` and ``featureSlice=`` arguments, see :py:meth:`~Dataset._initialiseFromHDF5`.
+
     """
 
-    def __init__(self, datapath, fileType='TargetLynx', sop='Generic', **kwargs):
+    _hdf5Attributes = {'expectedConcentration': ('samples', 'features'), 'calibration': ()}
+
+    @profiled
+    def __init__(self, datapath, fileType='TargetLynx', sop='Generic', sampleSlice=None, featureSlice=None, **kwargs):
         """
         Initialisation and pre-processing of input data (load files and match data and calibration and SOP, apply limits of quantification).
         """
@@ -208,6 +216,8 @@ class TargetedDataset(Dataset):
             self.VariableType = VariableType.Discrete
             self.AnalyticalPlatform = AnalyticalPlatform.NMR
             self.initialiseMasks()
+        elif fileType == 'hdf5':
+            self._initialiseFromHDF5(datapath, sampleSlice=sampleSlice, featureSlice=featureSlice)
         elif fileType == 'empty':
             # Build empty object for testing
             pass
@@ -226,6 +236,35 @@ class TargetedDataset(Dataset):
         if 'Metadata Available' not in self.sampleMetadata:
             self.sampleMetadata['Metadata Available'] = False
 
+    def _initialiseFromHDF5(self, path, sampleSlice=None, featureSlice=None, **kwargs):
+        """
+        Initialise the object from a file written by :py:meth:`~Dataset._exportHDF5`, see :py:meth:`~Dataset._initialiseFromHDF5`.
+
+        All calibration samples are loaded, restricted to the features selected by *featureSlice*.
+        """
+        from ._hdf5 import _importH5py, _parseSelection
+
+        if featureSlice is not None:
+            with _importH5py().File(path, 'r') as h5File:
+                noFeatures = h5File['intensityData'].shape[1]
+            featureSlice = _parseSelection(featureSlice, noFeatures, 'featureSlice')
+
+        super()._initialiseFromHDF5(path, sampleSlice=sampleSlice, featureSlice=featureSlice)
+
+        if (featureSlice is None) or (not hasattr(self, 'calibration')):
+            return
+
+        # Calibration tables hold features in rows (calibFeatureMetadata) or in columns
+        calibrations = self.calibration if isinstance(self.calibration, list) else [self.calibration]
+        for calibration in calibrations:
+            for key, value in calibration.items():
+                if key == 'calibFeatureMetadata':
+                    calibration[key] = value.iloc[featureSlice].reset_index(drop=True)
+                elif isinstance(value, pandas.DataFrame) and (value.shape[1] == noFeatures):
+                    calibration[key] = value.iloc[:, featureSlice]
+                elif isinstance(value, numpy.ndarray) and (value.ndim == 2) and (value.shape[1] == noFeatures):
+                    calibration[key] = value[:, featureSlice]
+
     @property
     def rsdSP(self):
         """
@@ -238,13 +277,10 @@ class TargetedDataset(Dataset):
         # Check we have Study Reference samples defined
         if not ('AssayRole' in self.sampleMetadata.keys() or 'SampleType' in self.sampleMetadata.keys()):
             raise ValueError('Assay Roles and Sample Types must be defined to calculate RSDs.')
-        if not sum(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) > 1:
+        if not numpy.sum(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) > 1:
             raise ValueError('More than one precision reference is required to calculate RSDs.')
 
-        mask = numpy.logical_and(self.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference,
-                                 self.sampleMetadata['SampleType'].values == SampleType.StudyPool)
-
-        return rsd(self._intensityData[mask & self.sampleMask])
+        return self._sampleClassRSD('SP')
 
     @property
     def rsdSS(self):
@@ -257,13 +293,10 @@ class TargetedDataset(Dataset):
         # Check we have Study Reference samples defined
         if not ('AssayRole' in self.sampleMetadata.keys() or 'SampleType' in self.sampleMetadata.keys()):
             raise ValueError('Assay Roles and Sample Types must be defined to calculate RSDs.')
-        if not sum(self.sampleMetadata['AssayRole'].values == AssayRole.Assay) > 1:
+        if not numpy.sum(self.sampleMetadata['AssayRole'].values == AssayRole.Assay) > 1:
             raise ValueError('More than one assay sample is required to calculate RSDs.')
 
-        mask = numpy.logical_and(self.sampleMetadata['AssayRole'].values == AssayRole.Assay,
-                                 self.sampleMetadata['SampleType'].values == SampleType.StudySample)
-
-        return rsd(self._intensityData[mask & self.sampleMask])
+        return self._sampleClassRSD('SS')
 
     def _loadTargetLynxDataset(self, datapath, calibrationReportPath, keepIS=False, noiseFilled=False, keepPeakInfo=False, keepExcluded=False, **kwargs):
         """
@@ -1952,7 +1985,7 @@ class TargetedDataset(Dataset):
 
         ## unexpected attributes
         expectedAttr = {'Attributes', 'VariableType', 'AnalyticalPlatform', '_Normalisation', '_name', 'fileName', 'filePath',
-                        '_intensityData', 'sampleMetadata', 'featureMetadata', 'expectedConcentration','sampleMask',
+                        '_intensityData', '_intensityDataVersion', '_intensityDataCache', '_sampleClassMasksCache', '_sampleClassMomentsCache', '_sampleClassRSDCache', '_qcStatisticsCache', '_featureIndexCache', '_memmapStorage', 'sampleMetadata', 'featureMetadata', 'expectedConcentration','sampleMask',
                         'featureMask', 'calibration', 'sampleMetadataExcluded', 'intensityDataExcluded',
                         'featureMetadataExcluded', 'expectedConcentrationExcluded', 'excludedFlag'}
         selfAttr = set(self.__dict__.keys())
@@ -2065,6 +2098,7 @@ class TargetedDataset(Dataset):
             print('Limits of quantification merged to the highest LLOQ and lowest ULOQ across batch')
 
 
+    @loggedOperation
     def exportDataset(self, destinationPath='.', saveFormat='CSV', withExclusions=True, escapeDelimiters=False, filterMetadata=True):
         """
         Calls :py:meth:`~Dataset.exportDataset` and raises a warning if normalisation is employed as :py:class:`TargetedDataset` :py:attr:`intensityData` can be left-censored.
@@ -2073,7 +2107,9 @@ class TargetedDataset(Dataset):
         # elegantly through the intensityData getter
         # Export dataset...
         tmpData = copy.deepcopy(self)
-        tmpData._intensityData = tmpData._intensityData * (100/tmpData.sampleMetadata['Dilution']).values[:, numpy.newaxis]
+        # HDF5 files are loaded back as datasets, and hold the data as measured
+        if saveFormat != 'HDF5':
+            tmpData._intensityData = tmpData._intensityData * (100/tmpData.sampleMetadata['Dilution']).values[:, numpy.newaxis]
         super(TargetedDataset, tmpData).exportDataset(destinationPath=destinationPath, saveFormat=saveFormat, withExclusions=withExclusions, escapeDelimiters=escapeDelimiters, filterMetadata=filterMetadata)
 
 
@@ -2094,11 +2130,6 @@ class TargetedDataset(Dataset):
         sampleMetadata = self.sampleMetadata.copy(deep=True)
         featureMetadata = self.featureMetadata.copy(deep=True)
 
-        intensityData = copy.deepcopy(self._intensityData)
-        intensityData = pandas.DataFrame(intensityData)
-        intensityData.replace(to_replace=-numpy.inf, value='<LLOQ', inplace=True)
-        intensityData.replace(to_replace= numpy.inf, value='>ULOQ', inplace=True)
-
         if escapeDelimiters:
             # Remove any commas from metadata/feature tables - for subsequent import of resulting csv files to other software packages
 
@@ -2122,8 +2153,11 @@ class TargetedDataset(Dataset):
         # Export feature metadata
         featureMetadata.to_csv(destinationPath + '_featureMetadata.csv', encoding='utf-8')
 
-        # Export intensity data
-        intensityData.to_csv(os.path.join(destinationPath + '_intensityData.csv'), encoding='utf-8', date_format=self._timestampFormat, header=False, index=False)
+        # Export intensity data, formatting blocks of samples in parallel
+        intensityData = self._intensityData
+        with open(os.path.join(destinationPath + '_intensityData.csv'), 'w', encoding='utf-8', newline='') as file:
+            _writeCSVBlocks(file, lambda start, stop: ''.join(_formatCSVRows(intensityData[start:stop], naRep='', infRep=('>ULOQ', '<LLOQ'), lineTerminator=os.linesep)),
+                            self.noSamples, self.noFeatures * intensityData.dtype.itemsize)
 
 
     def _exportUnifiedCSV(self, destinationPath, escapeDelimiters=False):
@@ -2141,11 +2175,6 @@ class TargetedDataset(Dataset):
         sampleMetadata = self.sampleMetadata.copy(deep=True)
         featureMetadata = self.featureMetadata.copy(deep=True)
 
-        intensityData = copy.deepcopy(self._intensityData)
-        intensityData = pandas.DataFrame(intensityData)
-        intensityData.replace(to_replace=-numpy.inf, value='<LLOQ', inplace=True)
-        intensityData.replace(to_replace=numpy.inf, value='>ULOQ', inplace=True)
-
         if escapeDelimiters:
             # Remove any commas from metadata/feature tables - for subsequent import of resulting csv files to other software packages
 
@@ -2164,18 +2193,7 @@ class TargetedDataset(Dataset):
                     pass
 
         # Export combined data in single file
-        tmpXCombined = pandas.concat([featureMetadata.transpose(), intensityData], axis=0, sort=False)
-
-        with warnings.catch_warnings():
-            # Seems no way to avoid pandas complaining here (v0.18.1)
-            warnings.simplefilter("ignore")
-            tmpCombined = pandas.concat([sampleMetadata, tmpXCombined], axis=1, sort=False)
-
-        # reorder rows to put metadata first
-        tmpCombined = tmpCombined.reindex(tmpXCombined.index, axis=0)
-
-        # Save
-        tmpCombined.to_csv(os.path.join(destinationPath + '_combinedData.csv'), encoding='utf-8', date_format=self._timestampFormat)
+        self._writeCombinedCSV(os.path.join(destinationPath + '_combinedData.csv'), sampleMetadata, featureMetadata, self._intensityData, infRep=('>ULOQ', '<LLOQ'))
 
 
     def validateObject(self, verbose=True, raiseError=False, raiseWarning=True):
@@ -2886,7 +2904,7 @@ class TargetedDataset(Dataset):
 
             ## List additional attributes (print + log)
             expectedSet = set({'Attributes', 'VariableType', '_Normalisation', '_name', 'fileName', 'filePath',
-                               '_intensityData', 'sampleMetadata', 'featureMetadata', 'expectedConcentration', 'sampleMask',
+                               '_intensityData', '_intensityDataVersion', '_intensityDataCache', '_sampleClassMasksCache', '_sampleClassMomentsCache', '_sampleClassRSDCache', '_qcStatisticsCache', '_featureIndexCache', '_memmapStorage', 'sampleMetadata', 'featureMetadata', 'expectedConcentration', 'sampleMask',
                                'featureMask', 'calibration', 'sampleMetadataExcluded', 'intensityDataExcluded',
                                'featureMetadataExcluded', 'expectedConcentrationExcluded', 'excludedFlag'})
             objectSet = set(self.__dict__.keys())
@@ -2988,6 +3006,8 @@ class TargetedDataset(Dataset):
             return ({'Dataset': False, 'BasicTargetedDataset': False, 'QC': False, 'sampleMetadata': False})
 
 
+    @profiled
+    @loggedOperation
     def applyMasks(self):
         """
         Permanently delete elements masked (those set to ``False``) in :py:attr:`~Dataset.sampleMask` and :py:attr:`~Dataset.featureMask`, from :py:attr:`~Dataset.featureMetadata`, :py:attr:`~Dataset.sampleMetadata`, :py:attr:`~Dataset.intensityData` and py:attr:`TargetedDataset.expectedConcentration`.
@@ -3078,6 +3098,30 @@ class TargetedDataset(Dataset):
         super().applyMasks()
 
 
+    def undoExclusion(self):
+        """
+        Revert the last exclusion step journaled by :py:meth:`applyMasks`, see :py:meth:`~Dataset.undoExclusion`. Samples excluded from :py:attr:`TargetedDataset.expectedConcentration` are restored too.
+
+        :raises ValueError: if the last step excluded features, as features removed from :py:attr:`~TargetedDataset.calibration` cannot be restored
+        """
+        if getattr(self, 'excludedFlag', None) and (self.excludedFlag[-1] == 'Features'):
+            raise ValueError('Features removed from the calibration cannot be restored.')
+
+        if getattr(self, 'excludedFlag', None):
+            record = self.intensityDataExcluded[-1]
+            expectedConcentrationExcluded = self.expectedConcentrationExcluded[-1]
+
+        # Restore the rest of TargetedDataset
+        super().undoExclusion()
+
+        order = numpy.argsort(numpy.concatenate((record.sampleIndex, record.rows)), kind='mergesort')
+        expectedConcentration = pandas.concat([self.expectedConcentration, expectedConcentrationExcluded], ignore_index=True, sort=False)
+        self.expectedConcentration = expectedConcentration.iloc[order].reset_index(drop=True)
+        del self.expectedConcentrationExcluded[-1]
+
+
+    @profiled
+    @loggedOperation
     def updateMasks(self, filterSamples=True, filterFeatures=True, sampleTypes=[SampleType.StudySample, SampleType.StudyPool],
                     assayRoles=[AssayRole.Assay, AssayRole.PrecisionReference],
                     quantificationTypes=[QuantificationType.IS, QuantificationType.QuantOwnLabeledAnalogue, QuantificationType.QuantAltLabeledAnalogue, QuantificationType.QuantOther, QuantificationType.Monitored],
@@ -3162,6 +3206,7 @@ class TargetedDataset(Dataset):
         self.Attributes['Log'].append([datetime.now(), 'Dataset filtered with: filterSamples=%s, filterFeatures=%s, sampleTypes=%s, assayRoles=%s, quantificationTypes=%s, calibrationMethods=%s' % (filterSamples, filterFeatures, sampleTypes, assayRoles, quantificationTypes, calibrationMethods)])
 
 
+    @loggedOperation
     def addSampleInfo(self, descriptionFormat=None, filePath=None, **kwargs):
         """
         Load additional metadata and map it in to the :py:attr:`~Dataset.sampleMetadata` table.
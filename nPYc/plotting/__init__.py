@@ -44,3 +44,9 @@ __all__ = ['histogram', 'plotBatchAndROCorrection', 'plotTIC', 'plotTICinteracti
 		   'plotFeatureLOQ', 'plotVariableScatter', 'plotAccuracyPrecision', 'plotCalibrationInteractive', 'plotLineWidth', 'plotLineWidthInteractive',
 		   'plotBaseline', 'plotBaselineInteractive', 'plotSolventResonance', 'plotSolventResonanceInteractive', 'plotSpectraInteractive', 'plotIonMapInteractive',
 		   'plotSpectralVarianceInteractive', 'correlationSpectroscopyInteractive', 'plotTargetedFeatureDistribution']
+
+# Record each figure drawn while profiling, see nPYc.profiling
+from ..profiling import profiled as _profiled
+for _name, _function in list(globals().items()):
+	if callable(_function) and getattr(_function, '__module__', '').startswith(__name__ + '.'):
+		globals()[_name] = _profiled(_function, name='plotting.' + _name)
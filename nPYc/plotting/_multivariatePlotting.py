@@ -729,8 +729,7 @@ def plotLoadingsInteractive(dataTrue, pcaModel, component=1, withExclusions=Fals
 	nc = pcaModel.scores.shape[1]
 
 	if withExclusions:
-		dataMasked = copy.deepcopy(dataTrue)
-		dataMasked.applyMasks()
+		dataMasked = dataTrue.view()
 	else:
 		dataMasked = dataTrue
 
@@ -5,7 +5,7 @@ import seaborn as sns
 import pandas as pd
 import copy
 import matplotlib.pyplot as plt
-from ..enumerations import AssayRole, SampleType
+from ..enumerations import SampleType
 import numpy
 import plotly.graph_objs as go
 from ..enumerations import VariableType
@@ -133,11 +133,12 @@ def plotPW(nmrData, savePath=None, title='', figureFormat='png', dpi=72, figureS
 	fig, ax = plt.subplots(1, figsize=figureSize, dpi=dpi)
 
 	# Masks for different sample categories
-	SSmask = (nmrData.sampleMetadata['SampleType'] == SampleType.StudySample) & (nmrData.sampleMetadata['AssayRole'] == AssayRole.Assay)
-	SPmask = (nmrData.sampleMetadata['SampleType'] == SampleType.StudyPool) & (nmrData.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
-	ERmask = (nmrData.sampleMetadata['SampleType'] == SampleType.ExternalReference) & (nmrData.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
-	SRDmask = (nmrData.sampleMetadata['SampleType'] == SampleType.StudyPool) & (nmrData.sampleMetadata['AssayRole'] == AssayRole.LinearityReference)
-	Blankmask = nmrData.sampleMetadata['SampleType'] == SampleType.ProceduralBlank
+	sampleClassMasks = nmrData.sampleClassMasks
+	SSmask = sampleClassMasks['SS']
+	SPmask = sampleClassMasks['SP']
+	ERmask = sampleClassMasks['ER']
+	SRDmask = sampleClassMasks['LR']
+	Blankmask = sampleClassMasks['Blank']
 	UnclearRolemask = (SSmask==False) & (SPmask==False) & (ERmask==False) & (SRDmask == False) & (Blankmask==False)
 
 
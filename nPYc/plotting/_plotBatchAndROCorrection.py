@@ -5,7 +5,7 @@ import numpy
 import pandas
 from ..objects._msDataset import MSDataset
 from ..utilities import generateLRmask
-from ..enumerations import AssayRole, SampleType
+from ..enumerations import SampleType
 from ._violinPlot import _violinPlotHelper
 import matplotlib.dates as mdates
 from matplotlib.dates import MO, TU, WE, TH, FR, SA, SU
@@ -53,10 +53,11 @@ def plotBatchAndROCorrection(msData, msDatacorrected, featureList, addViolin=Tru
 							SampleType.MethodReference: 'm', SampleType.ProceduralBlank: 'c', 'Other': 'grey'}
 
 	# Define sample types and exclude masked samples
-	SSmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (msData.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-	SPmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	ERmask = (msData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	LRmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
+	sampleClassMasks = msData.sampleClassMasks
+	SSmask = sampleClassMasks['SS']
+	SPmask = sampleClassMasks['SP']
+	ERmask = sampleClassMasks['ER']
+	LRmask = sampleClassMasks['LR']
 
 	# Get and sort the fit data
 	localRO = msData.sampleMetadata['Acquired Time'].values
@@ -4,7 +4,7 @@ import copy
 import seaborn as sns
 import matplotlib.lines as mlines
 import matplotlib.patches as mpatches
-from ..enumerations import AssayRole, SampleType, CalibrationMethod, QuantificationType
+from ..enumerations import SampleType, CalibrationMethod, QuantificationType
 import warnings
 from itertools import compress
 
@@ -49,9 +49,10 @@ def _featureLOQViolinPlotHelper(ax, tData, featID, splitByBatch=True, plotBatchL
                            SampleType.MethodReference: 'm', SampleType.ProceduralBlank: 'c', 'Other': 'grey'}
 
     # SampleType masks
-    SSmask = ((tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (tData.sampleMetadata['AssayRole'].values == AssayRole.Assay))
-    SPmask = ((tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference))
-    ERmask = ((tData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference))
+    sampleClassMasks = tData.sampleClassMasks
+    SSmask = sampleClassMasks['SS']
+    SPmask = sampleClassMasks['SP']
+    ERmask = sampleClassMasks['ER']
 
     # Plot figures
     if not onlyLegend:
@@ -3,7 +3,7 @@ import seaborn as sns
 import numpy
 import pandas
 import datetime
-from nPYc.enumerations import AssayRole, SampleType, CalibrationMethod, QuantificationType
+from nPYc.enumerations import CalibrationMethod, QuantificationType
 from matplotlib.dates import MO, TU, WE, TH, FR, SA, SU
 from matplotlib.dates import WeekdayLocator, HourLocator, DateFormatter
 from matplotlib import gridspec
@@ -86,8 +86,9 @@ def plotLOQRunOrder(targetedData, addCalibration=True, compareBatch=True, title=
         quantifiedFeatureMask = (targetedData.featureMetadata['quantificationType'] != QuantificationType.Monitored).values
 
         # Define sample types
-        SPMask = (targetedData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (targetedData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) & batchMask
-        ERMask = (targetedData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (targetedData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference) & batchMask
+        sampleClassMasks = targetedData.sampleClassMasks
+        SPMask = sampleClassMasks['SP'] & batchMask
+        ERMask = sampleClassMasks['ER'] & batchMask
 
         # x axis
         x    = targetedData.sampleMetadata.loc[batchMask, 'Acquired Time'].tolist()
@@ -140,8 +141,8 @@ def plotLOQRunOrder(targetedData, addCalibration=True, compareBatch=True, title=
             out_data['y_calib'] = y_calib
 
         # Store values to compare across batch
-        tmp_SPMask = (targetedData.sampleMetadata.loc[batchMask, 'SampleType'].values == SampleType.StudyPool) & (targetedData.sampleMetadata.loc[batchMask, 'AssayRole'].values == AssayRole.PrecisionReference)
-        tmp_ERMask = (targetedData.sampleMetadata.loc[batchMask, 'SampleType'].values == SampleType.ExternalReference) & (targetedData.sampleMetadata.loc[batchMask, 'AssayRole'].values == AssayRole.PrecisionReference)
+        tmp_SPMask = sampleClassMasks['SP'][batchMask]
+        tmp_ERMask = sampleClassMasks['ER'][batchMask]
         tmp_SSMask = numpy.invert(tmp_SPMask | tmp_ERMask)
         # check some SS exist
         if sum(tmp_SSMask) != 0:
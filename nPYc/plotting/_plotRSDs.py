@@ -10,7 +10,6 @@ import plotly.graph_objs as go
 
 from .. import Dataset, MSDataset, NMRDataset
 from ..enumerations import VariableType, SampleType, AssayRole
-from ..utilities import rsd
 from ._plotVariableScatter import plotVariableScatter
 
 
@@ -173,17 +172,25 @@ def _plotRSDsHelper(dataset, featureName='Feature Name', ratio=False, withExclus
 	precRefMask = numpy.logical_and(precRefMask, dataset.sampleMask)
 	sTypes = list(set(dataset.sampleMetadata.loc[precRefMask, 'SampleType'].values))
 
+	# RSDs of study samples, and each SampleType with at least 3 precision references (minimum 3 points needed), in one pass over the data
+	ssMask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudySample) & dataset.sampleMask
+	classMasks = {'SS': ssMask}
+	for sType in sTypes:
+		# precRefMask limits to Precision Reference and dataset.sampleMask
+		sTypeMask = numpy.logical_and(dataset.sampleMetadata.loc[:, 'SampleType'].values == sType, precRefMask)
+		if sum(sTypeMask) >= 3:
+			classMasks[sType] = sTypeMask
+	statistics = dataset.qcStatistics(classMasks, statistics=('rsd',))
+
 	if withExclusions:   
 		rsdVal['Feature Name'] = dataset.featureMetadata.loc[dataset.featureMask, featureName].values
 		rsdVal[SampleType.StudyPool] = dataset.rsdSP[dataset.featureMask]
-		ssMask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudySample) & dataset.sampleMask
-		rsdList = rsd(dataset.intensityData[ssMask, :])
+		rsdList = statistics['SS', 'rsd']
 		rsdVal[SampleType.StudySample] = rsdList[dataset.featureMask]
 	else:		
 		rsdVal['Feature Name'] = dataset.featureMetadata.loc[:, featureName].values
 		rsdVal[SampleType.StudyPool] = dataset.rsdSP
-		ssMask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudySample) & dataset.sampleMask
-		rsdList = rsd(dataset.intensityData[ssMask, :])
+		rsdList = statistics['SS', 'rsd']
 		rsdVal[SampleType.StudySample] = rsdList		
 
 	# Only keep features with finite values for SP and SS
@@ -191,19 +198,13 @@ def _plotRSDsHelper(dataset, featureName='Feature Name', ratio=False, withExclus
 	finiteMask = finiteMask & (rsdVal[SampleType.StudySample] < numpy.finfo(numpy.float64).max)
 
 	for sType in sTypes:
-		if not sTypes == SampleType.StudyPool:
-			sTypeMask = dataset.sampleMetadata.loc[:, 'SampleType'].values == sType
-			# precRefMask limits to Precision Reference and dataset.sampleMask
-			sTypeMask = numpy.logical_and(sTypeMask, precRefMask)
-
-			# minimum 3 points needed
-			if sum(sTypeMask) >= 3:
-				rsdList = rsd(dataset.intensityData[sTypeMask, :])
-				if withExclusions:
-					rsdVal[sType] = rsdList[dataset.featureMask]
-				else:
-					rsdVal[sType] = rsdList
-				finiteMask = finiteMask & (rsdVal[sType] < numpy.finfo(numpy.float64).max)
+		if sType in classMasks:
+			rsdList = statistics[sType, 'rsd']
+			if withExclusions:
+				rsdVal[sType] = rsdList[dataset.featureMask]
+			else:
+				rsdVal[sType] = rsdList
+			finiteMask = finiteMask & (rsdVal[sType] < numpy.finfo(numpy.float64).max)
 
 	## apply finiteMask
 	for sType in rsdVal.keys():
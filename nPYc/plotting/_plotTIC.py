@@ -6,7 +6,7 @@ import pandas
 import copy
 from ..objects._msDataset import MSDataset
 from ._violinPlot import _violinPlotHelper
-from ..enumerations import AssayRole, SampleType
+from ..enumerations import SampleType
 import matplotlib.dates as mdates
 from matplotlib.dates import MO, TU, WE, TH, FR, SA, SU
 from matplotlib.dates import WeekdayLocator
@@ -75,10 +75,11 @@ def plotTIC(msData, addViolin=True, addBatchShading=False, addLineAtGaps=False,
 		tempSamplesMask = numpy.ones(shape=msData.sampleMask.shape, dtype=bool)
 
 	# Define sample types
-	SSmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (msData.sampleMetadata['AssayRole'].values == AssayRole.Assay)) & tempSamplesMask
-	SPmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSamplesMask
-	ERmask = ((msData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSamplesMask
-	LRmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)) & tempSamplesMask
+	sampleClassMasks = msData.sampleClassMasks
+	SSmask = sampleClassMasks['SS'] & tempSamplesMask
+	SPmask = sampleClassMasks['SP'] & tempSamplesMask
+	ERmask = sampleClassMasks['ER'] & tempSamplesMask
+	LRmask = sampleClassMasks['LR'] & tempSamplesMask
 
 	# X axis limits for formatting
 	minX = msData.sampleMetadata['Acquired Time'].loc[msData.sampleMetadata['Run Order'] == min(msData.sampleMetadata['Run Order'][SSmask | SPmask | ERmask | LRmask])].values
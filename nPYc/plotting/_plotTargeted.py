@@ -1,5 +1,4 @@
 import numpy
-from ..enumerations import AssayRole, SampleType
 import plotly.graph_objs as go
 
 
@@ -28,12 +27,10 @@ def plotFeatureInteractive(tData, featureNo=0, withExclusions=True):
     else:
         tempSampleMask = numpy.ones(shape=tData.sampleMask.shape, dtype=bool)
 
-    SSmask = ((tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (
-                tData.sampleMetadata['AssayRole'].values == AssayRole.Assay)) & tempSampleMask
-    SPmask = ((tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (
-                tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSampleMask
-    ERmask = ((tData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (
-                tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSampleMask
+    sampleClassMasks = tData.sampleClassMasks
+    SSmask = sampleClassMasks['SS'] & tempSampleMask
+    SPmask = sampleClassMasks['SP'] & tempSampleMask
+    ERmask = sampleClassMasks['ER'] & tempSampleMask
 
     SSplot = go.Scattergl(
         x=tData.sampleMetadata['Acquired Time'][SSmask],
@@ -1,6 +1,6 @@
 import matplotlib.pyplot as plt
 from ..plotting._violinPlot import _violinPlotHelper
-from ..enumerations import AssayRole, SampleType
+from ..enumerations import SampleType
 import numpy
 import math
 import copy
@@ -26,9 +26,10 @@ def plotTargetedFeatureDistribution(datasetOriginal, featureName='Feature Name',
 	nf = math.ceil(nv/nax)
 	plotNo = 0
 
-	SPmask = (dataset.sampleMetadata['SampleType'] == SampleType.StudyPool) & (dataset.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
-	SSmask = (dataset.sampleMetadata['SampleType'] == SampleType.StudySample) & (dataset.sampleMetadata['AssayRole'] == AssayRole.Assay)
-	ERmask = (dataset.sampleMetadata['SampleType'] == SampleType.ExternalReference) & (dataset.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
+	sampleClassMasks = dataset.sampleClassMasks
+	SPmask = sampleClassMasks['SP']
+	SSmask = sampleClassMasks['SS']
+	ERmask = sampleClassMasks['ER']
 
 	# Define sample masks
 	sampleMasks = []
@@ -7,7 +7,6 @@ from ..objects._msDataset import MSDataset
 from ..utilities import generateLRmask
 from ..utilities._internal import _vcorrcoef 
 from ._violinPlot import _violinPlotHelper
-from ..enumerations import AssayRole, SampleType
 import matplotlib.dates as mdates
 from matplotlib.dates import MO, TU, WE, TH, FR, SA, SU
 from matplotlib.dates import WeekdayLocator
@@ -241,9 +240,10 @@ def plotTICinteractive(msData, plottype='Sample Type', labelby='Run Order', with
 		
 	if plottype=='Sample Type': # Plot TIC for SR samples coloured by batch
 	
-		SSmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (msData.sampleMetadata['AssayRole'].values == AssayRole.Assay)) & tempSampleMask
-		SPmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSampleMask
-		ERmask = ((msData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)) & tempSampleMask
+		sampleClassMasks = msData.sampleClassMasks
+		SSmask = sampleClassMasks['SS'] & tempSampleMask
+		SPmask = sampleClassMasks['SP'] & tempSampleMask
+		ERmask = sampleClassMasks['ER'] & tempSampleMask
 	
 		SSplot = go.Scatter(
 			x = msData.sampleMetadata[plotby][SSmask],
@@ -288,7 +288,7 @@ def plotTICinteractive(msData, plottype='Sample Type', labelby='Run Order', with
 	
 	if plottype=='Serial Dilution': # Plot TIC for LR samples coloured by dilution
 
-		LRmask = ((msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)) & tempSampleMask
+		LRmask = msData.sampleClassMasks['LR'] & tempSampleMask
 		
 		if hasattr(msData, 'corrExclusions'):
 			
@@ -368,7 +368,7 @@ def plotLRTIC(msData, sampleMask=None, colourByDetectorVoltage=False, title='',
 	
 	# Plot TIC for LR samples coloured by sample dilution
 	tic = numpy.sum(msData.intensityData, axis=1)
-	LRmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference) & (sampleMask)
+	LRmask = msData.sampleClassMasks['LR'] & (sampleMask)
 	tic = tic[LRmask]
 	runIX = numpy.argsort(msData.sampleMetadata['Run Order'][LRmask].values)
 	runIX = numpy.argsort(runIX)
@@ -455,7 +455,7 @@ def plotCorrelationToLRbyFeature(msData, featureMask=None, title='', maxNo=5, sa
 			featureList = numpy.random.permutation(featureList)[:maxNo]
 
 	# Define sample mask and run order
-	LRmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
+	LRmask = msData.sampleClassMasks['LR']
 	runIX = numpy.argsort(msData.sampleMetadata['Run Order'][LRmask].values)
 	runIX = numpy.argsort(runIX)
 	
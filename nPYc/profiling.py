@@ -0,0 +1,202 @@
+"""
+The :py:mod:`~nPYc.profiling` module records where time is spent in the main entry points of the toolbox: dataset loaders, :py:meth:`~nPYc.objects.Dataset.updateMasks`, :py:meth:`~nPYc.objects.Dataset.applyMasks`, :py:func:`~nPYc.batchAndROCorrection.correctMSdataset`, :py:func:`~nPYc.reports.generateReport` and each of the :py:mod:`~nPYc.plotting` functions.
+
+Profiling is off by default, and when off instrumented functions are called straight through. Once enabled, each call records its wall time, CPU time and, optionally, the peak memory it allocated:
+
+.. code-block:: python
+
+	with nPYc.profiling.profile(allocations=True):
+		msData.updateMasks()
+		nPYc.reports.generateReport(msData, 'feature summary')
+
+	print(nPYc.profiling.summary())
+
+Times of nested calls are included in those of the calls enclosing them. Allocations are traced with :py:mod:`tracemalloc`, which slows code down several times, so are only recorded when requested. Calls are recorded from the main thread only.
+"""
+import contextlib
+import functools
+import threading
+import time
+import tracemalloc
+import pandas
+
+
+_enabled = False
+_traceAllocations = False
+_startedTracing = False
+
+# Name: [calls, wall time, CPU time, maximum wall time, peak allocated]
+_records = dict()
+
+# Peak traced memory of each call in progress, see _enterFrame
+_frames = list()
+
+
+def isEnabled():
+	"""
+	:return: ``True`` if calls are being recorded
+	:rtype: bool
+	"""
+	return _enabled
+
+
+def enable(allocations=False):
+	"""
+	Start recording calls to instrumented functions.
+
+	:param bool allocations: If ``True`` also record the peak memory allocated by each call, starting :py:mod:`tracemalloc` if it is not already tracing
+	"""
+	global _enabled, _traceAllocations, _startedTracing
+
+	_enabled = True
+	_traceAllocations = allocations
+	if allocations and not tracemalloc.is_tracing():
+		tracemalloc.start()
+		_startedTracing = True
+
+
+def disable():
+	"""
+	Stop recording calls, keeping those recorded so far, and stop :py:mod:`tracemalloc` if started by :py:func:`enable`.
+	"""
+	global _enabled, _traceAllocations, _startedTracing
+
+	_enabled = False
+	_traceAllocations = False
+	if _startedTracing:
+		tracemalloc.stop()
+		_startedTracing = False
+
+
+def reset():
+	"""
+	Discard the calls recorded so far.
+	"""
+	_records.clear()
+
+
+@contextlib.contextmanager
+def profile(allocations=False):
+	"""
+	Context manager recording calls to instrumented functions made within it, see :py:func:`enable`.
+
+	:param bool allocations: If ``True`` also record the peak memory allocated by each call, stopping :py:mod:`tracemalloc` on exit if started here
+	"""
+	global _startedTracing
+
+	state = (_enabled, _traceAllocations)
+	wasTracing = tracemalloc.is_tracing()
+	enable(allocations=allocations or _traceAllocations)
+	try:
+		yield
+	finally:
+		if state[0]:
+			enable(allocations=state[1])
+		else:
+			disable()
+		if (not wasTracing) and tracemalloc.is_tracing():
+			tracemalloc.stop()
+			_startedTracing = False
+
+
+def summary(path=None):
+	"""
+	Tabulate the calls recorded, slowest first.
+
+	:param path: If not ``None``, also save the table as a CSV file to *path*
+	:type path: None or str
+	:return: Table indexed by function, with the number of calls, the total, mean and maximum wall time and total CPU time in seconds, and the peak memory allocated in bytes (``NaN`` if not traced)
+	:rtype: pandas.DataFrame
+	"""
+	table = pandas.DataFrame([[name, calls, wall, wall / calls, maxWall, cpu, peak] for (name, (calls, wall, cpu, maxWall, peak)) in _records.items()],
+							 columns=['Function', 'Calls', 'Wall Time', 'Mean Wall Time', 'Max Wall Time', 'CPU Time', 'Peak Allocated'])
+	table = table.sort_values('Wall Time', ascending=False).set_index('Function')
+
+	if path is not None:
+		table.to_csv(path)
+
+	return table
+
+
+def _enterFrame():
+	"""
+	Start measuring the peak memory traced during a call, without losing the peak of the calls enclosing it.
+
+	:py:func:`tracemalloc.reset_peak` needs Python 3.9, before which the peak traced when entering is kept in the frame to compare with on exit.
+	"""
+	(current, peak) = tracemalloc.get_traced_memory()
+	if hasattr(tracemalloc, 'reset_peak'):
+		if _frames:
+			_frames[-1][1] = max(_frames[-1][1], peak)
+		tracemalloc.reset_peak()
+		frame = [current, 0, None]
+	else:
+		frame = [current, 0, peak]
+	_frames.append(frame)
+
+	return frame
+
+
+def _exitFrame(frame):
+	"""
+	:return: Peak memory traced since *frame* was entered, above that traced when it was entered
+	:rtype: int
+	"""
+	(current, peak) = tracemalloc.get_traced_memory()
+	# Without reset_peak, a peak no higher than that on entry was not reached during the call, which then allocated at least the memory traced now
+	if (frame[2] is not None) and (peak <= frame[2]):
+		peak = current
+	peak = max(frame[1], peak)
+	if frame in _frames:
+		del _frames[_frames.index(frame):]
+	if _frames:
+		_frames[-1][1] = max(_frames[-1][1], peak)
+
+	return peak - frame[0]
+
+
+def _record(name, function, args, kwargs):
+
+	frame = _enterFrame() if (_traceAllocations and tracemalloc.is_tracing()) else None
+	wallStart = time.perf_counter()
+	cpuStart = time.process_time()
+
+	try:
+		return function(*args, **kwargs)
+	finally:
+		wall = time.perf_counter() - wallStart
+		cpu = time.process_time() - cpuStart
+		peak = _exitFrame(frame) if frame is not None else float('nan')
+
+		record = _records.get(name)
+		if record is None:
+			_records[name] = [1, wall, cpu, wall, peak]
+		else:
+			record[0] += 1
+			record[1] += wall
+			record[2] += cpu
+			record[3] = max(record[3], wall)
+			record[4] = peak if record[4] != record[4] else max(record[4], peak)
+
+
+def profiled(function=None, name=None):
+	"""
+	Decorate *function* so calls to it are recorded while profiling is enabled.
+
+	:param function: Function to instrument
+	:param name: Name to record calls under, if ``None`` the qualified name of *function*
+	:type name: None or str
+	"""
+	if function is None:
+		return functools.partial(profiled, name=name)
+
+	if name is None:
+		name = function.__qualname__
+
+	@functools.wraps(function)
+	def wrapper(*args, **kwargs):
+		if not _enabled or (threading.current_thread() is not threading.main_thread()):
+			return function(*args, **kwargs)
+		return _record(name, function, args, kwargs)
+
+	return wrapper
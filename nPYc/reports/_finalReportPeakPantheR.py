@@ -19,7 +19,7 @@ from ._generateSampleReport import _generateSampleReport
 from ..utilities import generateLRmask, rsd
 from ..utilities._internal import _vcorrcoef
 from ..utilities._internal import _copyBackingFiles as copyBackingFiles
-from ..enumerations import AssayRole, SampleType
+from ..enumerations import SampleType
 import operator
 
 
@@ -83,14 +83,11 @@ def _finalReportPeakPantheR(dataset, destinationPath=None):
         figureSize=dataset.Attributes['figureSize']
 
 	# Define sample masks
-    SSmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudySample) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-    SPmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudyPool) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-    ERmask = (dataset.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-    LRmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudyPool) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
+    sampleClassMasks = dataset.sampleClassMasks
+    SSmask = sampleClassMasks['SS']
+    SPmask = sampleClassMasks['SP']
+    ERmask = sampleClassMasks['ER']
+    LRmask = sampleClassMasks['LR']
 
     # Set up template item and save required info
     item = dict()
@@ -1,5 +1,4 @@
 import os
-import copy
 
 from ..plotting import plotFeatureRanges
 
@@ -44,7 +43,7 @@ def generateFeatureDistributionReport(dataset, reportingGroups, logScale=False,
 		os.makedirs(os.path.join(destinationPath, 'graphics'))
 
 	if filterUnits:
-		dataset = copy.deepcopy(dataset)
+		dataset = dataset.clone()
 
 		unitMask = dataset.featureMetadata['Unit'].values == filterUnits
 
@@ -16,7 +16,7 @@ from ..objects import MSDataset
 from pyChemometrics.ChemometricsPCA import ChemometricsPCA
 from ..plotting import plotTIC, histogram, plotLRTIC, jointplotRSDvCorrelation, plotRSDs, plotIonMap, plotBatchAndROCorrection, plotScores, plotLoadings, plotTargetedFeatureDistribution
 from ._generateSampleReport import _generateSampleReport
-from ..utilities import generateLRmask, rsd
+from ..utilities import generateLRmask
 from ..utilities._internal import _vcorrcoef
 from ..utilities._internal import _copyBackingFiles as copyBackingFiles
 from ..enumerations import AssayRole, SampleType
@@ -107,7 +107,7 @@ def _generateReportMS(dataset, reportType, withExclusions=False, withArtifactual
             os.makedirs(os.path.join(destinationPath, 'graphics'))
 
     # Apply sample/feature masks if exclusions to be applied
-    msData = copy.deepcopy(dataset)
+    msData = dataset.clone()
     if withExclusions:
         msData.applyMasks()
 
@@ -790,13 +790,11 @@ def _featureSelectionReport(dataset, destinationPath=None, withArtifactualFilter
     """
 
     # Define sample masks
-    SSmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudySample) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-    SRmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudyPool) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-    SRDmask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudyPool) & \
-             (dataset.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
-    Blankmask = dataset.sampleMetadata['SampleType'] == SampleType.ProceduralBlank
+    sampleClassMasks = dataset.sampleClassMasks
+    SSmask = sampleClassMasks['SS']
+    SRmask = sampleClassMasks['SP']
+    SRDmask = sampleClassMasks['LR']
+    Blankmask = sampleClassMasks['Blank']
 
     # Define passmask as current featureMask
     passMask = dataset.featureMask
@@ -838,7 +836,7 @@ def _featureSelectionReport(dataset, destinationPath=None, withArtifactualFilter
     # RSD in SR samples, and RSD in SS samples > RSD in SR samples
     item['rsdThreshold'] = dataset.Attributes['filterParameters']['rsdThreshold'] if dataset.Attributes['filterParameters']['rsdThreshold'] is not None else dataset.Attributes['rsdThreshold']
     item['rsdSPvsSSvarianceRatio'] = dataset.Attributes['filterParameters']['varianceRatio'] if dataset.Attributes['filterParameters']['varianceRatio'] is not None else dataset.Attributes['varianceRatio']
-    rsdSS = rsd(dataset.intensityData[SSmask, :])
+    rsdSS = dataset.qcStatistics({'SS': SSmask}, statistics=('rsd',))['SS', 'rsd']
 
     if sum(SRmask) > 0:
         item['rsdPassed'] = str(sum(dataset.rsdSP <= item['rsdThreshold'])) + ' passed selection.'
@@ -1734,13 +1732,13 @@ def batchCorrectionTest(dataset, nFeatures=10, window=11):
             break
 
     # Create copy of dataset and trim
-    preData = copy.deepcopy(dataset)
+    preData = dataset.clone()
     preData.intensityData = dataset.intensityData[:, featureList]
     preData.featureMetadata = dataset.featureMetadata.loc[featureList, :]
     preData.featureMetadata.reset_index(drop=True, inplace=True)
 
     # Run batch correction
-    postData = copy.deepcopy(preData)
+    postData = preData.clone()
     postData.intensityData = correctedData
     postData.fit = fits
 
@@ -2,7 +2,6 @@ import os
 import numpy
 import pandas
 import nPYc
-import copy
 import pandas
 import re
 import warnings
@@ -62,7 +61,7 @@ def _generateReportNMR(nmrData, reportType, withExclusions=True, destinationPath
 			os.makedirs(os.path.join(destinationPath, 'graphics'))
 
 	# Apply sample/feature masks if exclusions to be applied
-	nmrData = copy.deepcopy(nmrData)
+	nmrData = nmrData.clone()
 	if withExclusions:
 		nmrData.applyMasks()
 
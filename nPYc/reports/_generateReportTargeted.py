@@ -5,7 +5,6 @@ import pandas
 from collections import OrderedDict
 import matplotlib.pyplot as plt
 import seaborn as sns
-import copy
 from matplotlib import gridspec
 from .._toolboxPath import toolboxPath
 from ..objects import TargetedDataset
@@ -14,7 +13,7 @@ from ..plotting import plotFeatureLOQ, plotLOQRunOrder, plotAccuracyPrecision, p
 	plotScores, plotLoadings, plotTargetedFeatureDistribution
 from ._generateSampleReport import _generateSampleReport
 from ..reports._finalReportPeakPantheR import _plotAbundanceBySampleType
-from ..utilities import generateLRmask, rsd
+from ..utilities import generateLRmask
 from ..utilities._internal import _copyBackingFiles as copyBackingFiles
 from ..enumerations import AssayRole, SampleType, CalibrationMethod, QuantificationType, AnalyticalPlatform
 from pyChemometrics.ChemometricsPCA import ChemometricsPCA
@@ -58,7 +57,7 @@ def _generateReportTargeted(tDataIn, reportType, withExclusions=False, destinati
 
 	# Check inputs
 	# Dataset minimum requirement
-	tmpTData = copy.deepcopy(tDataIn)  # to not log validateObject
+	tmpTData = tDataIn.clone()  # to not log validateObject
 	validDataset = tmpTData.validateObject(verbose=False, raiseError=False, raiseWarning=False)
 	if not validDataset['BasicTargetedDataset']:
 		raise ValueError('Import Error: tData does not satisfy to the BasicTargetedDataset definition')
@@ -87,16 +86,17 @@ def _generateReportTargeted(tDataIn, reportType, withExclusions=False, destinati
 
 	sns.set_style("whitegrid")
 
-	tData = copy.deepcopy(tDataIn)
+	tData = tDataIn.clone()
 	if withExclusions:
 		tData.applyMasks()
 
 	# Prepare the item object
 	# Define sample masks
-	SSmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (tData.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-	SPmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	ERmask = (tData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	LRmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (tData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
+	sampleClassMasks = tData.sampleClassMasks
+	SSmask = sampleClassMasks['SS']
+	SPmask = sampleClassMasks['SP']
+	ERmask = sampleClassMasks['ER']
+	LRmask = sampleClassMasks['LR']
 	[ns, nv] = tData.intensityData.shape
 
 	# The quantificationTypes present (force the ordering)
@@ -291,7 +291,7 @@ def _featureReport(tData, item, destinationPath, numberPlotPerRowLOQ=3,
 	for i in range(0, item['nQType']):
 
 		# Subset only the features of interest
-		tmpData = copy.deepcopy(tData)
+		tmpData = tData.clone()
 		tmpData.updateMasks(filterSamples=False, filterFeatures=True, quantificationTypes=[item['QType'][i]])
 		tmpData.applyMasks()
 
@@ -633,7 +633,7 @@ def _finalReportMS(tData, item, destinationPath, pcaModel=None, withAccPrec=True
 	for i in range(0, item['nQType']):
 
 		# Subset only the features of interest
-		tmpData = copy.deepcopy(tData)
+		tmpData = tData.clone()
 		tmpData.featureMetadata = featureSummaryTable
 		tmpData.updateMasks(filterSamples=False, filterFeatures=True, quantificationTypes=[item['QType'][i]])
 		tmpData.applyMasks()
@@ -749,15 +749,12 @@ def _finalReportMS(tData, item, destinationPath, pcaModel=None, withAccPrec=True
 	## Figure 5 and 6: (if available) PCA scores and loadings plots by sample type
 	if pcaModel is not None:
 		# Get sample types
-		SSmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (
-					tData.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-		SPmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (
-					tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-		ERmask = (tData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (
-					tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
+		sampleClassMasks = tData.sampleClassMasks
+		SSmask = sampleClassMasks['SS']
+		SPmask = sampleClassMasks['SP']
+		ERmask = sampleClassMasks['ER']
 		# Linearity references not commonly used, but left here throughout.
-		LRmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (
-					tData.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
+		LRmask = sampleClassMasks['LR']
 
 		tData.sampleMetadata.loc[~SSmask & ~SPmask & ~ERmask, 'Plot Sample Type'] = 'Sample'
 		tData.sampleMetadata.loc[SSmask, 'Plot Sample Type'] = 'Study Sample'
@@ -834,12 +831,10 @@ def _finalReportNMR(tData, item, destinationPath, pcaModel=None, withAccPrec=Tru
 		graphicsPath = None
 
 	# Define sample masks
-	SSmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & \
-			 (tData.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-	SPmask = (tData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & \
-			 (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	ERmask = (tData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & \
-			 (tData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
+	sampleClassMasks = tData.sampleClassMasks
+	SSmask = sampleClassMasks['SS']
+	SPmask = sampleClassMasks['SP']
+	ERmask = sampleClassMasks['ER']
 
 	# Modify the required fields in item
 	item['NfeaturesPassing'] = numpy.where(tData.featureMetadata['Passing Selection'])[0].shape[0]
@@ -1087,7 +1082,7 @@ def _postMergeLOQDataset(tData):
 	:param TargetedDataset tData: :py:class:`TargetedDataset` concatenated using :py:meth:`__add__` but without merged LOQ.
 	"""
 	# Prepare a targetedDataset with mergeLOQ
-	mergedLOQData = copy.deepcopy(tData)
+	mergedLOQData = tData.clone()
 	# silence text destinationPath
 	old_stdout = sys.stdout
 	sys.stdout = StringIO()
@@ -1095,7 +1090,7 @@ def _postMergeLOQDataset(tData):
 	sys.stdout = old_stdout
 
 	# copy merged LOQ in pre-merge dataset
-	outDataset = copy.deepcopy(tData)
+	outDataset = tData.clone()
 	outDataset.featureMetadata['LLOQ'] = mergedLOQData.featureMetadata['LLOQ']
 	outDataset.featureMetadata['ULOQ'] = mergedLOQData.featureMetadata['ULOQ']
 
@@ -1316,24 +1311,28 @@ def _getRSDTable(tData):
 	precRefMask = numpy.logical_and(precRefMask, tData.sampleMask)
 	sTypes = list(set(tData.sampleMetadata.loc[precRefMask, 'SampleType'].values))
 
-	rsdVal[SampleType.StudyPool] = tData.rsdSP
 	ssMask = (tData.sampleMetadata['SampleType'].values == SampleType.StudySample) & tData.sampleMask
-	rsdVal[SampleType.StudySample] = rsd(tData.intensityData[ssMask, :])
+	classMasks = {'SS': ssMask}
+	for sType in sTypes:
+		# precRefMask limits to Precision Reference and tData.sampleMask
+		sTypeMask = numpy.logical_and(tData.sampleMetadata.loc[:, 'SampleType'].values == sType, precRefMask)
+		# minimum 3 points needed
+		if sum(sTypeMask) >= 3:
+			classMasks[sType] = sTypeMask
+	# RSDs of all classes in one pass over the data
+	statistics = tData.qcStatistics(classMasks, statistics=('rsd',))
+
+	rsdVal[SampleType.StudyPool] = tData.rsdSP
+	rsdVal[SampleType.StudySample] = statistics['SS', 'rsd']
 
 	# Only keep features with finite values for SP and SS
 	finiteMask = (rsdVal[SampleType.StudyPool] < numpy.finfo(numpy.float64).max) & tData.featureMask
 	finiteMask = finiteMask & (rsdVal[SampleType.StudySample] < numpy.finfo(numpy.float64).max)
 
 	for sType in sTypes:
-		if not sTypes == SampleType.StudyPool:
-			sTypeMask = tData.sampleMetadata.loc[:, 'SampleType'].values == sType
-			# precRefMask limits to Precision Reference and tData.sampleMask
-			sTypeMask = numpy.logical_and(sTypeMask, precRefMask)
-
-			# minimum 3 points needed
-			if sum(sTypeMask) >= 3:
-				rsdVal[sType] = rsd(tData.intensityData[sTypeMask, :])
-				finiteMask = finiteMask & (rsdVal[sType] < numpy.finfo(numpy.float64).max)
+		if sType in classMasks:
+			rsdVal[sType] = statistics[sType, 'rsd']
+			finiteMask = finiteMask & (rsdVal[sType] < numpy.finfo(numpy.float64).max)
 
 	# apply ginite mask
 	for sType in rsdVal.keys():
@@ -41,7 +41,7 @@ def _generateSampleReport(dataTrue, withExclusions=False, destinationPath=None,
 	# Create directory to save destinationPath	 # for now do nothing as sampleReport requires no files
 
 	# Apply sample/feature masks if exclusions to be applied
-	data = copy.deepcopy(dataTrue)
+	data = dataTrue.clone()
 	if withExclusions:
 		data.applyMasks()
 
@@ -55,11 +55,12 @@ def _generateSampleReport(dataTrue, withExclusions=False, destinationPath=None,
 
 	# Sample type masks
 	try:
-		SSmask = (data.sampleMetadata['SampleType'] == SampleType.StudySample) & (data.sampleMetadata['AssayRole'] == AssayRole.Assay)
-		SPmask = (data.sampleMetadata['SampleType'] == SampleType.StudyPool) & (data.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
-		ERmask = (data.sampleMetadata['SampleType'] == SampleType.ExternalReference) & (data.sampleMetadata['AssayRole'] == AssayRole.PrecisionReference)
-		SRDmask = (data.sampleMetadata['AssayRole'] == AssayRole.LinearityReference) & (data.sampleMetadata['SampleType'] == SampleType.StudyPool)
-		Blankmask = data.sampleMetadata['SampleType'] == SampleType.ProceduralBlank
+		sampleClassMasks = data.sampleClassMasks
+		SSmask = sampleClassMasks['SS']
+		SPmask = sampleClassMasks['SP']
+		ERmask = sampleClassMasks['ER']
+		SRDmask = sampleClassMasks['LR']
+		Blankmask = sampleClassMasks['Blank']
 
 	except:
 		SSmask = numpy.zeros(len(data.sampleMask)).astype(bool)
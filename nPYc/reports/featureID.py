@@ -4,7 +4,6 @@ import os
 import sys
 import sqlite3
 import types
-import copy
 import pandas
 import logging
 from .._toolboxPath import toolboxPath
@@ -53,17 +52,18 @@ def generateMSIDrequests(msData, features, outputDir='', rawData=None, database=
 
 	# Prepare the data objects - exclude all samples that are not SS, SP or ER	
 	sampleMask = numpy.zeros(msData.sampleMask.shape).astype(bool)
-	SSmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudySample) & (msData.sampleMetadata['AssayRole'].values == AssayRole.Assay)
-	SPmask = (msData.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
-	ERmask = (msData.sampleMetadata['SampleType'].values == SampleType.ExternalReference) & (msData.sampleMetadata['AssayRole'].values == AssayRole.PrecisionReference)
+	sampleClassMasks = msData.sampleClassMasks
+	SSmask = sampleClassMasks['SS']
+	SPmask = sampleClassMasks['SP']
+	ERmask = sampleClassMasks['ER']
 	sampleMask[SSmask|SPmask|ERmask] = True
 	
-	postData = copy.deepcopy(msData)
+	postData = msData.clone()
 	postData.sampleMask = sampleMask
 	postData.applyMasks()
 	
 	if msDataPrecorrection is not None:
-		preData = copy.deepcopy(msDataPrecorrection)
+		preData = msDataPrecorrection.clone()
 		preData.sampleMask = sampleMask
 		preData.applyMasks()
 	else:
@@ -177,7 +177,7 @@ def _msIDreport(msData, feature, outputDir='', rawData=None, dbConnection=None,
 	item['AbundanceSamples'] = []
 	ix=1
 	for index in maxIndex:
-		a_sample = dict(rank=ix, id=msData.sampleMetadata['Sample File Name'].iloc[index], value=msData.intensityData.item(index, featureNo))
+		a_sample = dict(rank=ix, id=msData.sampleMetadata['Sample File Name'].iloc[index], value=msData.intensityData[index, featureNo].item())
 		item['AbundanceSamples'].append(a_sample)
 		ix=ix+1
 
@@ -4,7 +4,9 @@ from ..reports._generateReportMS import _generateReportMS # , _generateReportNMR
 from ..reports._generateSampleReport import _generateSampleReport
 from ..reports._generateReportNMR import _generateReportNMR
 from ..reports._generateReportTargeted import _generateReportTargeted
+from ..profiling import profiled
 
+@profiled
 def generateReport(data, reportType, destinationPath=None, **kwargs):
 	"""
 	Generates one of a range of reports visualising different qualities of the dataset. Reports can be plotted interactively, or saved to disk.
@@ -15,9 +15,10 @@ from .._toolboxPath import toolboxPath
 from ..objects import Dataset
 from pyChemometrics.ChemometricsPCA import ChemometricsPCA
 from ..multivariate.multivariateUtilities import pcaSignificance, metadataTypeGrouping
-from ..plotting._multivariatePlotting import plotMetadataDistribution, plotScree, plotScores, plotLoadings, plotOutliers
+from ..plotting import plotMetadataDistribution, plotScree, plotScores, plotLoadings, plotOutliers
 from ..utilities._internal import _copyBackingFiles as copyBackingFiles
 from ..enumerations import AssayRole, SampleType
+from ..profiling import profiled
 import re
 import numbers
 import shutil
@@ -26,6 +27,7 @@ from warnings import warn
 
 from ..__init__ import __version__ as version
 
+@profiled
 def multivariateReport(dataTrue, pcaModel, reportType='analytical', withExclusions=False, biologicalMeasurements=None, dModX_criticalVal=None, dModX_criticalVal_type=None, scores_criticalVal=None, kw_threshold=0.05, r_threshold=0.3, hotellings_alpha=0.05, excludeFields=None, destinationPath=None):
 	"""
 	PCA based analysis of a dataset. A PCA model is generated for the data object, then potential associations between the scores and any sample metadata determined by correlation (continuous data) or a Kruskal-Wallis test (categorical data).
@@ -128,10 +130,10 @@ def multivariateReport(dataTrue, pcaModel, reportType='analytical', withExclusio
 		saveAs = None
 
 	# Filter dataset if required
-	data = copy.deepcopy(dataTrue)
-
 	if withExclusions:
-		data.applyMasks()
+		data = dataTrue.view()
+	else:
+		data = dataTrue.view(sampleMask=numpy.ones(dataTrue.noSamples, dtype=bool), featureMask=numpy.ones(dataTrue.noFeatures, dtype=bool))
 
 	if hasattr(pcaModel, '_npyc_dataset_shape'):
 		if pcaModel._npyc_dataset_shape['NumberSamples'] != data.intensityData.shape[0] \
@@ -8,7 +8,8 @@ from .extractParams import extractParams, buildFileList
 from .normalisation import *
 from ._buildSpectrumFromQIfeature import buildMassSpectrumFromQIfeature
 from ._massSpectrumBuilder import massSpectrumBuilder
+from ._qcStatistics import QCStatistics
 
 
 __all__ = ['rsd', 'normalisation', 'buildFileList', 'buildMassSpectrumFromQIfeature',
-           'massSpectrumBuilder', 'sequentialPrecision', 'rsdsBySampleType']
+           'massSpectrumBuilder', 'sequentialPrecision', 'rsdsBySampleType', 'QCStatistics']
@@ -35,12 +35,14 @@ def blankFilter(dataset, threshold=None):
 		sampleMask = numpy.logical_and(dataset.sampleMetadata['AssayRole'].values == AssayRole.Assay,
 							 dataset.sampleMetadata['SampleType'].values == SampleType.StudySample)
 
+		statistics = dataset.qcStatistics({'Blank': blanksMask, 'SS': sampleMask})
+
 		if sum(blanksMask) > 1:
-			p95 = numpy.percentile(dataset.intensityData[blanksMask, :], 95, axis=0)
+			p95 = statistics['Blank', 'p95']
 		else:
 			p95 = dataset.intensityData[blanksMask, :]
 
-		mask = numpy.mean(dataset.intensityData[sampleMask,:], axis=0) >= (p95 * threshold)
+		mask = statistics['SS', 'mean'] >= (p95 * threshold)
 
 		return mask, p95
 	else:
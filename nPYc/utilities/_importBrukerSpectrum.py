@@ -9,7 +9,7 @@ from ..utilities._fitPeak import integrateResonance
 from ..utilities._nmr import interpolateSpectrum
 from ..utilities import extractParams
 
-def importBrukerSpectra(path, pulseProgram, pdata, Attributes):
+def importBrukerSpectra(path, pulseProgram, pdata, Attributes, allocate=numpy.zeros):
 	"""
 	Load processed Bruker spectra found under *path*, with a pulse program that matches *pulseProgram*.
 
@@ -31,6 +31,7 @@ def importBrukerSpectra(path, pulseProgram, pdata, Attributes):
 	:param str pulseProgram: Only load spectra acquired with a matching pulse program
 	:param int pdata: Load processed data fromt the specified pdata
 	:param dict Attributes: Dictionary of configuration parameters
+	:param allocate: Callable returning a zero-filled matrix of the shape passed, into which spectra are interpolated
 	:returns: Tuple of (spectra, ppm, metadata)
 	:rtype: (numpy.array, numpy.array, pandas.DataFrame)
 	"""
@@ -49,7 +50,7 @@ def importBrukerSpectra(path, pulseProgram, pdata, Attributes):
 	if metadata.shape[0] == 0:
 		raise ValueError("No Bruker format spectra acquired with the '%s' pulse program found." % (pulseProgram))
 
-	intensityData = numpy.zeros((metadata.shape[0], Attributes['variableSize']))
+	intensityData = allocate((metadata.shape[0], Attributes['variableSize']))
 	skipERETIC = False
 
 	metadata['Delta PPM'] = numpy.nan
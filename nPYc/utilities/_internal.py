@@ -1,5 +1,17 @@
 import os
 
+# Bytes of data loaded per block of features by _applyToFeatureBlocks
+_featureBlockBytes = 2 ** 25
+
+# Number of threads _applyToFeatureBlocks processes blocks on, if None, one per CPU
+_featureBlockThreads = None
+
+# Bytes of data formatted per block of rows by _writeCSVBlocks
+_csvBlockBytes = 2 ** 22
+
+# Number of threads _writeCSVBlocks formats blocks on, if None, one per CPU
+_csvThreads = None
+
 def _copyBackingFiles(toolboxPath, output):
 	"""
 	Copy templates files to the 'graphics' sub-directory of the output directory when needed.
@@ -11,12 +23,142 @@ def _copyBackingFiles(toolboxPath, output):
 	shutil.copy(os.path.join(toolboxPath, 'Templates', 'toolbox_logo.png'), os.path.join(output, 'toolbox_logo.png'))
 
 
+def _applyToFeatureBlocks(func, X, sampleMask=None, featureMask=None):
+	"""
+	Apply *func* to successive blocks of columns of *X*, and concatenate the vectors of column statistics returned along their last axis.
+
+	Each block is passed to *func* as a regular :py:class:`numpy.ndarray` holding the rows in *sampleMask* and at most :py:data:`_featureBlockBytes` of data, so memory used is bounded whatever the size of *X*, and memmapped or lazily normalised matrices are only read one block at a time. Where there is more than one block, blocks are processed on a pool of :py:data:`_featureBlockThreads` threads, as numpy releases the GIL.
+
+	:param callable func: Function mapping an *n* by *k* matrix to a *k* vector, or to a stack of *k* vectors
+	:param X: *n* by *m* matrix, or matrix-like object supporting numpy indexing
+	:param sampleMask: If ``None`` use all rows of *X*, otherwise use *sampleMask* as a boolean mask
+	:type sampleMask: None or numpy.ndarray of bool
+	:param featureMask: If ``None`` use all columns of *X*, otherwise use *featureMask* as a boolean mask
+	:type featureMask: None or numpy.ndarray of bool
+	:return: Vector of the statistics calculated for each column selected
+	:rtype: numpy.ndarray
+	"""
+	import numpy
+	from concurrent.futures import ThreadPoolExecutor
+
+	if getattr(X, 'ndim', None) != 2:
+		X = numpy.asarray(X)
+		if sampleMask is not None:
+			X = X[sampleMask]
+		if featureMask is not None:
+			X = X[:, featureMask]
+		return func(X)
+
+	if sampleMask is None:
+		rows = None
+		noRows = X.shape[0]
+	else:
+		rows = numpy.flatnonzero(sampleMask)
+		noRows = len(rows)
+
+	if featureMask is None:
+		columns = numpy.arange(X.shape[1])
+	else:
+		columns = numpy.flatnonzero(featureMask)
+
+	step = max(1, _featureBlockBytes // max(1, noRows * X.dtype.itemsize))
+	blocks = [columns[start:start + step] for start in range(0, len(columns), step)] or [columns]
+
+	def applyToBlock(block):
+		if featureMask is None:
+			# Contiguous columns, sliced as a view where possible
+			block = slice(block[0], block[-1] + 1) if len(block) else slice(0, 0)
+
+		if rows is None:
+			data = X[:, block]
+		elif featureMask is None:
+			data = X[rows, block]
+		else:
+			data = X[numpy.ix_(rows, block)]
+
+		return func(numpy.asarray(data))
+
+	threads = _featureBlockThreads or os.cpu_count() or 1
+	if (len(blocks) == 1) or (threads == 1):
+		results = [applyToBlock(block) for block in blocks]
+	else:
+		with ThreadPoolExecutor(max_workers=min(threads, len(blocks))) as pool:
+			results = list(pool.map(applyToBlock, blocks))
+
+	return numpy.concatenate(results, axis=-1)
+
+
+def _formatCSVRows(X, naRep='nan', infRep=('inf', '-inf'), lineTerminator='\n'):
+	"""
+	Format the rows of the matrix *X* as lines of comma separated values, with floats written at the shortest precision that reads back exactly.
+
+	:param numpy.ndarray X: *n* by *m* matrix
+	:param str naRep: String to write for ``NaN`` values
+	:param infRep: Strings to write for positive and negative infinity
+	:type infRep: (str, str)
+	:param str lineTerminator: String ending each line
+	:return: List of *n* lines, without the terminator if *lineTerminator* is ``None``
+	:rtype: list
+	"""
+	import numpy
+
+	X = numpy.asarray(X)
+	rows = X.tolist()
+
+	if (X.dtype.kind == 'f') and ((naRep, infRep) != ('nan', ('inf', '-inf'))) and not numpy.all(numpy.isfinite(X)):
+		replacements = {'nan': naRep, 'inf': infRep[0], '-inf': infRep[1]}
+		lines = [','.join([replacements.get(value, value) for value in map(repr, row)]) for row in rows]
+	else:
+		lines = [','.join(map(repr, row)) for row in rows]
+
+	if lineTerminator is not None:
+		lines = [line + lineTerminator for line in lines]
+
+	return lines
+
+
+def _writeCSVBlocks(file, formatBlock, noRows, rowBytes):
+	"""
+	Write the text returned by *formatBlock(start, stop)* for successive blocks of rows to *file*, without holding more than a few blocks in memory.
+
+	Blocks hold about :py:data:`_csvBlockBytes` of data, and are formatted on a pool of :py:data:`_csvThreads` threads while earlier blocks are written.
+
+	:param file: Open text file to write to
+	:param callable formatBlock: Function returning the text of rows *start* to *stop*
+	:param int noRows: Number of rows to write
+	:param int rowBytes: Approximate size of the data in one row
+	"""
+	from concurrent.futures import ThreadPoolExecutor
+	from collections import deque
+
+	step = max(1, _csvBlockBytes // max(1, rowBytes))
+	starts = range(0, noRows, step)
+
+	threads = _csvThreads or os.cpu_count() or 1
+	if (len(starts) <= 1) or (threads == 1):
+		for start in starts:
+			file.write(formatBlock(start, min(start + step, noRows)))
+		return
+
+	with ThreadPoolExecutor(max_workers=threads) as pool:
+		pending = deque()
+		for start in starts:
+			pending.append(pool.submit(formatBlock, start, min(start + step, noRows)))
+			# Bound the blocks formatted ahead of the writer
+			if len(pending) > 2 * threads:
+				file.write(pending.popleft().result())
+		while pending:
+			file.write(pending.popleft().result())
+
+
 def _vcorrcoef(X, Y, method='pearson', sampleMask=None, featureMask=None):
 	"""
 	Calculate correlation between each column in *X* and the vector *Y*. Correlations may be calculated either as Pearson's *r* [#]_ or Spearman's rho [#]_ .
 	
 	[#] Karl Pearson (20 June 1895) "Notes on regression and inheritance in the case of two parents," *Proceedings of the Royal Society of London*, 58 : 240–242.
 	[#] Myers, Jerome L.; Well, Arnold D. (2003). *Research Design and Statistical Analysis (2nd ed.)*. Lawrence Erlbaum. p. 508. ISBN 0-8058-4037-0.
+
+	Correlations are calculated in blocks of features with :py:func:`_applyToFeatureBlocks`.
 	
 	:param numpy.ndarray X: 
 	:param numpy.ndarray Y:
@@ -27,34 +169,31 @@ def _vcorrcoef(X, Y, method='pearson', sampleMask=None, featureMask=None):
 	:type featureMask: None or numpy.ndarray of bool
 	"""
 	import numpy
-	import scipy
+	from scipy.stats import rankdata
 
-	if sampleMask is None:
-		pass
-	else:
+	Y = numpy.asarray(Y)
+	if sampleMask is not None:
 		Y = Y[sampleMask]
-		X = X[sampleMask,:]
-
-	if featureMask is None:
-		pass
-	else:
-		X = X[:,featureMask]
 
 	if method == 'spearman':
-		rankedMat = numpy.zeros_like(X)
-		for col in range(X.shape[1]):
-			rankedMat[:, col] = scipy.stats.rankdata(X[:,col])
-		X = rankedMat
-		Y = scipy.stats.rankdata(Y)
-
-	X = X.T
+		Y = rankdata(Y)
 
 	# From https://waterprogramming.wordpress.com/2014/06/13/numpy-vectorized-correlation-coefficient/
-	Xm = numpy.reshape(numpy.mean(X,axis=1),(X.shape[0],1))
-	ym = numpy.mean(Y)
-	r_num = numpy.sum((X-Xm)*(Y-ym),axis=1)
-	r_den = numpy.sqrt(numpy.sum(numpy.power((X-Xm), 2),axis=1)*numpy.sum(numpy.power((Y-ym), 2)))
-	r = r_num/r_den
+	Yc = numpy.reshape(Y - numpy.mean(Y), (len(Y), 1))
+	ySumOfSquares = numpy.sum(numpy.power(Yc, 2))
+
+	def correlate(X):
+		if method == 'spearman' and X.shape[1]:
+			# rankdata only takes axis= from scipy 1.4
+			X = numpy.apply_along_axis(rankdata, 0, X)
+
+		Xc = X - numpy.mean(X, axis=0)
+		r_num = numpy.sum(Xc * Yc, axis=0)
+		r_den = numpy.sqrt(numpy.sum(numpy.power(Xc, 2), axis=0) * ySumOfSquares)
+
+		return r_num / r_den
+
+	r = _applyToFeatureBlocks(correlate, X, sampleMask=sampleMask, featureMask=featureMask)
 
 	# Set NaNs to zero correlation
 	r[numpy.isnan(r)] = 0
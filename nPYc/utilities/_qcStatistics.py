@@ -0,0 +1,100 @@
+"""
+Per-class feature statistics, see :py:class:`QCStatistics`.
+"""
+import numpy
+import pandas
+from ._internal import _applyToFeatureBlocks
+from .ms import _rsdFromMeanStd
+
+
+class QCStatistics:
+	"""
+	Mean, standard deviation, percentage :term:`RSD<relative standard deviation>`, median and 95th percentile of each feature, in each of a set of classes of samples, calculated in a single pass over the data.
+
+	The matrix is read one block of features at a time, as in :py:func:`~nPYc.utilities.rsd`, and the statistics of every class are calculated from each block before the next is read, rather than slicing the rows of each class from the whole matrix in turn. Statistics match those of :py:func:`~nPYc.utilities.rsd`, :py:func:`numpy.mean`, :py:func:`numpy.std` and :py:func:`numpy.percentile` on the samples of each class.
+
+	`stats = QCStatistics(dataset.intensityData, {'SP': spMask, 'SS': ssMask})`
+
+	`stats['SP', 'rsd']`
+
+	Only the *statistics* requested are calculated, so callers needing only the RSD skip sorting each class for the percentiles:
+
+	`QCStatistics(dataset.intensityData, {'SS': ssMask}, statistics=('rsd',))`
+
+	Use :py:meth:`~nPYc.objects.Dataset.qcStatistics` to calculate them for a dataset, where they are cached until the data or samples change.
+
+	:param data: *n* by *m* matrix of data, with features in columns, and samples in rows
+	:param dict classMasks: Dictionary of the names of the classes, and a boolean mask of the samples in each. Classes may overlap
+	:param statistics: Statistics to calculate, if ``None`` all of :py:attr:`statistics`
+	:type statistics: None or list of str
+	:raises ValueError: if a statistic is not one of :py:attr:`statistics`
+	"""
+
+	#: Statistics that can be calculated for each class
+	statistics = ('mean', 'std', 'rsd', 'median', 'p95')
+
+	def __init__(self, data, classMasks, statistics=None):
+
+		if statistics is not None:
+			unknown = [name for name in statistics if name not in QCStatistics.statistics]
+			if unknown:
+				raise ValueError('Unknown statistics %s, must be from %s.' % (unknown, QCStatistics.statistics))
+			# Instance attribute holding those calculated, in the order of the class attribute
+			self.statistics = tuple(name for name in QCStatistics.statistics if name in statistics)
+
+		self.classes = list(classMasks.keys())
+		masks = [numpy.asarray(classMasks[name], dtype=bool) for name in self.classes]
+
+		self.counts = {name: int(numpy.sum(mask)) for (name, mask) in zip(self.classes, masks)}
+		"""Dictionary of the number of samples in each class"""
+
+		noStatistics = len(self.statistics)
+		rows = {name: i for (i, name) in enumerate(self.statistics)}
+		moments = bool(rows.keys() & {'mean', 'std', 'rsd'})
+		percentiles = [(rows[name], percentile) for (name, percentile) in (('median', 50), ('p95', 95)) if name in rows]
+
+		def blockStatistics(block):
+			values = numpy.full((len(masks) * noStatistics, block.shape[1]), numpy.nan)
+			for (i, mask) in enumerate(masks):
+				classValues = block[mask]
+				if classValues.shape[0] == 0:
+					continue
+
+				start = i * noStatistics
+				if moments:
+					mean = numpy.mean(classValues, axis=0)
+					std = numpy.std(classValues, axis=0)
+					for (name, value) in (('mean', mean), ('std', std)):
+						if name in rows:
+							values[start + rows[name]] = value
+					if 'rsd' in rows:
+						values[start + rows['rsd']] = _rsdFromMeanStd(mean, std)
+				if percentiles:
+					result = numpy.percentile(classValues, [percentile for (_, percentile) in percentiles], axis=0)
+					for ((row, _), value) in zip(percentiles, result):
+						values[start + row] = value
+
+			return values
+
+		noFeatures = data.shape[1]
+		if self.classes and noFeatures and noStatistics:
+			values = _applyToFeatureBlocks(blockStatistics, data)
+		else:
+			values = numpy.empty((len(self.classes) * noStatistics, noFeatures))
+
+		self.table = pandas.DataFrame(values.T, columns=pandas.MultiIndex.from_product([self.classes, self.statistics], names=['Class', 'Statistic']))
+		"""*m* row table of the statistics of each feature, with a column for each class and statistic"""
+
+
+	def __getitem__(self, key):
+		"""
+		:param key: Tuple of the class and statistic
+		:return: Vector of the statistic for each feature
+		:rtype: numpy.ndarray
+		"""
+		return numpy.array(self.table[key].values)
+
+
+	def __repr__(self):
+
+		return '<%s of %i features in classes %s>' % (self.__class__.__name__, self.table.shape[0], ', '.join('%s (%i samples)' % (name, self.counts[name]) for name in self.classes))
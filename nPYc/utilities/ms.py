@@ -4,8 +4,9 @@ Utility functions.
 import numpy
 import warnings
 import pandas
+from ._internal import _applyToFeatureBlocks
 
-def rsd(data):
+def rsd(data, sampleMask=None):
 	"""
 	Calculate percentage :term:`relative standard deviation` for each column in *data*.
 
@@ -13,18 +14,31 @@ def rsd(data):
 
 	Where RSDs cannot be caluclated, (i.e. means of zero), ``numpy.finfo(numpy.float64).max`` is returned.
 
+	RSDs are calculated in blocks of features, so *data* may be a memmapped or lazily normalised matrix larger than the memory available.
+
 	:param numpy.ndarray data: *n* by *m* numpy array of data, with features in columns, and samples in rows
+	:param sampleMask: If ``None`` use all samples, otherwise only those ``True`` in *sampleMask*
+	:type sampleMask: None or numpy.ndarray of bool
 	:return: *m* vector of RSDs
 	:rtype: numpy.ndarray
 	"""
 
-	std = numpy.std(data, axis=0)
+	return _applyToFeatureBlocks(_rsd, data, sampleMask=sampleMask)
+
+
+def _rsd(data):
+
+	return _rsdFromMeanStd(numpy.mean(data, axis=0), numpy.std(data, axis=0))
 
+
+def _rsdFromMeanStd(mean, std):
+	"""
+	Percentage RSDs from column means and standard deviations, as :py:func:`rsd`.
+	"""
 	# If std is zero, note it
 	stdMask = std == 0
-	std[stdMask] = 1
 
-	rsd = numpy.multiply(numpy.divide(std, numpy.mean(data, axis=0)), 100)
+	rsd = numpy.multiply(numpy.divide(numpy.where(stdMask, 1, std), mean), 100)
 
 	rsd[numpy.isnan(rsd)] = numpy.finfo(numpy.float64).max
 	rsd[stdMask] = 0
@@ -32,16 +46,64 @@ def rsd(data):
 	return rsd
 
 
-def sequentialPrecision(data):
+def _moments(data):
+	"""
+	Column means and sums of squared deviations from the mean of *data*, stacked as a 2 by *m* array, from which :py:func:`_rsdFromMoments` gives the same RSDs as :py:func:`rsd`.
+	"""
+	mean = numpy.mean(data, axis=0)
+
+	return numpy.vstack((mean, numpy.sum(numpy.square(data - mean), axis=0)))
+
+
+def _mergeMoments(momentsA, momentsB):
+	"""
+	Combine the (count, mean, M2) moments of two disjoint sets of samples into the moments of their union, with the pairwise update of Chan et al.
+	"""
+	(countA, meanA, M2A) = momentsA
+	(countB, meanB, M2B) = momentsB
+
+	if countB == 0:
+		return momentsA
+	if countA == 0:
+		return momentsB
+
+	count = countA + countB
+	delta = meanB - meanA
+
+	mean = meanA + delta * (countB / count)
+	M2 = M2A + M2B + numpy.square(delta) * (countA * countB / count)
+
+	return (count, mean, M2)
+
+
+def _rsdFromMoments(count, mean, M2):
+	"""
+	Percentage RSDs from the (count, mean, M2) moments of a set of samples, as :py:func:`rsd`.
+	"""
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		return _rsdFromMeanStd(mean, numpy.sqrt(numpy.divide(M2, count)))
+
+
+def sequentialPrecision(data, sampleMask=None):
 	"""
 	Calculate percentage sequential precision for each column in *data*. Sequential precision for feature :math:`x` is defined as:
 
 	:math:`\mathit{{sp(x)}} = \\frac{\sqrt{(\\frac{1}{n-1} \sum_{i=1}^{n-1} (x_{i+1} - x_i)^2)/2}}{\mu_{x}} \\times 100`
 
+	Sequential precision is calculated in blocks of features, as :py:func:`rsd`.
+
 	:param numpy.ndarray data: *n* by *m* numpy array of measures, with features in columns, and samples in rows
+	:param sampleMask: If ``None`` use all samples, otherwise only those ``True`` in *sampleMask*
+	:type sampleMask: None or numpy.ndarray of bool
 	:return: *m* vector of sequential precision measures
 	:rtype: numpy.ndarray
 	"""
+
+	return _applyToFeatureBlocks(_sequentialPrecision, data, sampleMask=sampleMask)
+
+
+def _sequentialPrecision(data):
+
 	# Calculate sample to sample difference
 	sequentialDifference = numpy.diff(data, axis=0)
 
@@ -73,8 +135,6 @@ def generateLRmask(dataset):
 	:param nPYc.MSDataset msData: Object containing dilution subsets to parse
 	:return: LRoutput: Masks of Linearity Reference samples separated by batch
 	"""
-	from ..enumerations import AssayRole, SampleType
-
 	if dataset.corrExclusions is None:
 		raise ValueError('dataset.corrExclusions is not defined')
 
@@ -82,8 +142,7 @@ def generateLRmask(dataset):
 	LRoutput = dict()
 
 	if not 'Dilution Series' in dataset.sampleMetadata.columns:
-		lrMask = (dataset.sampleMetadata['SampleType'].values == SampleType.StudyPool) & (dataset.sampleMetadata['AssayRole'].values == AssayRole.LinearityReference)
-		lrMask = numpy.logical_and(lrMask, dataset.corrExclusions)
+		lrMask = numpy.logical_and(dataset.sampleClassMasks['LR'], dataset.corrExclusions)
 		LRoutput['All Dilution Samples'] = lrMask
 
 	else:
@@ -131,7 +190,7 @@ def rsdsBySampleType(dataset, onlyPrecisionReferences=True, useColumn='SampleTyp
 	if not useColumn in dataset.sampleMetadata.columns:
 		raise KeyError("%s is not a column in sampleMetadata." % (useColumn))
 
-	rsds = dict()
+	classMasks = dict()
 	sampleTypes = dataset.sampleMetadata[useColumn].unique()
 	for sampleType in sampleTypes:
 
@@ -143,9 +202,12 @@ def rsdsBySampleType(dataset, onlyPrecisionReferences=True, useColumn='SampleTyp
 
 		mask = numpy.logical_and(mask, dataset.sampleMask)
 
-		if sum(mask) < 2:
+		if numpy.sum(mask) < 2:
 			continue
 
-		rsds[str(sampleType)] = rsd(dataset.intensityData[mask, :])
+		classMasks[str(sampleType)] = mask
+
+	# RSDs of all classes in one pass over the data
+	statistics = dataset.qcStatistics(classMasks, statistics=('rsd',))
 
-	return rsds
+	return {name: statistics[name, 'rsd'] for name in classMasks}
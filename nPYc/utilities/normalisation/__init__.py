@@ -11,5 +11,6 @@ from ._normaliserABC import Normaliser
 from ._nullNormaliser import NullNormaliser
 from ._probabilisticQuotientNormaliser import ProbabilisticQuotientNormaliser
 from ._totalAreaNormaliser import TotalAreaNormaliser
+from ._lazyNormalisedArray import LazyNormalisedArray
 
-__all__ = ['NullNormaliser', 'ProbabilisticQuotientNormaliser', 'TotalAreaNormaliser']
+__all__ = ['NullNormaliser', 'ProbabilisticQuotientNormaliser', 'TotalAreaNormaliser', 'LazyNormalisedArray']
@@ -0,0 +1,131 @@
+import numpy
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+
+def _materialise(value):
+	"""
+	Replace any :py:class:`LazyNormalisedArray` in *value* (or in a list or tuple of values) by the normalised matrix it represents.
+	"""
+	if isinstance(value, LazyNormalisedArray):
+		return numpy.asarray(value)
+	elif isinstance(value, (list, tuple)):
+		return type(value)(_materialise(item) for item in value)
+	else:
+		return value
+
+
+class LazyNormalisedArray(NDArrayOperatorsMixin):
+	"""
+	Read-only view of a data matrix **X** with per-row normalisation coefficients, where the coefficients are applied only to the elements requested when the view is sliced.
+
+	Slicing returns a new :py:class:`numpy.ndarray` holding the normalised values of the selection, so that ``view[:, featureMask]`` never materialises the full normalised matrix. Changes to the arrays returned by slicing are not reflected in **X**.
+
+	The view otherwise behaves as a numpy matrix: numpy functions, ufuncs, arithmetic operators and :py:class:`numpy.ndarray` methods and attributes are all evaluated on the full normalised matrix. The full matrix is calculated on the first such use, and kept as a read-only :py:class:`numpy.ndarray` returned by :py:func:`numpy.asarray` and reused by all later uses, and to slice from.
+
+	:param numpy.ndarray X: *n* by *m* data matrix
+	:param numpy.ndarray coefficients: *n* element vector, each row of **X** is divided by its coefficient
+	"""
+
+	def __init__(self, X, coefficients):
+
+		if X.ndim != 2:
+			raise ValueError('X is not a valid data intensity matrix')
+		if coefficients.shape != (X.shape[0],):
+			raise ValueError('The dimensions of X and the coefficients provided do not match')
+
+		self._X = X
+		self._coefficients = coefficients
+		self._materialised = None
+
+
+	@property
+	def shape(self):
+		return self._X.shape
+
+
+	@property
+	def ndim(self):
+		return 2
+
+
+	@property
+	def size(self):
+		return self._X.size
+
+
+	@property
+	def dtype(self):
+		return numpy.result_type(self._X, self._coefficients)
+
+
+	@property
+	def T(self):
+		return numpy.asarray(self).T
+
+
+	@property
+	def normalisation_coefficients(self):
+		"""
+		The coefficients each row is divided by.
+		"""
+		return self._coefficients
+
+
+	def __len__(self):
+		return self._X.shape[0]
+
+
+	def __iter__(self):
+		for row in range(self._X.shape[0]):
+			yield self[row]
+
+
+	def __getitem__(self, key):
+		if self._materialised is not None:
+			value = self._materialised[key]
+			return value.copy() if isinstance(value, numpy.ndarray) else value
+
+		# A zero-stride view of the coefficients indexed with the same key lines them up with X[key]
+		coefficients = numpy.broadcast_to(self._coefficients[:, None], self._X.shape)
+
+		return numpy.divide(self._X[key], coefficients[key])
+
+
+	def __array__(self, dtype=None):
+
+		X = self._materialised
+		if X is None:
+			X = self._X / self._coefficients[:, None]
+			X.setflags(write=False)
+			self._materialised = X
+
+		if dtype is not None:
+			X = X.astype(dtype, copy=False)
+
+		return X
+
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+
+		if any(isinstance(item, LazyNormalisedArray) for item in kwargs.get('out', ())):
+			# Writing back to the view is not possible
+			return NotImplemented
+
+		return getattr(ufunc, method)(*_materialise(inputs), **kwargs)
+
+
+	def __array_function__(self, func, types, args, kwargs):
+
+		return func(*_materialise(args), **{key: _materialise(value) for key, value in kwargs.items()})
+
+
+	def __getattr__(self, name):
+		# Fall back to the ndarray API on the materialised matrix, for methods such as copy(), mean() or item()
+		if name.startswith('__') or name in ('_X', '_coefficients', '_materialised'):
+			raise AttributeError(name)
+
+		return getattr(numpy.asarray(self), name)
+
+
+	def __repr__(self):
+		return '%s(%r)' % (self.__class__.__name__, numpy.asarray(self))
@@ -46,14 +46,19 @@ class Normaliser(metaclass=ABCMeta):
 
 
 	@abstractmethod
-	def normalise(self, X):
+	def normalise(self, X, dataVersion=None, lazy=False):
 		"""
 		Apply normalisation to the data in matrix **X** and return a view to the normalised matrix.
 
 		Where relevant the method must ensure that it is not possible to write to the returned normalised **X** where this cannot be meaningfully reflected in the raw **X**.
 
+		Callers that track changes to **X** (such as :py:class:`~nPYc.objects.Dataset`) may pass a *dataVersion* token that changes whenever **X** does. Normalisers may then reuse coefficients calculated for the same token, without having to inspect **X** to establish it is unchanged.
+
 		:param X: Data intensity matrix
 		:type X: numpy.ndarray, shape [n_samples, n_features]
+		:param dataVersion: Token identifying the contents of **X**, or ``None`` if unknown
+		:type dataVersion: None or int
+		:param bool lazy: If ``True`` the normaliser may return a :py:class:`~nPYc.utilities.normalisation.LazyNormalisedArray` that only applies the normalisation to the elements sliced from it, rather than normalising the full matrix
 		:return: The normalised **X** matrix
 		:rtype: numpy.ndarray, shape [n_samples, n_features]
 		:raises ValueError: If **X** is not a numpy 2-d array representing a data matrix
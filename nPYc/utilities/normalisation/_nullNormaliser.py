@@ -26,12 +26,14 @@ class NullNormaliser(Normaliser):
 		return 1
 
 
-	def normalise(self, X):
+	def normalise(self, X, dataVersion=None, lazy=False):
 		"""
 		Returns **X** unchanged.
 
 		:param X: Data intensity matrix
 		:type X: numpy.ndarray, shape [n_samples, n_features]
+		:param dataVersion: Ignored
+		:param lazy: Ignored, **X** is always returned as is
 		:return: The original X matrix without any modification
 		:rtype: numpy.ndarray, shape [n_samples, n_features]
 		"""
@@ -2,6 +2,7 @@ import numpy
 from hashlib import sha1
 
 from ._normaliserABC import Normaliser
+from ._lazyNormalisedArray import LazyNormalisedArray
 
 class ProbabilisticQuotientNormaliser(Normaliser):
 	"""
@@ -20,6 +21,7 @@ class ProbabilisticQuotientNormaliser(Normaliser):
 		self._normalisationcoefficients = None
 		self.reference = reference
 		self._data_hash = None
+		self._data_version = None
 		self._referenceDescription = referenceDescription
 
 
@@ -29,6 +31,7 @@ class ProbabilisticQuotientNormaliser(Normaliser):
 		"""
 		self._normalisationcoefficients = None
 		self._data_hash = None
+		self._data_version = None
 		self._reference = None
 		self._referenceDescription = None
 
@@ -57,14 +60,19 @@ class ProbabilisticQuotientNormaliser(Normaliser):
 		self._reset()
 
 
-	def normalise(self, X, reference=None):
+	def normalise(self, X, reference=None, dataVersion=None, lazy=False):
 		"""
 		Apply Probabilistic Quotient normalisation to a dataset.
 
+		Coefficients are reused when **X** is unchanged since the last call. If *dataVersion* is provided it is compared to that of the last call, otherwise **X** is hashed to detect changes.
+
 		:param X: Data intensity matrix
 		:type X: numpy.ndarray, shape [n_samples, n_features]
 		:param reference: Spectrum to use as the normalisation reference
 		:type reference: numpy.ndarray, shape [n_features]
+		:param dataVersion: Token identifying the contents of **X**, or ``None`` to hash **X**
+		:type dataVersion: None or int
+		:param bool lazy: If ``True`` return a :py:class:`~nPYc.utilities.normalisation.LazyNormalisedArray` that only applies the coefficients to the elements sliced from it
 		:return: A read-only, normalised view of **X**
 		:rtype: numpy.ndarray, shape [n_samples, n_features]
 		:raises ValueError: if X is not a numpy 2-d array representing a data matrix
@@ -72,11 +80,14 @@ class ProbabilisticQuotientNormaliser(Normaliser):
 		try:
 
 			# Do not repeat coefficient calculation if unnecessary
-			hash = sha1(numpy.ascontiguousarray(X)).hexdigest()
-			if self._data_hash == hash:
-				X = X / self._normalisationcoefficients[:, None]
-
+			if dataVersion is not None:
+				hash = None
+				unchanged = (self._normalisationcoefficients is not None) and (self._data_version == dataVersion)
 			else:
+				hash = sha1(numpy.ascontiguousarray(X)).hexdigest()
+				unchanged = self._data_hash == hash
+
+			if not unchanged:
 
 				if X.ndim != 2:
 					raise ValueError('X is not a valid data intensity matrix')
@@ -103,9 +114,13 @@ class ProbabilisticQuotientNormaliser(Normaliser):
 				# Set 0 cofficients to 1
 				self._normalisationcoefficients[self._normalisationcoefficients == 0] = 1
 
-				X = X / self._normalisationcoefficients[:, None]
-
 				self._data_hash = hash
+				self._data_version = dataVersion
+
+			if lazy:
+				return LazyNormalisedArray(X, self._normalisationcoefficients)
+
+			X = X / self._normalisationcoefficients[:, None]
 
 			##
 			# Prevent writing back to the normlised array
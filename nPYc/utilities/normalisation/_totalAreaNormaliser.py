@@ -2,6 +2,7 @@ import numpy
 from copy import deepcopy
 
 from ._normaliserABC import Normaliser
+from ._lazyNormalisedArray import LazyNormalisedArray
 
 class TotalAreaNormaliser(Normaliser):
 	"""
@@ -12,6 +13,7 @@ class TotalAreaNormaliser(Normaliser):
 
 	def __init__(self, keepMagnitude=True):
 		self._normalisationcoefficients = None
+		self._data_version = None
 		self._keepMagnitude = keepMagnitude
 
 
@@ -20,6 +22,7 @@ class TotalAreaNormaliser(Normaliser):
 		Resets :py:attr:`normalisation_coefficients` causing them to be calculated again next time :py:meth:`normalise` is called.
 		"""
 		self._normalisationcoefficients = None
+		self._data_version = None
 
 
 	@property
@@ -27,12 +30,17 @@ class TotalAreaNormaliser(Normaliser):
 		return self._normalisationcoefficients
 
 
-	def normalise(self, X):
+	def normalise(self, X, dataVersion=None, lazy=False):
 		"""
 		Apply Total Area normalisation to the dataset.
 
+		If *dataVersion* is provided, and matches that of the last call, the coefficients calculated previously are reused.
+
 		:param X: Data intensity matrix
 		:type X: numpy.ndarray, shape [n_samples, n_features]
+		:param dataVersion: Token identifying the contents of **X**, or ``None`` to always recalculate coefficients
+		:type dataVersion: None or int
+		:param bool lazy: If ``True`` return a :py:class:`~nPYc.utilities.normalisation.LazyNormalisedArray` that only applies the coefficients to the elements sliced from it
 		:return: A read-only, normalised view of **X**
 		:rtype: numpy.ndarray, shape [n_samples, n_features]
 		:raises ValueError: If X is not a numpy 2-d array representing a data matrix
@@ -42,14 +50,20 @@ class TotalAreaNormaliser(Normaliser):
 			if X.ndim != 2:
 				raise ValueError('X is not a valid data intensity matrix')
 
-			areas = numpy.nansum(X, axis=1)
+			if (dataVersion is None) or (self._data_version != dataVersion) or (self._normalisationcoefficients is None):
+
+				areas = numpy.nansum(X, axis=1)
+
+				if self._keepMagnitude:
+					scaleFactor = numpy.mean(areas[numpy.isfinite(areas)])
+				else:
+					scaleFactor = 1
 
-			if self._keepMagnitude:
-				scaleFactor = numpy.mean(areas[numpy.isfinite(areas)])
-			else:
-				scaleFactor = 1
+				self._normalisationcoefficients = numpy.divide(areas, scaleFactor)
+				self._data_version = dataVersion
 
-			self._normalisationcoefficients = numpy.divide(areas, scaleFactor)
+			if lazy:
+				return LazyNormalisedArray(X, self._normalisationcoefficients)
 
 			X = X / self._normalisationcoefficients[:, None]
 
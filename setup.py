@@ -27,6 +27,10 @@ setup(name='nPYc',
 		'setuptools>=39.1.0',
 		'statsmodels>=0.9.0'
 	],
+	extras_require={
+		'hdf5': ['h5py>=2.10'],
+		'parquet': ['pyarrow>=1.0']
+	},
 	classifiers = [
 		"Programming Language :: Python",
 		"Programming Language :: Python :: 3.6",